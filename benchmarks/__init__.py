@@ -0,0 +1,5 @@
+"""
+Micro-benchmark suite for the protocol codec, parser and keymap translation.
+
+Run it with ``scripts/benchmark.py``, results are compared against ``baseline.json``.
+"""
@@ -0,0 +1,160 @@
+"""
+Dispatch overhead: queue + worker against direct dispatch
+
+All cases hand the same DMRM batches to a real PynergyHandler injecting into
+null devices. ``dispatch.handler_only`` calls the handler in a plain loop, the
+difference with the other cases is the per-message cost of the dispatch path:
+MessageTask allocation, queue put/get, worker wake-up and a coroutine per
+handler for the queue, a table lookup and a call for direct dispatch.
+
+The ``dispatch.syn`` cases replay typing interleaved with pointer moves into the
+uinput devices over a null UInput and count the syscalls they would make: one
+per event written and one per SYN_REPORT, with a sync after each handler against
+one per device per batch.
+"""
+
+import asyncio
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from pynergy_client.client import MessageDispatcher, PynergyClient, PynergyHandler
+from pynergy_client.client.protocols import ClientState
+from pynergy_client.config import Config
+from pynergy_client.device import UInputKeyboardDevice, UInputMouseDevice
+from pynergy_protocol import DKeyDownMsg, DKeyUpMsg, DMouseRelMoveMsg, PynergyParser
+
+from .bench_latency import _Context, _Keyboard, _RecordingMouse
+from .harness import benchmark
+
+_MESSAGES = 1024
+_BATCH = 64  # DMRM packets of one 1 KiB read
+_BATCHES = [[DMouseRelMoveMsg(1, -1)] * _BATCH for _ in range(_MESSAGES // _BATCH)]
+# A key stroke every six relative moves
+_MIXED = [DKeyDownMsg(0, 0, 38), *[DMouseRelMoveMsg(1, -1)] * 6, DKeyUpMsg(0, 0, 38)] * (
+    _BATCH // 8
+)
+_MIXED_BATCHES = [_MIXED] * (_MESSAGES // _BATCH)
+
+
+class _NullMouse(_RecordingMouse):
+    def move_relative(self, dx, dy): ...
+
+
+class _NullUInput:
+    def __init__(self, *args, **kwargs): ...
+
+    def write(self, event_type, event_code, value): ...
+
+    def syn(self): ...
+
+    def close(self): ...
+
+
+def _setup(direct: bool, uinput: bool = False):
+    directory = Path(tempfile.mkdtemp(prefix='pynergy-bench-'))
+    atexit.register(shutil.rmtree, directory, True)
+    cfg = Config(file_transfer_dir=directory)
+    if uinput:
+        with patch('evdev.UInput', _NullUInput):
+            mouse, keyboard = UInputMouseDevice(), UInputKeyboardDevice()
+    else:
+        mouse, keyboard = _NullMouse(), _Keyboard()
+    handler = PynergyHandler(cfg, _Context(), mouse, keyboard)
+    atexit.register(handler.file_receiver.close)
+    dispatcher = MessageDispatcher(handler, direct=direct)
+    client = PynergyClient(cfg, parser=PynergyParser(), dispatcher=dispatcher)
+    client.state = ClientState.ACTIVE
+    return handler, dispatcher, client
+
+
+@benchmark('dispatch.handler_only.DMRM', ops=_MESSAGES)
+def _handler_only():
+    handler, _, client = _setup(direct=True)
+    on_dmrm = handler.on_dmrm
+
+    def run():
+        for batch in _BATCHES:
+            for msg in batch:
+                on_dmrm(msg, client)
+
+    return run
+
+
+@benchmark('dispatch.queue.DMRM', ops=_MESSAGES)
+def _queue():
+    _, dispatcher, client = _setup(direct=False)
+    loop = asyncio.new_event_loop()
+    worker = loop.create_task(dispatcher.worker(0))
+
+    def close():
+        worker.cancel()
+        loop.run_until_complete(asyncio.gather(worker, return_exceptions=True))
+        loop.close()
+
+    atexit.register(close)
+
+    async def dispatch():
+        for batch in _BATCHES:
+            await dispatcher.enqueue_batch(batch, client)
+        await dispatcher.queue.join()
+
+    def run():
+        loop.run_until_complete(dispatch())
+
+    return run
+
+
+@benchmark('dispatch.direct.DMRM', ops=_MESSAGES)
+def _direct():
+    _, dispatcher, client = _setup(direct=True)
+
+    def run():
+        for batch in _BATCHES:
+            dispatcher.dispatch_batch(batch, client)
+
+    return run
+
+
+def _syscall_counters(handler):
+    devices = (handler.mouse, handler.keyboard)
+
+    def run_counted(dispatch):
+        def run():
+            for device in devices:
+                device.events = device.syns = 0
+            dispatch()
+
+        run.counters = lambda: {
+            'syscalls_per_op': sum(d.syscalls for d in devices) / _MESSAGES,
+            'syns_per_op': sum(d.syns for d in devices) / _MESSAGES,
+        }
+        return run
+
+    return run_counted
+
+
+@benchmark('dispatch.syn.per_message', ops=_MESSAGES)
+def _syn_per_message():
+    handler, _, client = _setup(direct=True, uinput=True)
+    table = {'DKDN': handler.on_dkdn, 'DKUP': handler.on_dkup, 'DMRM': handler.on_dmrm}
+
+    def dispatch():
+        for batch in _MIXED_BATCHES:
+            for msg in batch:
+                table[msg.CODE](msg, client)
+
+    return _syscall_counters(handler)(dispatch)
+
+
+@benchmark('dispatch.syn.per_batch', ops=_MESSAGES)
+def _syn_per_batch():
+    handler, dispatcher, client = _setup(direct=True, uinput=True)
+
+    def dispatch():
+        for batch in _MIXED_BATCHES:
+            dispatcher.dispatch_batch(batch, client)
+
+    return _syscall_counters(handler)(dispatch)
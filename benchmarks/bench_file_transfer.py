@@ -0,0 +1,65 @@
+"""DFTR file transfer throughput against a local stand-in sender"""
+
+import atexit
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+from pathlib import Path
+
+from pynergy_client.client.file_transfer import (
+    DATA_CHUNK,
+    DATA_END,
+    DATA_START,
+    FileTransferReceiver,
+)
+from pynergy_protocol import DFileTransferMsg, PynergyParser
+
+from .bench_protocol import READ_SIZE
+from .harness import benchmark
+
+_MB = 1024 * 1024
+_FILE_SIZE = 16 * _MB
+_CHUNK_SIZE = 512 * 1024  # Chunk size used by the server for file transfers
+
+
+def send_file(sock: socket.socket, payload: bytes, chunk_size: int = _CHUNK_SIZE):
+    """Stand-in sender: stream payload as a DFTR transfer, the way the server does"""
+    sock.sendall(DFileTransferMsg(DATA_START, struct.pack('>Q', len(payload))).pack_for_socket())
+    view = memoryview(payload)
+    for i in range(0, len(payload), chunk_size):
+        sock.sendall(DFileTransferMsg(DATA_CHUNK, view[i : i + chunk_size]).pack_for_socket())
+    sock.sendall(DFileTransferMsg(DATA_END, b'').pack_for_socket())
+
+
+def _receive(directory: Path, payload: bytes):
+    def run():
+        sender_sock, receiver_sock = socket.socketpair()
+        sender = threading.Thread(target=send_file, args=(sender_sock, payload))
+        sender.start()
+
+        parser = PynergyParser()
+        receiver = FileTransferReceiver(directory)
+        future = None
+        while future is None:
+            data = receiver_sock.recv(READ_SIZE)
+            for msg in parser.feed_and_parse_all(data):
+                future = receiver.feed(msg) or future
+        path = future.result()
+        receiver.close()
+
+        sender.join()
+        sender_sock.close()
+        receiver_sock.close()
+        path.unlink()
+
+    return run
+
+
+@benchmark('file_transfer.receive.16MB', ops=_FILE_SIZE // _MB)
+def _receive_16mb():
+    # Reported per MiB, received files are deleted after each run
+    directory = Path(tempfile.mkdtemp(prefix='pynergy-bench-'))
+    atexit.register(shutil.rmtree, directory, True)
+    return _receive(directory, bytes(range(256)) * (_FILE_SIZE // 256))
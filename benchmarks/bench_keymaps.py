@@ -0,0 +1,26 @@
+"""Keymap translation benchmarks"""
+
+from pynergy_client.keymaps import hid_to_ecode, synergy_to_hid
+from pynergy_client.keymaps.synergy_map import SYNERGY_TO_HID
+
+from .harness import benchmark
+
+_KEYS = list(SYNERGY_TO_HID)
+
+
+@benchmark('keymaps.synergy_to_ecode', ops=len(_KEYS))
+def _synergy_to_ecode():
+    def run():
+        for key in _KEYS:
+            hid_to_ecode(synergy_to_hid(key))
+
+    return run
+
+
+@benchmark('keymaps.mouse_button_to_ecode', ops=5)
+def _mouse_button_to_ecode():
+    def run():
+        for button in range(1, 6):
+            hid_to_ecode(synergy_to_hid((button << 8) + 0xAA))
+
+    return run
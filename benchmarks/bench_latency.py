@@ -0,0 +1,168 @@
+"""
+End-to-end inbound-to-injection latency under each event loop
+
+A stand-in server thread completes the handshake with a real PynergyClient, then
+sends DMRM messages one at a time and waits until the handler injects each of them
+into a recording mouse. The latency of a message is the time from sending it to
+its injection: socket read, parse, dispatcher queue, worker task and handler. The
+uvloop case is only registered when uvloop is installed.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from pynergy_client.client import MessageDispatcher, PynergyClient, PynergyHandler
+from pynergy_client.client.protocols import ClientState
+from pynergy_client.config import Config, EventLoop
+from pynergy_client.device import (
+    BaseDeviceContext,
+    BaseKeyboardVirtualDevice,
+    BaseMouseVirtualDevice,
+)
+from pynergy_client.utils import get_loop_factory
+from pynergy_protocol import CEnterMsg, DMouseRelMoveMsg, HelloMsg, PynergyParser
+
+from .harness import benchmark
+
+_MESSAGES = 200
+_TIMEOUT = 5.0
+
+
+class _Context(BaseDeviceContext):
+    def update_screen_info(self):
+        self.screen_size = (1920, 1080)
+
+    def get_real_cursor_pos(self):
+        return None
+
+
+class _RecordingMouse(BaseMouseVirtualDevice):
+    """Signals the sender thread whenever a relative move is injected"""
+
+    def __init__(self):
+        super().__init__()
+        self.injected = threading.Event()
+        self.injected_at = 0
+
+    def move_relative(self, dx, dy):
+        self.injected_at = time.perf_counter_ns()
+        self.injected.set()
+
+    def move_absolute(self, x, y): ...
+
+    def wheel_relative(self, dy=0, dx=0): ...
+
+    def wheel_absolute(self, degree=0): ...
+
+    def send_button(self, button_id, down): ...
+
+    def release_all_button(self): ...
+
+    def syn(self): ...
+
+    def close(self): ...
+
+
+class _Keyboard(BaseKeyboardVirtualDevice):
+    def send_key(self, key_code, down): ...
+
+    def release_all_key(self): ...
+
+    def sync_modifiers(self, modifiers): ...
+
+    def syn(self): ...
+
+    def close(self): ...
+
+
+def _serve_handshake(listener: socket.socket, accepted: list):
+    conn, _ = listener.accept()
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    conn.sendall(HelloMsg('Barrier', 1, 8).pack_for_socket())
+    conn.recv(1024)  # HelloBack
+    conn.sendall(CEnterMsg(0, 0, 1, 0).pack_for_socket())
+    accepted.append(conn)
+
+
+def _latency(event_loop: EventLoop):
+    loop_factory = get_loop_factory(event_loop)
+    loop = loop_factory() if loop_factory else asyncio.new_event_loop()
+    directory = Path(tempfile.mkdtemp(prefix='pynergy-bench-'))
+
+    listener = socket.create_server(('127.0.0.1', 0))
+    accepted = []
+    server = threading.Thread(target=_serve_handshake, args=(listener, accepted))
+    server.start()
+
+    cfg = Config(server='127.0.0.1', port=listener.getsockname()[1], file_transfer_dir=directory)
+    mouse = _RecordingMouse()
+    handler = PynergyHandler(cfg, _Context(), mouse, _Keyboard())
+    dispatcher = MessageDispatcher(handler)
+    client = PynergyClient(cfg, parser=PynergyParser(), dispatcher=dispatcher)
+
+    async def start():
+        worker = asyncio.create_task(dispatcher.worker(0))
+        client.listen_task = asyncio.create_task(client.run())
+        while client.state != ClientState.ACTIVE:
+            await asyncio.sleep(0.001)
+        return worker
+
+    worker = loop.run_until_complete(asyncio.wait_for(start(), _TIMEOUT))
+    server.join()
+    conn = accepted[0]
+    packet = DMouseRelMoveMsg(1, 1).pack_for_socket()
+    samples = []
+
+    def send(done: asyncio.Future):
+        for _ in range(_MESSAGES):
+            mouse.injected.clear()
+            sent_at = time.perf_counter_ns()
+            conn.sendall(packet)
+            if not mouse.injected.wait(_TIMEOUT):
+                break
+            samples.append(mouse.injected_at - sent_at)
+        loop.call_soon_threadsafe(done.set_result, None)
+
+    def run():
+        done = loop.create_future()
+        sender = threading.Thread(target=send, args=(done,))
+        sender.start()
+        loop.run_until_complete(done)
+        sender.join()
+
+    def close():
+        conn.close()
+        listener.close()
+        loop.run_until_complete(client.stop())
+        worker.cancel()
+        loop.run_until_complete(asyncio.gather(worker, return_exceptions=True))
+        loop.close()
+        shutil.rmtree(directory, True)
+
+    def counters():
+        quantiles = statistics.quantiles(samples, n=100)
+        return {'p50_ns': quantiles[49], 'p99_ns': quantiles[98]}
+
+    atexit.register(close)
+    run.counters = counters
+    return run
+
+
+@benchmark('latency.inbound_to_injection.asyncio', ops=_MESSAGES)
+def _asyncio_loop():
+    return _latency('asyncio')
+
+
+if importlib.util.find_spec('uvloop') is not None:
+
+    @benchmark('latency.inbound_to_injection.uvloop', ops=_MESSAGES)
+    def _uvloop():
+        return _latency('uvloop')
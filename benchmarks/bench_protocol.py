@@ -0,0 +1,184 @@
+"""Codec and parser benchmarks"""
+
+from pynergy_protocol import (
+    CKeepAliveMsg,
+    CNoopMsg,
+    DClipboardMsg,
+    DDragInfoMsg,
+    DKeyDownMsg,
+    DKeyUpMsg,
+    DMouseMoveMsg,
+    DSetOptionsMsg,
+    MsgBase,
+    PynergyParser,
+    Registry,
+)
+
+from .harness import benchmark, register
+
+READ_SIZE = 4096  # Same as PynergyClient.run
+
+_SAMPLE_VALUES = {
+    'b': -7,
+    'B': 7,
+    'h': -300,
+    'H': 513,
+    'i': -70000,
+    'I': 70000,
+    'q': -(2**40),
+    'Q': 2**40,
+    '?': True,
+}
+
+
+def sample_message(msg_cls: type[MsgBase]) -> MsgBase:
+    """Build an instance of msg_cls with representative field values"""
+    values = []
+    for op, _size, fmt in msg_cls._INSTRUCTIONS or ():
+        if op == 'FIX_VAL':
+            values.append(_SAMPLE_VALUES[fmt])
+        elif op == 'FIX_STR':
+            values.append('Barrier')
+        elif op == 'VAR_BYTES':
+            values.append(b'pynergy-client')
+        elif op == 'ARRAY':
+            values.append([1, 1, 2, 0])
+        elif op == 'VAR_LIST':
+            values.append(['/home/user/pynergy.txt'])
+        else:
+            values.append('pynergy-client')
+    return msg_cls(*values)
+
+
+def mixed_stream(count: int = 2000, clipboard_size: int = 64 * 1024) -> bytes:
+    """
+    A realistic inbound stream: mostly DMMV, some DKDN/DKUP pairs,
+    periodic CALV and one large DCLP in the middle.
+    """
+    parts = []
+    for i in range(count):
+        if i == count // 2:
+            parts.append(DClipboardMsg(0, 1, 0, b'x' * clipboard_size).pack_for_socket())
+        elif i % 100 == 0:
+            parts.append(CKeepAliveMsg().pack_for_socket())
+        elif i % 20 == 0:
+            parts.append(DKeyDownMsg(0x61, 0, 0x1E).pack_for_socket())
+        elif i % 20 == 1:
+            parts.append(DKeyUpMsg(0x61, 0, 0x1E).pack_for_socket())
+        else:
+            parts.append(DMouseMoveMsg(i % 1920, i % 1080).pack_for_socket())
+    return b''.join(parts)
+
+
+def chunked(stream: bytes, size: int = READ_SIZE) -> list[bytes]:
+    return [stream[i : i + size] for i in range(0, len(stream), size)]
+
+
+# --- codec: every registered message ---
+
+
+def _register_codec_cases():
+    for msg_id, msg_cls in Registry._MAPPING.items():
+        code = str(msg_id.value)
+
+        def setup_pack(msg_cls=msg_cls):
+            msg = sample_message(msg_cls)
+            return msg.pack_for_socket
+
+        def setup_unpack(msg_cls=msg_cls):
+            packed = sample_message(msg_cls).pack()
+            unpack = msg_cls.unpack
+            return lambda: unpack(packed)
+
+        register(f'protocol.pack.{code}', setup_pack)
+        register(f'protocol.unpack.{code}', setup_unpack)
+
+
+_register_codec_cases()
+
+
+@benchmark('protocol.pack_into.DMMV')
+def _pack_into():
+    msg = DMouseMoveMsg(100, 200)
+    buffer = bytearray(64)
+    return lambda: msg.pack_into(buffer, 0)
+
+
+@benchmark('protocol.pack_many.control', ops=10)
+def _pack_many():
+    msgs = [CKeepAliveMsg(), DMouseMoveMsg(1, 2)] * 5
+    return lambda: MsgBase.pack_many(msgs)
+
+
+@benchmark('protocol.unpack.DSOP.256_options', ops=256)
+def _unpack_many_options():
+    packed = DSetOptionsMsg(list(range(512))).pack()
+    return lambda: DSetOptionsMsg.unpack(packed)
+
+
+@benchmark('protocol.unpack.DDRG.1000_paths', ops=1000)
+def _unpack_many_paths():
+    packed = DDragInfoMsg(1000, [f'/home/user/file{i}.txt' for i in range(1000)]).pack()
+    return lambda: DDragInfoMsg.unpack(packed)
+
+
+# --- parser ---
+
+_MIXED_COUNT = 2000
+
+
+def _parse_chunks(chunks: list[bytes], lazy: bool = False, batch: bool = True):
+    def run():
+        parser = PynergyParser(lazy=lazy)
+        if batch:
+            for chunk in chunks:
+                parser.feed_and_parse_all(chunk)
+        else:
+            for chunk in chunks:
+                parser.feed(chunk)
+                while parser.next_msg() is not None:
+                    pass
+
+    return run
+
+
+@benchmark('parser.mixed_stream.parse_all', ops=_MIXED_COUNT)
+def _mixed_parse_all():
+    return _parse_chunks(chunked(mixed_stream(_MIXED_COUNT)))
+
+
+@benchmark('parser.mixed_stream.next_msg', ops=_MIXED_COUNT)
+def _mixed_next_msg():
+    return _parse_chunks(chunked(mixed_stream(_MIXED_COUNT)), batch=False)
+
+
+@benchmark('parser.mixed_stream.lazy', ops=_MIXED_COUNT)
+def _mixed_lazy():
+    return _parse_chunks(chunked(mixed_stream(_MIXED_COUNT)), lazy=True)
+
+
+_TINY_COUNT = 5000
+
+
+@benchmark('parser.tiny_packets.parse_all', ops=_TINY_COUNT)
+def _tiny_parse_all():
+    # Worst case: thousands of 8-byte packets delivered in a single feed
+    return _parse_chunks([CNoopMsg().pack_for_socket() * _TINY_COUNT])
+
+
+@benchmark('parser.tiny_packets.next_msg', ops=_TINY_COUNT)
+def _tiny_next_msg():
+    return _parse_chunks([CNoopMsg().pack_for_socket() * _TINY_COUNT], batch=False)
+
+
+@benchmark('parser.large_clipboard.1MB')
+def _large_clipboard():
+    return _parse_chunks(chunked(DClipboardMsg(0, 1, 0, b'x' * 1024 * 1024).pack_for_socket()))
+
+
+@benchmark('parser.resync.corrupt_frame')
+def _resync_corrupt_frame():
+    # One frame with an impossible length between two moves: cost of recovering from it
+    move = DMouseMoveMsg(1, 2).pack_for_socket()
+    stream = move + b'\xff\xff\xff\xff' + b'\xa5' * 60 + move
+    return _parse_chunks([stream])
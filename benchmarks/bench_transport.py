@@ -0,0 +1,93 @@
+"""
+Receive path: StreamReader + feed against the buffered protocol
+
+Both cases receive the same DMMV stream over a socketpair and decode it with
+parse_all, the way PynergyClient.run does for each transport. Besides the time
+per message, the cases report the receiving thread's CPU time per message and the
+bytes copied in user space per message: the stream path copies every byte into
+the StreamReader buffer, out of it with ``read`` and into the parser with ``feed``,
+the buffered path receives in place and only counts what the parser itself copies
+(``PynergyParser.bytes_copied``: growing the buffer, moving an unread tail).
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+from pynergy_client.client.transport import BufferedClientProtocol
+from pynergy_protocol import DMouseMoveMsg, PynergyParser
+
+from .bench_protocol import READ_SIZE
+from .harness import benchmark
+
+_MESSAGES = 10_000
+_STREAM = b''.join(DMouseMoveMsg(i % 1920, i % 1080).pack_for_socket() for i in range(_MESSAGES))
+
+
+def _send(sock: socket.socket):
+    sock.sendall(_STREAM)
+    sock.shutdown(socket.SHUT_WR)
+
+
+def _run_case(receive):
+    loop = asyncio.new_event_loop()
+    last = {'copied': 0, 'cpu': 0.0}
+
+    def run():
+        sender_sock, receiver_sock = socket.socketpair()
+        sender = threading.Thread(target=_send, args=(sender_sock,))
+        cpu = time.thread_time()
+        sender.start()
+        count, copied = loop.run_until_complete(receive(receiver_sock))
+        last['cpu'] = time.thread_time() - cpu
+        last['copied'] = copied
+        sender.join()
+        sender_sock.close()
+        assert count == _MESSAGES
+
+    run.counters = lambda: {
+        'bytes_copied_per_op': last['copied'] / _MESSAGES,
+        'cpu_ns_per_op': last['cpu'] / _MESSAGES * 1e9,
+    }
+    return run
+
+
+async def _receive_stream(sock: socket.socket) -> tuple[int, int]:
+    reader, writer = await asyncio.open_connection(sock=sock)
+    parser = PynergyParser()
+    count = copied = 0
+    while data := await reader.read(READ_SIZE):
+        # StreamReader buffer and bytes returned by read, feed is in bytes_copied
+        copied += 2 * len(data)
+        count += len(parser.feed_and_parse_all(data))
+    writer.close()
+    await writer.wait_closed()
+    return count, copied + parser.bytes_copied
+
+
+async def _receive_buffered(sock: socket.socket) -> tuple[int, int]:
+    loop = asyncio.get_running_loop()
+    count = 0
+
+    def on_messages(msgs):
+        nonlocal count
+        count += len(msgs)
+
+    _, protocol = await loop.create_connection(
+        lambda: BufferedClientProtocol(PynergyParser()), sock=sock
+    )
+    protocol.start(on_messages)
+    await protocol.wait_closed()
+    # recv_into writes straight into the parser buffer, the kernel copy is not counted
+    return count, protocol.parser.bytes_copied
+
+
+@benchmark('transport.receive.stream.DMMV', ops=_MESSAGES)
+def _stream():
+    return _run_case(_receive_stream)
+
+
+@benchmark('transport.receive.buffered.DMMV', ops=_MESSAGES)
+def _buffered():
+    return _run_case(_receive_buffered)
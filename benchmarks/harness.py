@@ -0,0 +1,122 @@
+"""Benchmark registry, timing and baseline comparison"""
+
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+
+@dataclass(slots=True)
+class Benchmark:
+    """A registered benchmark case
+
+    Attributes:
+        name: Dotted case name, e.g. "protocol.unpack.DMMV"
+        setup: Called once before timing, returns the callable to time
+        ops: Number of operations (messages, keys...) performed by one call,
+            results are reported per operation
+
+    The timed callable may carry a ``counters`` attribute, a callable returning extra
+    figures (bytes copied, CPU time, latency percentiles...) reported under "counters".
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    ops: int = 1
+
+
+_BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def register(name: str, setup: Callable[[], Callable[[], Any]], ops: int = 1):
+    """Register a benchmark case"""
+    if name in _BENCHMARKS:
+        raise ValueError(f'Benchmark {name} is already registered')
+    _BENCHMARKS[name] = Benchmark(name, setup, ops)
+
+
+def benchmark(name: str, ops: int = 1):
+    """Decorator form of register, the decorated function is the setup"""
+
+    def wrapper(setup):
+        register(name, setup, ops)
+        return setup
+
+    return wrapper
+
+
+def get_benchmarks(pattern: str | None = None) -> list[Benchmark]:
+    """Returns registered cases whose name contains pattern"""
+    return [b for name, b in sorted(_BENCHMARKS.items()) if not pattern or pattern in name]
+
+
+def run_benchmark(bench: Benchmark, repeat: int = 5) -> dict[str, Any]:
+    """Time a case and keep the best of `repeat` runs"""
+    func = bench.setup()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    ns_per_op = best / number / bench.ops * 1e9
+    result = {
+        'ns_per_op': round(ns_per_op, 2),
+        'ops_per_sec': round(1e9 / ns_per_op, 1),
+        'ops': bench.ops,
+        'number': number,
+        'repeat': repeat,
+    }
+    counters = getattr(func, 'counters', None)
+    if counters is not None:
+        result['counters'] = {key: round(value, 2) for key, value in counters().items()}
+    return result
+
+
+def environment() -> dict[str, str]:
+    """Describe the machine the results were measured on"""
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def save_results(path: Path, results: dict[str, dict[str, Any]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'meta': environment(), 'results': results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8')).get('results', {})
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[tuple[str, float, float, float]]:
+    """
+    Compare per-op timings with the baseline.
+
+    :return: (name, baseline ns/op, current ns/op, ratio) for every case slower
+        than baseline * (1 + tolerance)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = result['ns_per_op'] / base['ns_per_op']
+        if ratio > 1 + tolerance:
+            regressions.append((name, base['ns_per_op'], result['ns_per_op'], ratio))
+    return regressions
@@ -16,9 +16,9 @@ from . import __version__
 from .client.client import PynergyClient
 from .client.dispatcher import MessageDispatcher
 from .client.handlers import PynergyHandler
-from .config import Available_Backends, Config, LogLevel
+from .config import Available_Backends, Config, EventLoop, LogLevel
 from .i18n import _
-from .utils import init_backend, init_logger
+from .utils import get_loop_factory, init_backend, init_logger
 
 app = typer.Typer(help=_('Pynergy Client'), add_completion=True)
 
@@ -47,6 +47,9 @@ def main(
     keyboard_backend: Annotated[
         Available_Backends | None, typer.Option(help=_('Keyboard backend'))
     ] = None,
+    event_loop: Annotated[
+        EventLoop | None, typer.Option(help=_('Event loop implementation'))
+    ] = 'asyncio',
     tls: Annotated[bool | None, typer.Option(help=_('Whether to use tls'))] = False,
     mtls: Annotated[bool | None, typer.Option(help=_('Whether to use mtls'))] = False,
     tls_trust: Annotated[bool | None, typer.Option(help=_('Whether to trust the server'))] = False,
@@ -58,10 +61,22 @@ def main(
     mouse_move_threshold: Annotated[
         int | None, typer.Option(help=_('Unit: ms, balances smoothness and performance'))
     ] = 8,
-    mouse_pos_sync_freq: Annotated[
+    mouse_drift_threshold: Annotated[
         int | None,
-        typer.Option(help=_('Sync frequency, sync with system real position every n moves')),
-    ] = 2,
+        typer.Option(
+            min=1, help=_('Unit: px, correct the cursor when it drifts further than this')
+        ),
+    ] = 4,
+    mouse_probe_interval: Annotated[
+        int | None, typer.Option(help=_('Unit: ms, minimum interval between cursor probes'))
+    ] = 250,
+    motion_interpolation: Annotated[
+        bool | None,
+        typer.Option(help=_('Resample mouse moves onto the display refresh rate')),
+    ] = False,
+    motion_latency_budget: Annotated[
+        int | None, typer.Option(help=_('Unit: ms, latency budget of the motion interpolation'))
+    ] = 8,
     logger_name: Annotated[str | None, typer.Option(help=_('Logger name'))] = 'Pynergy',
     log_dir: Annotated[str | None, typer.Option(help=_('Log directory location'))] = user_log_path(
         appname='pynergy', appauthor=False
@@ -118,7 +133,7 @@ def main(
 
     # 4. Run app
     try:
-        asyncio.run(run_app(cfg))
+        asyncio.run(run_app(cfg), loop_factory=get_loop_factory(cfg.event_loop))
     except KeyboardInterrupt:
         typer.echo('\nService stopped')
 
@@ -126,6 +141,7 @@ def main(
 async def run_app(cfg: Config):
     init_logger(cfg)
     logger.info(f'Logger initialized: {cfg.log_dir}/{cfg.log_file}')
+    logger.debug(f'Event loop: {type(asyncio.get_running_loop()).__module__}')
 
     device_ctx, mouse, keyboard = init_backend(cfg)
     assert device_ctx and mouse and keyboard
@@ -134,10 +150,13 @@ async def run_app(cfg: Config):
         logger.info(
             f'Auto-detected screen size: {device_ctx.screen_size[0]}x{device_ctx.screen_size[1]}'
         )
+    elif cfg.motion_interpolation:
+        # The screen size is configured, the engine still needs the refresh rate
+        device_ctx.update_refresh_rate()
 
     handler = PynergyHandler(cfg, device_ctx, mouse, keyboard)
-    dispatcher = MessageDispatcher(handler)
-    parser = PynergyParser()
+    dispatcher = MessageDispatcher(handler, direct=cfg.dispatch_mode == 'direct')
+    parser = PynergyParser(lazy=cfg.lazy_messages)
     client = PynergyClient(
         cfg=cfg,
         parser=parser,
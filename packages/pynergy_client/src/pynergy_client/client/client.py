@@ -18,7 +18,9 @@ from pynergy_protocol import (
 
 from .. import config
 from ..utils import setup_ssl_context, validate_cert
+from .outbound import OutboundWriter
 from .protocols import ClientProtocol, ClientState, DispatcherProtocol
+from .transport import BufferedClientProtocol
 
 if TYPE_CHECKING:
     from .dispatcher import MessageDispatcher
@@ -47,6 +49,8 @@ class PynergyClient(ClientProtocol):
 
         self.reader = None
         self.writer = None
+        self.outbound: OutboundWriter | None = None
+        self._backlog_task: asyncio.Task | None = None
 
         self.parser: PynergyParser = parser
         self.dispatcher: DispatcherProtocol = dispatcher
@@ -57,15 +61,29 @@ class PynergyClient(ClientProtocol):
         logger.info(f'Connecting to {self.cfg.server}:{self.cfg.port}...')
         # 1. Establish async connection
         context = setup_ssl_context(self.cfg)
-        self.reader, self.writer = await asyncio.open_connection(
-            self.cfg.server, self.cfg.port, ssl=context
-        )
+        if self.cfg.transport == 'buffered':
+            loop = asyncio.get_running_loop()
+            _, protocol = await loop.create_connection(
+                lambda: BufferedClientProtocol(self.parser),
+                self.cfg.server,
+                self.cfg.port,
+                ssl=context,
+            )
+            self.writer = protocol
+        else:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.cfg.server, self.cfg.port, ssl=context
+            )
         await validate_cert(self.writer, self.cfg)
         # 2. Wait for server Hello (async read)
         logger.debug('Waiting for server Hello message...')
-        data = await asyncio.wait_for(self.reader.read(1024), timeout=10.0)
-        self.parser.feed(data)
-        msg: HelloMsg | None = self.parser.next_handshake_msg(MsgID.Hello)
+        msg: HelloMsg | None
+        if isinstance(self.writer, BufferedClientProtocol):
+            msg = await asyncio.wait_for(self.writer.hello, timeout=10.0)
+        else:
+            data = await asyncio.wait_for(self.reader.read(1024), timeout=10.0)
+            self.parser.feed(data)
+            msg = self.parser.next_handshake_msg(MsgID.Hello)
         assert msg, 'Did not receive server Hello message'
         logger.debug(f'Server protocol: {msg.protocol_name} {msg.major}.{msg.minor}')
 
@@ -76,6 +94,7 @@ class PynergyClient(ClientProtocol):
         )
         self.writer.write(back_msg.pack_for_socket())
         await self.writer.drain()  # Ensure data is actually sent
+        self.outbound = OutboundWriter(self.writer)
 
         self.state = ClientState.CONNECTED
         logger.success(
@@ -88,18 +107,25 @@ class PynergyClient(ClientProtocol):
         self.running = True
 
         try:
+            if isinstance(self.writer, BufferedClientProtocol):
+                # Messages are dispatched from the protocol callbacks
+                self.writer.start(self._dispatch_batch)
+                await self.writer.wait_closed()
+                return
             assert self.reader, 'Reader not initialized'
             while self.running:
                 # The read here is also non-blocking
                 data = await self.reader.read(4096)
                 if not data:
                     break
-                self.parser.feed(data)
-                while True:
-                    msg = self.parser.next_msg()
-                    if msg is None:
-                        break
-                    await self.dispatcher.enqueue(msg, self)
+                msgs = self.parser.feed_and_parse_all(data)
+                if msgs:
+                    if self.dispatcher.direct:
+                        self.dispatcher.dispatch_batch(msgs, self)
+                        if self.dispatcher.backlog_full():
+                            await self.dispatcher.drain_backlog()
+                    else:
+                        await self.dispatcher.enqueue_batch(msgs, self)
         except (ConnectionResetError, BrokenPipeError, asyncio.CancelledError) as e:
             logger.error(f'Connection lost: {e}')
         except Exception as e:
@@ -108,11 +134,41 @@ class PynergyClient(ClientProtocol):
         finally:
             await self.close()
 
+    def _dispatch_batch(self, msgs: list):
+        """Enqueue a batch decoded by the buffered protocol, pausing reads when the queue is full"""
+        if self.dispatcher.direct:
+            self.dispatcher.dispatch_batch(msgs, self)
+            if self.dispatcher.backlog_full():
+                protocol = self.writer
+                assert isinstance(protocol, BufferedClientProtocol)
+                protocol.pause_reading()
+                self._backlog_task = asyncio.create_task(self._drain_backlog(protocol))
+            return
+        rest = self.dispatcher.enqueue_batch_nowait(msgs, self)
+        if rest:
+            protocol = self.writer
+            assert isinstance(protocol, BufferedClientProtocol)
+            protocol.pause_reading()
+            self._backlog_task = asyncio.create_task(self._enqueue_backlog(protocol, rest))
+
+    async def _enqueue_backlog(self, protocol: BufferedClientProtocol, msgs: list):
+        await self.dispatcher.enqueue_batch(msgs, self)
+        self._backlog_task = None
+        protocol.resume_reading()
+
+    async def _drain_backlog(self, protocol: BufferedClientProtocol):
+        await self.dispatcher.drain_backlog()
+        self._backlog_task = None
+        protocol.resume_reading()
+
     async def send_message(self, data: bytes):
         """Callback method for handlers to send messages back"""
-        if self.writer:
-            self.writer.write(data)
-            await self.writer.drain()
+        outbound = self.outbound
+        if outbound:
+            # Flushed with the other messages of this loop iteration
+            outbound.write(data)
+            if outbound.backpressure:
+                await outbound.drain()
 
     async def close(self):
         # 1. Stop flags
@@ -120,6 +176,13 @@ class PynergyClient(ClientProtocol):
         self.state = ClientState.DISCONNECTED
 
         # 2. Disconnect network stream first, stop "production"
+        if self._backlog_task is not None:
+            # Still waiting for space in the queue, drop what the connection left behind
+            self._backlog_task.cancel()
+            self._backlog_task = None
+        if self.outbound:
+            self.outbound.close()
+            self.outbound = None
         if self.writer:
             try:
                 self.writer.close()
@@ -129,9 +192,11 @@ class PynergyClient(ClientProtocol):
             self.writer = None
             self.reader = None
 
+        self.dispatcher.handler.cancel_pending_move()
         self.dispatcher.handler.mouse.release_all_button()
         self.dispatcher.handler.mouse.close()
         self.dispatcher.handler.keyboard.close()
+        self.dispatcher.handler.file_receiver.close()
 
         logger.info('Client resources released')
 
@@ -141,6 +206,8 @@ class PynergyClient(ClientProtocol):
         self.running = False
 
         # Key: closing writer causes reader.read to immediately return from blocking with b''
+        if self.outbound:
+            self.outbound.flush()
         if self.writer:
             self.writer.close()
             try:
@@ -1,23 +1,105 @@
 import asyncio
 import inspect
+from collections import deque
+from collections.abc import Coroutine
 from typing import Any
 
 from loguru import logger
-from pynergy_protocol import MsgID
+from pynergy_protocol import DMouseRelMoveMsg, MsgID, Registry
 
 from .handlers import PynergyHandler
-from .protocols import ClientProtocol, DispatcherProtocol, MessageTask
+from .protocols import ClientProtocol, DispatcherProtocol, HandlerMethod, MessageTask
+
+# Latency-critical messages served ahead of queued input: keepalive, info query/ack,
+# enter/leave, bye and errors. A keepalive reply never waits behind mouse moves.
+CONTROL_CODES = frozenset({
+    MsgID.CALV,
+    MsgID.QINF,
+    MsgID.CIAK,
+    MsgID.CINN,
+    MsgID.COUT,
+    MsgID.CBYE,
+    MsgID.EBAD,
+    MsgID.EBSY,
+    MsgID.EICV,
+    MsgID.EUNK,
+})
+
+_INT16_MIN, _INT16_MAX = -0x8000, 0x7FFF
+
+
+def _no_batch():
+    pass
+
+
+class CoalescingQueue(asyncio.Queue):
+    """
+    Input lane that collapses consecutive mouse moves while they wait.
+
+    A DMMV queued right behind another DMMV replaces it (latest position wins), a
+    DMRM queued right behind another DMRM is summed into it. Any other message in
+    between, a key or a button, ends the run, so nothing else is reordered or dropped.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.coalesced_moves = 0
+        self.coalesced_rel_moves = 0
+        # Sum of the current DMRM run, owned by the queue so it can be updated in place
+        self._rel_sum: DMouseRelMoveMsg | None = None
+
+    def _put(self, item: MessageTask):
+        queue = self._queue
+        if queue:
+            last = queue[-1]
+            code = item.msg.CODE
+            if code is last.msg.CODE:
+                if code is MsgID.DMMV:
+                    last.msg = item.msg
+                    self.coalesced_moves += 1
+                    self._unfinished_tasks -= 1  # put_nowait counts the merged item
+                    return
+                if code is MsgID.DMRM:
+                    total = last.msg
+                    dx = total.dx + item.msg.dx
+                    dy = total.dy + item.msg.dy
+                    if _INT16_MIN <= dx <= _INT16_MAX and _INT16_MIN <= dy <= _INT16_MAX:
+                        if total is self._rel_sum:
+                            total.dx = dx
+                            total.dy = dy
+                        else:
+                            last.msg = self._rel_sum = DMouseRelMoveMsg(dx, dy)
+                        self.coalesced_rel_moves += 1
+                        self._unfinished_tasks -= 1
+                        return
+        queue.append(item)
 
 
 class MessageDispatcher(DispatcherProtocol):
-    def __init__(self, handler: PynergyHandler):
+    def __init__(self, handler: PynergyHandler, direct: bool = False):
         self.handler = handler
-        self.queue = asyncio.Queue(maxsize=100)
+        self.queue = CoalescingQueue(maxsize=100)
+        # Control lane, unbounded so that control messages never wait for space
+        self.control_queue: asyncio.Queue[MessageTask] = asyncio.Queue()
+        self._ready = asyncio.Event()
+        self.max_depth = {'control': 0, 'input': 0}
 
         self._handler_map = self._build_handler_map()
         self.default_handler = getattr(
             self.handler, 'default_handler', self.handler.default_handler
         )
+        # Devices are synced once per batch of handlers rather than after each of them
+        self._begin_batch = getattr(self.handler, 'begin_batch', _no_batch)
+        self._end_batch = getattr(self.handler, 'end_batch', _no_batch)
+
+        # Direct mode: handlers are called from the read path, without the queues
+        self.direct = direct
+        self._dispatch_table = self._build_dispatch_table()
+        self._backlog: deque[tuple[Any, ClientProtocol]] = deque()
+        self._async_task: asyncio.Task | None = None
+        # Messages held behind an asynchronous handler before the reader has to pause
+        self.max_backlog = 1000
+        self._backlog_waiter: asyncio.Future[None] | None = None
 
         self.last_move_time = 0
         self.throttle_interval = 0.016  # Approximately 60fps sampling rate
@@ -44,19 +126,210 @@ class MessageDispatcher(DispatcherProtocol):
         )
         return mapping
 
+    def _build_dispatch_table(self) -> dict[type, tuple[HandlerMethod, bool]]:
+        """
+        Message class -> (handler, synchronous) for direct mode.
+
+        Indexed by class rather than code, a class hashes by identity while a MsgID
+        member hashes through Enum.__hash__.
+        """
+        table = {}
+        for msg_code in Registry.get_registered_types():
+            handler = self._handler_map.get(msg_code, self.default_handler)
+            table[Registry.get_class(msg_code)] = (
+                handler,
+                getattr(handler, 'sync_handler', False),
+            )
+        return table
+
+    def _resolve(self, msg: Any) -> tuple[HandlerMethod, bool]:
+        # Lazy message views are not registered classes, resolve them once by code
+        handler = self._handler_map.get(msg.CODE, self.default_handler)
+        entry = (handler, getattr(handler, 'sync_handler', False))
+        self._dispatch_table[type(msg)] = entry
+        return entry
+
+    def dispatch_batch(self, msgs: list[Any], client: ClientProtocol):
+        """
+        Direct mode: call the handlers of a batch right away, in order.
+
+        Synchronous handlers run inline. The first asynchronous handler runs in a task
+        and every later message, of this batch and of the following ones, waits for
+        it, so handlers run in the same order as with the queue. The batch is always
+        accepted, the caller stops reading while backlog_full() and drain_backlog()
+        tells when to resume.
+        """
+        if self._async_task is not None:
+            self._backlog.extend((msg, client) for msg in msgs)
+            return
+
+        table = self._dispatch_table
+        self._begin_batch()
+        try:
+            for i, msg in enumerate(msgs):
+                handler, sync = table.get(type(msg)) or self._resolve(msg)
+                if sync:
+                    try:
+                        handler(msg, client)
+                    except Exception as e:
+                        self._log_error(msg, e)
+                    continue
+                self._backlog.extend((m, client) for m in msgs[i + 1 :])
+                self._async_task = asyncio.create_task(self._run_async(msg, handler(msg, client)))
+                return
+        finally:
+            self._end_batch()
+
+    def backlog_full(self) -> bool:
+        """Whether the messages waiting behind an asynchronous handler reached max_backlog"""
+        return len(self._backlog) >= self.max_backlog
+
+    async def drain_backlog(self):
+        """Wait until the backlog is down to half of max_backlog"""
+        if len(self._backlog) <= self.max_backlog // 2:
+            return
+        if self._backlog_waiter is None:
+            self._backlog_waiter = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._backlog_waiter)
+
+    def _wake_backlog(self):
+        waiter = self._backlog_waiter
+        self._backlog_waiter = None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _run_async(self, msg: Any, coro: Coroutine):
+        """Await an asynchronous handler, then the messages that arrived behind it"""
+        try:
+            try:
+                await coro
+            except Exception as e:
+                self._log_error(msg, e)
+
+            backlog = self._backlog
+            table = self._dispatch_table
+            while backlog:
+                msg, client = backlog.popleft()
+                if self._backlog_waiter is not None and len(backlog) <= self.max_backlog // 2:
+                    self._wake_backlog()
+                handler, sync = table.get(type(msg)) or self._resolve(msg)
+                try:
+                    if sync:
+                        self._begin_batch()
+                        handler(msg, client)
+                    else:
+                        # Events written so far are not held back behind an await
+                        self._end_batch()
+                        await handler(msg, client)
+                except Exception as e:
+                    self._log_error(msg, e)
+        finally:
+            self._end_batch()
+            self._async_task = None
+            self._wake_backlog()
+
+    @staticmethod
+    def _log_error(msg: Any, e: Exception):
+        err_str = str(e)
+        logger.opt(lazy=True).error('{log}', log=lambda: f'Error handling {msg.CODE}: {err_str}')
+
+    def queue_depths(self) -> dict[str, int]:
+        """Number of messages waiting in each lane"""
+        return {'control': self.control_queue.qsize(), 'input': self.queue.qsize()}
+
+    def coalesced(self) -> dict[str, int]:
+        """Number of queued mouse moves merged into a newer one, per message type"""
+        return {'DMMV': self.queue.coalesced_moves, 'DMRM': self.queue.coalesced_rel_moves}
+
+    def _put_control(self, task: MessageTask):
+        control_queue = self.control_queue
+        control_queue.put_nowait(task)
+        if control_queue.qsize() > self.max_depth['control']:
+            self.max_depth['control'] = control_queue.qsize()
+        self._ready.set()
+
+    def _put_input(self, task: MessageTask):
+        queue = self.queue
+        queue.put_nowait(task)
+        if queue.qsize() > self.max_depth['input']:
+            self.max_depth['input'] = queue.qsize()
+        self._ready.set()
+
     async def enqueue(self, msg: Any, client: ClientProtocol):
         handler = self._handler_map.get(msg.CODE, self.default_handler)
         task = MessageTask(handler, msg, client)
-        await self.queue.put(task)
+        if msg.CODE in CONTROL_CODES:
+            self._put_control(task)
+            return
+        if self.queue.full():
+            await self.queue.put(task)
+            self._ready.set()
+        else:
+            self._put_input(task)
+
+    async def enqueue_batch(self, msgs: list[Any], client: ClientProtocol):
+        """
+        Enqueue every message decoded from one read, only awaiting when the input lane is full.
+
+        Control messages of the batch are queued right away, even those behind input
+        messages still waiting for space.
+        """
+        rest = self.enqueue_batch_nowait(msgs, client)
+        handler_map = self._handler_map
+        default_handler = self.default_handler
+        queue = self.queue
+        for msg in rest:
+            await queue.put(MessageTask(handler_map.get(msg.CODE, default_handler), msg, client))
+            self._ready.set()
+
+    def enqueue_batch_nowait(self, msgs: list[Any], client: ClientProtocol) -> list[Any]:
+        """
+        Enqueue messages without waiting.
+
+        :return: The input messages that did not fit, in order, once the input lane is full
+        """
+        handler_map = self._handler_map
+        default_handler = self.default_handler
+        queue = self.queue
+        rest = []
+        for msg in msgs:
+            code = msg.CODE
+            task = MessageTask(handler_map.get(code, default_handler), msg, client)
+            if code in CONTROL_CODES:
+                self._put_control(task)
+            elif rest or queue.full():
+                rest.append(msg)
+            else:
+                self._put_input(task)
+        return rest
 
     async def worker(self, worker_id):
-        """Consumer: Take tasks from queue and execute"""
+        """Consumer: Take tasks from queue and execute, the control lane first"""
+        control_queue = self.control_queue
+        queue = self.queue
+        ready = self._ready
+        begin_batch = self._begin_batch
+        end_batch = self._end_batch
         while True:
-            task = await self.queue.get()
+            if control_queue.qsize():
+                lane = control_queue
+            elif queue.qsize():
+                lane = queue
+            else:
+                # Both lanes drained: the batch ends, sync the devices once
+                end_batch()
+                ready.clear()
+                await ready.wait()
+                continue
+            task = lane.get_nowait()
             try:
-                # Execute Handler and pass client
-                await task.handler(task.msg, task.client)
+                # Execute Handler and pass client, synchronous handlers return None
+                begin_batch()
+                result = task.handler(task.msg, task.client)
+                if result is not None:
+                    end_batch()
+                    await result
             except Exception as e:
                 print(f'Worker-{worker_id} Error: {e}')
             finally:
-                self.queue.task_done()
+                lane.task_done()
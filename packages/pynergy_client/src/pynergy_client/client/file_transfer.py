@@ -0,0 +1,227 @@
+"""
+DFTR file transfer receiver
+
+Chunks are written to disk as they arrive, by a single background thread so that
+disk I/O never runs on the event loop and the ordering of the chunks is kept.
+The handler only submits work and returns, input messages queued behind a
+file chunk are not delayed by the write.
+"""
+
+import os
+import struct
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+from pynergy_protocol import DFileTransferMsg, instrument
+
+_SIZE = struct.Struct('>Q')
+
+# Transfer marks of DFileTransferMsg
+DATA_START = 1
+DATA_CHUNK = 2
+DATA_END = 3
+
+
+@dataclass(slots=True)
+class _Transfer:
+    """State of one transfer, the file descriptor is only used by the writer thread"""
+
+    name: str
+    part_path: Path
+    expected: int
+    received: int = 0
+    fd: int = -1
+    error: BaseException | None = None
+
+
+def parse_size(data: bytes | memoryview) -> int:
+    """
+    Read the file size carried by kDataStart.
+
+    The size is an 8-byte big-endian integer, some servers send it as decimal text.
+    """
+    if len(data) == _SIZE.size:
+        return _SIZE.unpack(data)[0]
+    text = bytes(data).strip()
+    if text.isdigit():
+        return int(text)
+    raise ValueError(f'Invalid file size: {bytes(data[:32])!r}')
+
+
+class FileTransferReceiver:
+    """
+    Receive DFTR transfers into a directory.
+
+    The file is created as a hidden ``.part`` file, preallocated to the announced
+    size, written chunk by chunk with ``os.write`` and renamed once it is complete
+    and synced, so a partial file never appears under its final name.
+    """
+
+    def __init__(self, directory: Path, executor: Executor | None = None):
+        self.directory = Path(directory)
+        # Created on first use, and again after close when the handler is reused
+        self._executor: Executor | None = executor
+        self._transfer: _Transfer | None = None
+        # Name for the next transfer, DFTR does not carry one (set from drag info)
+        self.next_name: str | None = None
+        self.files_received = 0
+        self.bytes_received = 0
+
+    @property
+    def active(self) -> bool:
+        return self._transfer is not None
+
+    def feed(self, msg: DFileTransferMsg) -> Future[Path] | None:
+        """
+        Consume one DFTR message without blocking on disk I/O.
+
+        :return: On kDataEnd, a future resolving to the path of the received file
+        """
+        mark = msg.mark
+
+        if mark == DATA_START:
+            if self._transfer is not None:
+                logger.opt(lazy=True).warning(
+                    '{log}', log=lambda: 'New file transfer started, aborting the previous one'
+                )
+                self.abort()
+            try:
+                size = parse_size(msg.data)
+            except ValueError as e:
+                err_str = str(e)
+                logger.opt(lazy=True).error(
+                    '{log}', log=lambda: f'Ignoring file transfer: {err_str}'
+                )
+                return None
+            name = self.next_name or f'pynergy-{time.strftime("%Y%m%d-%H%M%S")}'
+            self.next_name = None
+            transfer = _Transfer(name, self.directory / f'.{name}.part', size)
+            self._transfer = transfer
+            self._submit(self._open, transfer)
+            return None
+
+        transfer = self._transfer
+        if transfer is None:
+            logger.opt(lazy=True).warning(
+                '{log}', log=lambda: f'File transfer data without kDataStart (mark {mark})'
+            )
+            return None
+
+        if mark == DATA_CHUNK:
+            if msg.data:
+                transfer.received += len(msg.data)
+                self._submit(self._write, transfer, msg.data)
+            return None
+
+        if mark == DATA_END:
+            if msg.data:
+                transfer.received += len(msg.data)
+                self._submit(self._write, transfer, msg.data)
+            self._transfer = None
+            self.files_received += 1
+            self.bytes_received += transfer.received
+            return self._submit(self._finish, transfer)
+
+        logger.opt(lazy=True).warning('{log}', log=lambda: f'Unknown file transfer mark: {mark}')
+        return None
+
+    def abort(self):
+        """Drop the transfer in progress and delete its partial file"""
+        transfer = self._transfer
+        if transfer is not None:
+            self._transfer = None
+            self._submit(self._discard, transfer)
+
+    def close(self):
+        """
+        Abort the transfer in progress without waiting for pending writes.
+
+        Called from the event loop, so the queued writes, fsync and cleanup finish
+        on the writer thread in the background instead of blocking it.
+        """
+        self.abort()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _submit(self, fn, *args) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pynergy-dftr')
+        return self._executor.submit(fn, *args)
+
+    # --- writer thread ---
+
+    def _open(self, transfer: _Transfer):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            transfer.fd = os.open(transfer.part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            if transfer.expected and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(transfer.fd, 0, transfer.expected)
+                except OSError:
+                    # Not supported by every file system, the file simply grows instead
+                    pass
+        except OSError as e:
+            transfer.error = e
+
+    @staticmethod
+    def _write(transfer: _Transfer, data: memoryview):
+        if transfer.error is not None:
+            return
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(transfer.fd, view)
+                view = view[written:]
+        except OSError as e:
+            transfer.error = e
+
+    def _finish(self, transfer: _Transfer) -> Path:
+        if transfer.error is not None:
+            self._discard(transfer)
+            raise transfer.error
+
+        try:
+            if transfer.received != transfer.expected:
+                logger.opt(lazy=True).warning(
+                    '{log}',
+                    log=lambda: (
+                        f'File {transfer.name} announced {transfer.expected} bytes, '
+                        f'received {transfer.received}'
+                    ),
+                )
+                # Drop the preallocated space that was never written
+                os.ftruncate(transfer.fd, transfer.received)
+            os.fsync(transfer.fd)
+            os.close(transfer.fd)
+            transfer.fd = -1
+
+            path = self._unique_path(transfer.name)
+            os.replace(transfer.part_path, path)
+        except OSError:
+            self._discard(transfer)
+            raise
+
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug(
+                '{log}', log=lambda: f'Received file {path} ({transfer.received} bytes)'
+            )
+        return path
+
+    @staticmethod
+    def _discard(transfer: _Transfer):
+        if transfer.fd >= 0:
+            os.close(transfer.fd)
+            transfer.fd = -1
+        transfer.part_path.unlink(missing_ok=True)
+
+    def _unique_path(self, name: str) -> Path:
+        path = self.directory / name
+        index = 1
+        while path.exists():
+            path = self.directory / f'{Path(name).stem} ({index}){Path(name).suffix}'
+            index += 1
+        return path
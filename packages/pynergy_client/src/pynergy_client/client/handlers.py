@@ -1,11 +1,18 @@
+import asyncio
 import time
 from functools import wraps
+from pathlib import PurePosixPath
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
 from .. import config
-from ..device import BaseDeviceContext, BaseKeyboardVirtualDevice, BaseMouseVirtualDevice
+from ..device import (
+    BaseDeviceContext,
+    BaseKeyboardVirtualDevice,
+    BaseMouseVirtualDevice,
+    CursorTracker,
+)
 
 if TYPE_CHECKING:
     from .client import PynergyClient
@@ -14,6 +21,11 @@ from pynergy_protocol import (
     CEnterMsg,
     CInfoAckMsg,
     CKeepAliveMsg,
+    ClipboardAssembler,
+    ClipboardData,
+    DClipboardMsg,
+    DDragInfoMsg,
+    DFileTransferMsg,
     DInfoMsg,
     DKeyDownLangMsg,
     DKeyDownMsg,
@@ -27,13 +39,44 @@ from pynergy_protocol import (
     DMouseWheelMsg,
     EIncompatibleMsg,
     MsgBase,
+    instrument,
 )
 
 from ..keymaps import hid_to_ecode, synergy_to_hid
+from .file_transfer import FileTransferReceiver
+from .motion import MotionEngine
 from .protocols import ClientState
 
 
+def sync_handler(func):
+    """
+    Mark a handler that never awaits: it is a plain function and the dispatcher calls
+    it directly, without creating a coroutine.
+    """
+    func.sync_handler = True
+    return func
+
+
 def device_check(func):
+    if getattr(func, 'sync_handler', False):
+
+        @wraps(func)
+        def sync_wrapper(self, msg, client):
+            if client.state != ClientState.ACTIVE:
+                logger.opt(lazy=True).warning(
+                    '{log}', log=lambda: f'Ignored message {msg}, current state: {client.state}'
+                )
+                return None
+
+            result = func(self, msg, client)
+
+            if not self.batching:
+                self.sync_devices()
+
+            return result
+
+        return sync_wrapper
+
     @wraps(func)
     async def wrapper(self, msg, client):
         # 1. State check (here self refers to the caller, i.e., Handler or Client instance)
@@ -46,9 +89,9 @@ def device_check(func):
         # 2. Execute core business logic
         result = await func(self, msg, client)
 
-        # 3. Unified device synchronization
-        self.mouse.syn()
-        self.keyboard.syn()
+        # 3. Unified device synchronization, once per batch when the dispatcher batches
+        if not self.batching:
+            self.sync_devices()
 
         return result
 
@@ -70,196 +113,340 @@ class PynergyHandler:
         self.mouse = mouse_device
         self.keyboard = keyboard_device
 
+        # Set by the dispatcher while it runs a batch, devices are synced at its end
+        self.batching = False
+
         self.last_mouse_time = 0
         self.interval = (
             cfg.mouse_move_threshold / 1000
         )  # ~125Hz, can balance smoothness and performance
-        self.mouse_pos_sync_freq = cfg.mouse_pos_sync_freq
-        self.move_count = 0
-        self._pending_pos = None
+        self.cursor = CursorTracker(
+            context, mouse_device, cfg.mouse_drift_threshold, cfg.mouse_probe_interval / 1000
+        )
+        # Newest throttled position, delivered by a timer when the interval expires
+        self._pending_pos: tuple[int, int] | None = None
+        self._pending_flush: asyncio.TimerHandle | None = None
+        self.moves_merged = 0  # Throttled moves superseded by a newer position
+        self.moves_flushed = 0  # Throttled positions delivered on the trailing edge
+        self.motion = (
+            MotionEngine(self._move_to, context.refresh_rate, cfg.motion_latency_budget / 1000)
+            if cfg.motion_interpolation
+            else None
+        )
+
+        self.clipboard_assembler = ClipboardAssembler(
+            spool_size=cfg.clipboard_spool_size, max_size=cfg.clipboard_max_size
+        )
+        self.clipboards: dict[int, ClipboardData] = {}  # Latest complete clipboard per identifier
+        self.file_receiver = FileTransferReceiver(cfg.file_transfer_dir)
+
+    def sync_devices(self):
+        """Emit a SYN_REPORT on each device that has events written since its last one"""
+        self.mouse.syn_if_dirty()
+        self.keyboard.syn_if_dirty()
+
+    def begin_batch(self):
+        """Defer device syncs until end_batch, one SYN_REPORT per device per batch"""
+        self.batching = True
+
+    def end_batch(self):
+        self.batching = False
+        self.sync_devices()
 
     @staticmethod
-    async def default_handler(msg, client=None):
+    @sync_handler
+    def default_handler(msg, client=None):
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Ignored message: {msg.CODE}')
 
     @staticmethod
-    async def on_hello(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_hello(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @staticmethod
-    async def on_helloback(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_helloback(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @staticmethod
-    async def on_cclp(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_cclp(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @staticmethod
-    async def on_cbye(msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_cbye(msg: MsgBase, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).info('{log}', log=lambda: 'Received connection close message')
         client.running = False
 
-    async def on_cinn(self, msg: CEnterMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_cinn(self, msg: CEnterMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).info(
             '{log}', log=lambda: f'Entered screen at position: ({msg.entry_x}, {msg.entry_y})'
         )
         self.mouse.move_absolute(msg.entry_x, msg.entry_y)
-        self.ctx.logical_pos = (msg.entry_x, msg.entry_y)
+        self.cursor.reset(msg.entry_x, msg.entry_y)
         client.state = ClientState.ACTIVE
 
         modifiers = msg.mod_key_mask
         self.keyboard.sync_modifiers(modifiers)
 
     @staticmethod
-    async def on_ciak(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_ciak(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
 
     @staticmethod
     async def on_calv(msg: CKeepAliveMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
         await client.send_message(msg.pack_for_socket())
 
-    async def on_cout(self, msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_cout(self, msg: MsgBase, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         client.state = ClientState.CONNECTED
+        self.cancel_pending_move()
+        self.cursor.log_stats()
         self.keyboard.release_all_key()
         self.mouse.release_all_button()
 
     @staticmethod
-    async def on_cnop(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_cnop(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @staticmethod
-    async def on_crop(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_crop(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @staticmethod
-    async def on_csec(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_csec(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
     @device_check
-    async def on_dkdn(self, msg: DKeyDownMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dkdn(self, msg: DKeyDownMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         key_code = msg.key_button
         self.keyboard.send_key(hid_to_ecode(synergy_to_hid(key_code)), True)
 
     @device_check
-    async def on_dkdl(self, msg: DKeyDownLangMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dkdl(self, msg: DKeyDownLangMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         key_code = msg.key_button
         self.keyboard.send_key(hid_to_ecode(synergy_to_hid(key_code)), True)
 
     @device_check
-    async def on_dkrp(self, msg: DKeyRepeatMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dkrp(self, msg: DKeyRepeatMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
 
         key_code = msg.key_button
         if key_code not in self.keyboard.pressed_keys:
             self.keyboard.send_key(hid_to_ecode(synergy_to_hid(key_code)), True)
 
     @device_check
-    async def on_dkup(self, msg: DKeyUpMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dkup(self, msg: DKeyUpMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         key_code = msg.key_button
         self.keyboard.send_key(hid_to_ecode(synergy_to_hid(key_code)), False)
 
     @device_check
-    async def on_dmdn(self, msg: DMouseDownMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dmdn(self, msg: DMouseDownMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         button = msg.button
         self.mouse.send_button(hid_to_ecode(synergy_to_hid((button << 8) + 0xAA)), True)
 
     # @device_check
-    async def on_dmmv(self, msg: DMouseMoveMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
-        now = time.perf_counter()
+    @sync_handler
+    def on_dmmv(self, msg: DMouseMoveMsg, client: 'PynergyClient'):
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
+        if self.motion is not None:
+            # The engine paces injection on the refresh tick, no throttling needed
+            self.motion.feed(msg.x, msg.y)
+            return
+        elapsed = time.perf_counter() - self.last_mouse_time
+
+        if elapsed < self.interval:
+            # Throttled: keep only the newest position, the timer delivers it at the
+            # end of the interval so the cursor never stops short of a fast flick
+            if self._pending_pos is not None:
+                self.moves_merged += 1
+            self._pending_pos = (msg.x, msg.y)
+            if self._pending_flush is None:
+                self._pending_flush = asyncio.get_running_loop().call_later(
+                    self.interval - elapsed, self._flush_pending_move
+                )
+            return
+
+        if self._pending_pos is not None:
+            # The timer has not fired yet, this newer position supersedes it
+            self.moves_merged += 1
+            self.cancel_pending_move()
+        self._move_to(msg.x, msg.y)
 
-        if now - self.last_mouse_time < self.interval:
-            # Maybe mouse debounce needed? Send after moving certain distance
-            # self._pending_pos = (msg.x, msg.y)
+    def _flush_pending_move(self):
+        self._pending_flush = None
+        pos = self._pending_pos
+        if pos is None:
             return
+        self._pending_pos = None
+        self.moves_flushed += 1
+        self._move_to(*pos)
+
+    def cancel_pending_move(self):
+        """Drop the throttled position waiting for the trailing-edge flush"""
+        if self.motion is not None:
+            self.motion.stop()
+            self.motion.log_stats()
+        self._pending_pos = None
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
 
+    def _move_to(self, x: int, y: int):
+        self.last_mouse_time = time.perf_counter()
         if self.cfg.abs_mouse_move:
-            self.mouse.move_absolute(msg.x, msg.y)
-            self.mouse.syn()
+            self.mouse.move_absolute(x, y)
         else:
-            self.move_count += 1
-            if self.move_count >= self.mouse_pos_sync_freq:
-                self.mouse.move_absolute(msg.x, msg.y)
-                self.mouse.syn()
-                self.move_count = 0
-                return
-            dx, dy = self.ctx.calculate_relative_move(msg.x, msg.y)
-            if dx != 0 or dy != 0:
-                self.mouse.move_relative(dx, dy)
-                self.mouse.syn()
+            self.cursor.move_to(x, y)
+        if not self.batching:
+            # Timer paths (trailing edge, motion engine) run outside any handler
+            self.mouse.syn_if_dirty()
 
     @device_check
-    async def on_dmrm(self, msg: DMouseRelMoveMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dmrm(self, msg: DMouseRelMoveMsg, client: 'PynergyClient'):
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
         self.mouse.move_relative(msg.dx, msg.dy)
+        self.cursor.track_relative(msg.dx, msg.dy)
 
     @device_check
-    async def on_dmup(self, msg: DMouseUpMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dmup(self, msg: DMouseUpMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         button = msg.button
         self.mouse.send_button(hid_to_ecode(synergy_to_hid((button << 8) + 0xAA)), False)
 
     @device_check
-    async def on_dmwm(self, msg: DMouseWheelMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
-
-        x, y = msg.x_delta, msg.y_delta
-        if y != 0:
-            self.mouse.wheel_relative(1 if y > 0 else -1)
-        if x != 0:
-            self.mouse.wheel_relative(1 if x > 0 else -1)
-
-    @device_check
-    async def on_dclp(self, msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dmwm(self, msg: DMouseWheelMsg, client: 'PynergyClient'):
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Handle {msg}')
+        # Deltas are in 1/120 of a notch, injected as is in one frame
+        self.mouse.wheel_hi_res(msg.y_delta, msg.x_delta)
+
+    @sync_handler
+    def on_dclp(self, msg: DClipboardMsg, client: 'PynergyClient'):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug(
+                '{log}',
+                log=lambda: (
+                    f'Handle DCLP chunk: identifier={msg.identifier}, '
+                    f'sequence={msg.sequence}, mark={msg.flag}, {len(msg.data)} bytes'
+                ),
+            )
+        # Chunks are spooled as they arrive, only the complete clipboard is kept
+        clipboard = self.clipboard_assembler.feed(msg)
+        if clipboard is None:
+            return
+        previous = self.clipboards.pop(clipboard.identifier, None)
+        if previous is not None:
+            previous.close()
+        self.clipboards[clipboard.identifier] = clipboard
 
     @staticmethod
     async def on_dinf(msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}, send CIAK')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}, send CIAK')
         await client.send_message(CInfoAckMsg().pack_for_socket())
 
     @staticmethod
-    async def on_dsop(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_dsop(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
 
-    @staticmethod
-    async def on_ddrg(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
-        logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
+    @sync_handler
+    def on_ddrg(self, msg: DDragInfoMsg, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+        # The dragged file is sent next through DFTR, which does not carry its name
+        if msg.file_paths:
+            self.file_receiver.next_name = PurePosixPath(msg.file_paths[0].replace('\\', '/')).name
+
+    @sync_handler
+    def on_dftr(self, msg: DFileTransferMsg, client=None):
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace(
+                '{log}', log=lambda: f'Handle DFTR: mark={msg.mark}, {len(msg.data)} bytes'
+            )
+        # Writes run on the receiver's thread, the handler returns immediately
+        future = self.file_receiver.feed(msg)
+        if future is not None:
+            future.add_done_callback(self._on_file_received)
 
     @staticmethod
-    async def on_dftr(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
-        logger.opt(lazy=True).warning('{log}', log=lambda: f'Handler {msg.CODE} is unimplement')
+    def _on_file_received(future):
+        if (e := future.exception()) is not None:
+            err_str = str(e)
+            logger.opt(lazy=True).error('{log}', log=lambda: f'File transfer failed: {err_str}')
+        else:
+            path = future.result()
+            logger.opt(lazy=True).info('{log}', log=lambda: f'File received: {path}')
 
     @staticmethod
-    async def on_lsyn(msg: DLanguageSynchronisationMsg, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_lsyn(msg: DLanguageSynchronisationMsg, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
 
     @staticmethod
-    async def on_secn(msg: MsgBase, client=None):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+    @sync_handler
+    def on_secn(msg: MsgBase, client=None):
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
 
     async def on_qinf(self, msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}, send DINF')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}, send DINF')
         try:
             self.ctx.update_screen_info()
             self.ctx.sync_logical_to_real()
+            self.cursor.reset(*self.ctx.logical_pos)
         except Exception:
             logger.opt(lazy=True).warning('{log}', log=lambda: f'Failed to get mouse position: {e}')
         dinf_msg = DInfoMsg(
@@ -276,17 +463,20 @@ class PynergyHandler:
 
     @staticmethod
     async def on_ebad(msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         await client.stop()
 
     @staticmethod
     async def on_ebsy(msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         await client.stop()
 
     @staticmethod
     async def on_eicv(msg: EIncompatibleMsg, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         logger.opt(lazy=True).error(
             '{log}', log=lambda: f'Version incompatible error: {msg.major}.{msg.minor}'
         )
@@ -294,5 +484,6 @@ class PynergyHandler:
 
     @staticmethod
     async def on_eunk(msg: MsgBase, client: 'PynergyClient'):
-        logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: f'Handle {msg}')
         await client.stop()
@@ -0,0 +1,159 @@
+"""
+Refresh-aligned motion engine
+
+The server sends DMMV whenever its own input arrives, so injecting them as they
+come gives uneven steps on a high refresh display. The engine resamples the
+incoming positions onto a fixed tick, one per display refresh: every tick renders
+the cursor where it was ``latency_budget`` seconds ago, interpolating between the
+two moves around that instant. When input is late the position is extrapolated
+from the last velocity, at most ``max_extrapolation`` ahead, then held on the last
+real position so a stop never overshoots for long.
+"""
+
+import asyncio
+import statistics
+from collections import deque
+from collections.abc import Callable
+
+from loguru import logger
+from pynergy_protocol import instrument
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class MotionEngine:
+    """Resample absolute pointer positions onto the display refresh tick"""
+
+    def __init__(
+        self,
+        inject: Callable[[int, int], None],
+        refresh_rate: float | None = None,
+        latency_budget: float = 0.008,
+    ):
+        self.inject = inject
+        self.refresh_rate = refresh_rate or DEFAULT_REFRESH_RATE
+        self.period = 1 / self.refresh_rate
+        self.latency_budget = latency_budget
+        self.max_extrapolation = latency_budget / 2
+
+        # Pruned by age in feed, so the budget holds whatever the input rate
+        self._samples: deque[tuple[float, int, int]] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._next_tick = 0.0
+        self._last: tuple[int, int] | None = None
+
+        self.ticks = 0
+        self.injected = 0
+        self.interpolated = 0
+        self.extrapolated = 0
+        # Lateness of recent ticks against the refresh grid, in seconds
+        self._jitter: deque[float] = deque(maxlen=1024)
+
+    @property
+    def active(self) -> bool:
+        return self._handle is not None
+
+    def feed(self, x: int, y: int, timestamp: float | None = None):
+        """Add a position received from the server, start ticking if idle"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        now = self._loop.time()
+        t = now if timestamp is None else timestamp
+        samples = self._samples
+        samples.append((t, x, y))
+        # Ticks render up to latency_budget back, one period more when a tick is late.
+        # Keep the newest sample older than that, it bounds the interpolation
+        horizon = t - self.latency_budget - self.period
+        while len(samples) > 2 and samples[1][0] <= horizon:
+            samples.popleft()
+        if self._handle is None:
+            self._next_tick = now
+            self._tick()
+
+    def stop(self):
+        """Stop ticking and forget the motion in progress"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._samples.clear()
+        self._last = None
+
+    def position_at(self, t: float) -> tuple[int, int]:
+        """Cursor position at time t, from the buffered samples"""
+        samples = self._samples
+        t1, x1, y1 = samples[-1]
+        if t >= t1:
+            if len(samples) < 2 or t - t1 > self.max_extrapolation:
+                return x1, y1
+            t0, x0, y0 = samples[-2]
+            if t1 <= t0:
+                return x1, y1
+            # Input is late: continue at the last velocity, within the budget
+            self.extrapolated += 1
+            scale = (t - t1) / (t1 - t0)
+            return round(x1 + (x1 - x0) * scale), round(y1 + (y1 - y0) * scale)
+
+        for i in range(len(samples) - 1, 0, -1):
+            t0, x0, y0 = samples[i - 1]
+            if t0 <= t:
+                t1, x1, y1 = samples[i]
+                self.interpolated += 1
+                scale = (t - t0) / (t1 - t0)
+                return round(x0 + (x1 - x0) * scale), round(y0 + (y1 - y0) * scale)
+        _, x0, y0 = samples[0]
+        return x0, y0
+
+    def _tick(self):
+        loop = self._loop
+        now = loop.time()
+        self._jitter.append(now - self._next_tick)
+        self.ticks += 1
+
+        render_time = now - self.latency_budget
+        pos = self.position_at(render_time)
+        if pos != self._last:
+            self._last = pos
+            self.injected += 1
+            self.inject(*pos)
+
+        t_last, x_last, y_last = self._samples[-1]
+        if render_time - t_last > self.max_extrapolation and pos == (x_last, y_last):
+            # Caught up with the last position, idle until the next move
+            self._handle = None
+            return
+
+        next_tick = self._next_tick + self.period
+        if next_tick <= now:
+            # Missed ticks (busy loop), realign on the grid instead of bursting
+            next_tick += (now - next_tick) // self.period * self.period + self.period
+        self._next_tick = next_tick
+        self._handle = loop.call_at(next_tick, self._tick)
+
+    def stats(self) -> dict[str, float]:
+        """Tick counters and jitter of the injection ticks, in microseconds"""
+        jitter = sorted(self._jitter)
+        result = {
+            'refresh_rate': self.refresh_rate,
+            'ticks': self.ticks,
+            'injected': self.injected,
+            'interpolated': self.interpolated,
+            'extrapolated': self.extrapolated,
+        }
+        if len(jitter) >= 2:
+            quantiles = statistics.quantiles(jitter, n=100)
+            result.update({
+                'jitter_mean_us': statistics.fmean(jitter) * 1e6,
+                'jitter_p50_us': quantiles[49] * 1e6,
+                'jitter_p99_us': quantiles[98] * 1e6,
+                'jitter_max_us': jitter[-1] * 1e6,
+            })
+        return result
+
+    def log_stats(self):
+        if instrument.DEBUG_ENABLED:
+            stats = self.stats()
+            logger.opt(lazy=True).debug(
+                '{log}',
+                log=lambda: 'Motion engine: ' + ', '.join(f'{k}={v:.1f}' for k, v in stats.items()),
+            )
@@ -0,0 +1,104 @@
+"""
+Coalesced outbound writer
+
+Handlers answer the server with small messages (CALV echoes, CIAK, DINF), often
+several from one batch of inbound messages. Instead of a write and a drain per
+message, messages are collected until the end of the current loop iteration and
+flushed with a single ``writelines``, one TLS record instead of one per message.
+Senders only wait for the transport when its write buffer is above the high-water
+mark, the same condition in which ``StreamWriter.drain`` would block.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from pynergy_protocol import instrument
+
+if TYPE_CHECKING:
+    from .transport import BufferedClientProtocol
+
+
+class OutboundWriter:
+    """Collect outbound messages and flush them once per loop iteration"""
+
+    def __init__(self, writer: 'asyncio.StreamWriter | BufferedClientProtocol'):
+        self.writer = writer
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._scheduled: asyncio.Handle | None = None
+
+        transport = writer.transport
+        self._high_water = transport.get_write_buffer_limits()[1]
+
+        self.flushes = 0
+        self.messages = 0
+        self.bytes = 0
+        self.max_flush_messages = 0
+
+    @property
+    def messages_per_flush(self) -> float:
+        return self.messages / self.flushes if self.flushes else 0.0
+
+    @property
+    def bytes_per_flush(self) -> float:
+        return self.bytes / self.flushes if self.flushes else 0.0
+
+    @property
+    def backpressure(self) -> bool:
+        """Whether the transport buffers more than its high-water mark"""
+        return self.writer.transport.get_write_buffer_size() > self._high_water
+
+    def write(self, data: bytes):
+        """Queue a message, it is sent at the end of the current loop iteration"""
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        if self._scheduled is None:
+            self._scheduled = asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        """Write every queued message at once"""
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        pending = self._pending
+        if not pending:
+            return
+        count = len(pending)
+        size = self._pending_bytes
+        self._pending = []
+        self._pending_bytes = 0
+        if self.writer.transport.is_closing():
+            return
+        if count == 1:
+            self.writer.write(pending[0])
+        else:
+            self.writer.writelines(pending)
+
+        self.flushes += 1
+        self.messages += count
+        self.bytes += size
+        if count > self.max_flush_messages:
+            self.max_flush_messages = count
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace(
+                '{log}', log=lambda: f'Flushed {count} messages ({size} bytes)'
+            )
+
+    async def drain(self):
+        """Flush now and wait until the transport accepts more data"""
+        self.flush()
+        await self.writer.drain()
+
+    def close(self):
+        """Flush what is left before the transport closes"""
+        self.flush()
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug(
+                '{log}',
+                log=lambda: (
+                    f'Outbound: {self.messages} messages in {self.flushes} flushes, '
+                    f'{self.messages_per_flush:.1f} messages / '
+                    f'{self.bytes_per_flush:.0f} bytes per flush'
+                ),
+            )
@@ -1,12 +1,15 @@
 import asyncio
+from collections.abc import Awaitable
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
 from pynergy_protocol import MsgBase, PynergyParser
 
 if TYPE_CHECKING:
     from ..client.handlers import PynergyHandler
+    from .outbound import OutboundWriter
+    from .transport import BufferedClientProtocol
 
 
 class ClientState(Enum):
@@ -30,7 +33,8 @@ class ClientProtocol(Protocol):
     running: bool
 
     reader: asyncio.StreamReader | None
-    writer: asyncio.StreamWriter | None
+    writer: 'asyncio.StreamWriter | BufferedClientProtocol | None'
+    outbound: 'OutboundWriter | None'
 
     parser: PynergyParser
     dispatcher: 'DispatcherProtocol'
@@ -47,7 +51,7 @@ class ClientProtocol(Protocol):
 
 
 class HandlerMethod(Protocol):
-    async def __call__(self, msg: MsgBase, client: ClientProtocol) -> None: ...
+    def __call__(self, msg: MsgBase, client: ClientProtocol) -> Awaitable[None] | None: ...
 
 
 @dataclass
@@ -60,7 +64,23 @@ class MessageTask:
 class DispatcherProtocol(Protocol):
     handler: 'PynergyHandler'
     queue: asyncio.Queue[MessageTask]
+    direct: bool
+    control_queue: asyncio.Queue[MessageTask]
 
     async def enqueue(self, msg: MsgBase, client: ClientProtocol): ...
 
+    async def enqueue_batch(self, msgs: list[MsgBase], client: ClientProtocol): ...
+
+    def enqueue_batch_nowait(self, msgs: list[MsgBase], client: ClientProtocol) -> list[Any]: ...
+
+    def dispatch_batch(self, msgs: list[MsgBase], client: ClientProtocol): ...
+
+    def backlog_full(self) -> bool: ...
+
+    async def drain_backlog(self): ...
+
+    def queue_depths(self) -> dict[str, int]: ...
+
+    def coalesced(self) -> dict[str, int]: ...
+
     async def worker(self, worker_id): ...
@@ -0,0 +1,159 @@
+"""
+Buffered protocol transport
+
+``asyncio.BufferedProtocol`` lets the event loop receive straight into memory we
+hand out: the free space at the end of the parser buffer. Received bytes are
+parsed and dispatched from ``buffer_updated``, without the intermediate
+StreamReader buffer, the bytes object returned by ``read`` and the copy made by
+``PynergyParser.feed``.
+
+The protocol also exposes the subset of ``asyncio.StreamWriter`` the client uses
+(``write``, ``drain``, ``close``, ``wait_closed``, ``transport``), so it can stand
+in for the writer once connected, TLS included.
+"""
+
+import asyncio
+from collections.abc import Callable
+
+from loguru import logger
+from pynergy_protocol import HelloMsg, MsgBase, MsgID, PynergyParser, instrument
+
+
+class BufferedClientProtocol(asyncio.BufferedProtocol):
+    """Receive into the parser buffer and hand decoded batches to a callback"""
+
+    MIN_READ_SIZE = 4096
+    MAX_READ_SIZE = 256 * 1024
+
+    def __init__(self, parser: PynergyParser):
+        self.parser = parser
+        self.transport: asyncio.Transport | None = None
+
+        loop = asyncio.get_running_loop()
+        self.hello: asyncio.Future[HelloMsg] = loop.create_future()
+        self._closed: asyncio.Future[None] = loop.create_future()
+        self._on_messages: Callable[[list[MsgBase]], None] | None = None
+
+        # Grows while reads fill the buffer (bulk transfers), shrinks back otherwise
+        self._read_size = self.MIN_READ_SIZE
+
+        self._paused = False
+        self._drain_waiter: asyncio.Future[None] | None = None
+        self._exception: BaseException | None = None
+
+        self.bytes_received = 0
+        self.reads = 0
+
+    # --- asyncio.BufferedProtocol ---
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        self.transport = transport  # type: ignore[assignment]
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # sizehint is a recommended minimum, -1 when any size will do
+        return self.parser.get_buffer(max(sizehint, self._read_size))
+
+    def buffer_updated(self, nbytes: int):
+        self.parser.buffer_updated(nbytes)
+        self.bytes_received += nbytes
+        self.reads += 1
+
+        if nbytes == self._read_size:
+            self._read_size = min(self._read_size * 2, self.MAX_READ_SIZE)
+        elif nbytes < self._read_size // 2:
+            self._read_size = max(self._read_size // 2, self.MIN_READ_SIZE)
+
+        if self._on_messages is not None:
+            msgs = self.parser.parse_all()
+            if msgs:
+                self._on_messages(msgs)
+        elif not self.hello.done():
+            try:
+                msg = self.parser.next_handshake_msg(MsgID.Hello)
+            except Exception as e:
+                self.hello.set_exception(e)
+                return
+            if msg is not None:
+                self.hello.set_result(msg)
+
+    def eof_received(self) -> bool:
+        # The loop reserved a buffer for the read that returned EOF
+        self.parser.release_buffer()
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug('{log}', log=lambda: 'Server closed the connection')
+        return False
+
+    def connection_lost(self, exc: Exception | None):
+        self.parser.release_buffer()
+        self._exception = exc
+        error = exc or ConnectionResetError('Connection lost')
+        if not self.hello.done():
+            self.hello.set_exception(error)
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(error)
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    # --- client side ---
+
+    def start(self, on_messages: Callable[[list[MsgBase]], None]):
+        """Dispatch every batch decoded from now on, including what followed the handshake"""
+        self._on_messages = on_messages
+        if not self.hello.done():
+            # Started without a handshake, nobody will wait for it anymore
+            self.hello.cancel()
+        msgs = self.parser.parse_all()
+        if msgs:
+            on_messages(msgs)
+
+    def pause_reading(self):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.pause_reading()
+
+    def resume_reading(self):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.resume_reading()
+
+    # --- asyncio.StreamWriter subset ---
+
+    def write(self, data: bytes):
+        assert self.transport, 'Transport not connected'
+        self.transport.write(data)
+
+    def writelines(self, data):
+        assert self.transport, 'Transport not connected'
+        self.transport.writelines(data)
+
+    async def drain(self):
+        if self._closed.done():
+            raise ConnectionResetError('Connection lost') from self._exception
+        if not self._paused:
+            return
+        waiter = self._drain_waiter
+        if waiter is None or waiter.done():
+            waiter = self._drain_waiter = asyncio.get_running_loop().create_future()
+        await waiter
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def is_closing(self) -> bool:
+        return self.transport is None or self.transport.is_closing()
+
+    async def wait_closed(self):
+        await asyncio.shield(self._closed)
+
+    def get_extra_info(self, name: str, default=None):
+        assert self.transport, 'Transport not connected'
+        return self.transport.get_extra_info(name, default)
@@ -6,9 +6,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
-from platformdirs import user_config_path, user_log_path
+from platformdirs import user_config_path, user_downloads_path, user_log_path
 
 LogLevel = Literal['TRACE', 'DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL']
+EventLoop = Literal['asyncio', 'uvloop']
 Available_Backends = Literal[
     'uinput',
     # 'pynput',
@@ -26,13 +27,23 @@ class Config:
     screen_height: int | None = None
     mouse_backend: Available_Backends | None = None
     keyboard_backend: Available_Backends | None = None
+    event_loop: EventLoop = 'asyncio'  # 'uvloop' when installed, falls back to asyncio
 
     # --- Handler ---
     abs_mouse_move: bool = False
     mouse_move_threshold: int = 8  # Unit: ms, approx 125Hz, balances smoothness and performance
-    mouse_pos_sync_freq: int = (
-        2  # Sync frequency, sync actual mouse position with system every n moves
-    )
+    mouse_drift_threshold: int = 4  # Unit: px, relative mode corrects a larger cursor drift
+    mouse_probe_interval: int = 250  # Unit: ms, minimum interval between cursor probes
+    motion_interpolation: bool = False  # Resample mouse moves onto the display refresh rate
+    motion_latency_budget: int = 8  # Unit: ms, how far behind the newest move the cursor runs
+
+    # --- Protocol ---
+    lazy_messages: bool = False  # Decode high-frequency input messages only when read
+    transport: Literal['stream', 'buffered'] = 'stream'  # 'buffered' receives into the parser
+    dispatch_mode: Literal['queue', 'direct'] = 'queue'  # 'direct' calls handlers from the reader
+    clipboard_spool_size: int = 1024 * 1024  # Unit: bytes, larger clipboards spill to a temp file
+    clipboard_max_size: int = 512 * 1024 * 1024  # Unit: bytes, larger clipboards are dropped
+    file_transfer_dir: Path = user_downloads_path()  # Directory receiving DFTR file transfers
 
     tls: bool = False
     mtls: bool = False
@@ -47,10 +58,18 @@ class Config:
     log_level_stdout: LogLevel = 'INFO'  # Stdout log level
 
     def __post_init__(self):
+        if self.mouse_drift_threshold < 1:
+            raise ValueError(
+                f'mouse_drift_threshold must be at least 1 px, got {self.mouse_drift_threshold}'
+            )
         if isinstance(self.pem_path, str):
             if self.pem_path.startswith('~'):
                 self.pem_path = Path(self.pem_path).expanduser()
             self.pem_path = Path(self.pem_path)
+        if isinstance(self.file_transfer_dir, str):
+            if self.file_transfer_dir.startswith('~'):
+                self.file_transfer_dir = Path(self.file_transfer_dir).expanduser()
+            self.file_transfer_dir = Path(self.file_transfer_dir)
         if isinstance(self.log_dir, str):
             if self.log_dir.startswith('~'):
                 self.log_dir = Path(self.log_dir).expanduser()
@@ -7,12 +7,14 @@ from .base import (
     BaseMouseVirtualDevice,
     BaseVirtualDevice,
 )
+from .cursor import CursorTracker
 
 __all__ = [
     'BaseDeviceContext',
     'BaseKeyboardVirtualDevice',
     'BaseMouseVirtualDevice',
     'BaseVirtualDevice',
+    'CursorTracker',
     'UInputKeyboardDevice',
     'UInputMouseDevice',
     'WaylandDeviceContext',
@@ -38,7 +38,14 @@ class UInputMouseDevice(BaseMouseVirtualDevice):
                 e.BTN_BACK,
                 e.BTN_TASK,
             ],
-            e.EV_REL: [e.REL_X, e.REL_Y, e.REL_WHEEL, e.REL_HWHEEL],
+            e.EV_REL: [
+                e.REL_X,
+                e.REL_Y,
+                e.REL_WHEEL,
+                e.REL_HWHEEL,
+                e.REL_WHEEL_HI_RES,
+                e.REL_HWHEEL_HI_RES,
+            ],
             e.EV_ABS: [
                 (
                     e.ABS_X,
@@ -60,21 +67,32 @@ class UInputMouseDevice(BaseMouseVirtualDevice):
         )
 
     def move_absolute(self, x: int, y: int) -> None:
-        self._ui.write(e.EV_ABS, e.ABS_X, x)
-        self._ui.write(e.EV_ABS, e.ABS_Y, y)
+        self._write(e.EV_ABS, e.ABS_X, x)
+        self._write(e.EV_ABS, e.ABS_Y, y)
 
     def move_relative(self, dx: int, dy: int) -> None:
-        self._ui.write(e.EV_REL, e.REL_X, dx)
-        self._ui.write(e.EV_REL, e.REL_Y, dy)
+        self._write(e.EV_REL, e.REL_X, dx)
+        self._write(e.EV_REL, e.REL_Y, dy)
 
     def wheel_relative(self, dy: int = 0, dx: int = 0) -> None:
         if dy != 0:
-            self._ui.write(e.EV_REL, e.REL_WHEEL, dy)
+            self._write(e.EV_REL, e.REL_WHEEL, dy)
+        if dx != 0:
+            self._write(e.EV_REL, e.REL_HWHEEL, dx)
+
+    def wheel_hi_res(self, dy: int = 0, dx: int = 0) -> None:
+        # Hi-res events carry the exact distance, legacy clicks follow each notch
+        if dy != 0:
+            self._write(e.EV_REL, e.REL_WHEEL_HI_RES, dy)
+            if clicks := self.wheel_y.feed(dy):
+                self._write(e.EV_REL, e.REL_WHEEL, clicks)
         if dx != 0:
-            self._ui.write(e.EV_REL, e.REL_HWHEEL, dx)
+            self._write(e.EV_REL, e.REL_HWHEEL_HI_RES, dx)
+            if clicks := self.wheel_x.feed(dx):
+                self._write(e.EV_REL, e.REL_HWHEEL, clicks)
 
     def wheel_absolute(self, degree: int = 0) -> None:
-        self._ui.write(e.EV_ABS, e.ABS_WHEEL, degree)
+        self._write(e.EV_ABS, e.ABS_WHEEL, degree)
 
     def send_button(self, button_id: int, down: bool) -> None:
         if down:
@@ -83,14 +101,21 @@ class UInputMouseDevice(BaseMouseVirtualDevice):
         else:
             self.pressed_btns.discard(button_id)
             value = 0
-        self._ui.write(e.EV_KEY, button_id, value)
+        self._write(e.EV_KEY, button_id, value)
 
     def release_all_button(self) -> None:
         for button_id in list(self.pressed_btns):
             self.send_button(button_id, False)
 
+    def _write(self, event_type: int, event_code: int, value: int) -> None:
+        self._ui.write(event_type, event_code, value)
+        self.events += 1
+        self.dirty = True
+
     def syn(self) -> None:
         self._ui.syn()
+        self.syns += 1
+        self.dirty = False
 
     def close(self) -> None:
         self._ui.close()
@@ -133,7 +158,7 @@ class UInputKeyboardDevice(BaseKeyboardVirtualDevice):
             self.pressed_keys.discard(key_code)
             value = 0
 
-        self._ui.write(e.EV_KEY, key_code, value)
+        self._write(e.EV_KEY, key_code, value)
 
     def release_all_key(self) -> None:
         for key_code in list(self.pressed_keys):
@@ -195,8 +220,15 @@ class UInputKeyboardDevice(BaseKeyboardVirtualDevice):
         # 3. 更新当前记录的状态
         self.current_modifiers = modifiers
 
+    def _write(self, event_type: int, event_code: int, value: int) -> None:
+        self._ui.write(event_type, event_code, value)
+        self.events += 1
+        self.dirty = True
+
     def syn(self) -> None:
         self._ui.syn()
+        self.syns += 1
+        self.dirty = False
 
     def close(self) -> None:
         self._ui.close()
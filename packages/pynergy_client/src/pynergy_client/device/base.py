@@ -22,17 +22,31 @@ class BaseDeviceContext(ABC):
         self.logical_pos: Tuple[int, int] = (0, 0)
         self.screen_size: Tuple[int, int] = (0, 0)
         self.scale: float = 1.0
+        self.refresh_rate: float | None = None  # Hz, None when it cannot be detected
+        self.can_probe_cursor: bool = False  # Whether probe_cursor_pos can report anything
 
     @abstractmethod
     def update_screen_info(self) -> None:
         """Get current system screen resolution, scale, and other metadata"""
         pass
 
+    def update_refresh_rate(self) -> None:
+        """Detect the display refresh rate only, when the screen size is configured"""
+        pass
+
     @abstractmethod
     def get_real_cursor_pos(self) -> Tuple[int, int] | None:
         """Get the real cursor position from the system"""
         pass
 
+    def probe_cursor_pos(self) -> Tuple[int, int] | None:
+        """
+        Query the real cursor position without any fallback, None when the platform
+        cannot report it. Called from a worker thread by the cursor tracker, only when
+        can_probe_cursor is set.
+        """
+        return None
+
     def sync_logical_to_real(self):
         """Sync logical position to real position to prevent offset accumulation"""
         real_pos = self.get_real_cursor_pos()
@@ -45,8 +59,8 @@ class BaseDeviceContext(ABC):
         and automatically update internal logical position.
         """
         # 1. Boundary clamping: prevent target coordinates from exceeding local screen range
-        clamped_x = max(0, min(target_x, self.screen_size[0]))
-        clamped_y = max(0, min(target_y, self.screen_size[1]))
+        clamped_x = max(0, min(target_x, self.screen_size[0] - 1))
+        clamped_y = max(0, min(target_y, self.screen_size[1] - 1))
 
         # 2. Calculate displacement (Delta)
         dx = clamped_x - self.logical_pos[0]
@@ -88,12 +102,52 @@ class BaseDeviceContext(ABC):
         return None
 
 
+WHEEL_DELTA = 120  # One wheel notch, both in protocol units and in kernel hi-res units
+
+
+class WheelAccumulator:
+    """Turn high-resolution wheel deltas into legacy clicks at each notch boundary"""
+
+    def __init__(self):
+        self.remainder = 0  # Hi-res units scrolled past the last click, signed
+
+    def feed(self, delta: int) -> int:
+        """Add a delta in 1/120 of a notch, return the legacy clicks it completes"""
+        if delta == 0:
+            return 0
+        if (delta > 0) != (self.remainder > 0):
+            # Direction reversed, the partial notch the other way is dropped
+            self.remainder = 0
+        self.remainder += delta
+        clicks = abs(self.remainder) // WHEEL_DELTA
+        if clicks == 0:
+            return 0
+        if self.remainder < 0:
+            clicks = -clicks
+        self.remainder -= clicks * WHEEL_DELTA
+        return clicks
+
+
 class BaseVirtualDevice(ABC):
+    def __init__(self):
+        self.dirty = False  # Events were written since the last SYN_REPORT
+        self.events = 0  # Events written, one syscall each
+        self.syns = 0  # SYN_REPORTs emitted, one syscall each
+
+    @property
+    def syscalls(self) -> int:
+        return self.events + self.syns
+
     @abstractmethod
     def syn(self) -> None:
         """Synchronize events"""
         pass
 
+    def syn_if_dirty(self) -> None:
+        """Synchronize only when events were written since the last sync"""
+        if self.dirty:
+            self.syn()
+
     @abstractmethod
     def close(self) -> None:
         """Close device"""
@@ -110,7 +164,10 @@ class BaseVirtualDevice(ABC):
 
 class BaseMouseVirtualDevice(BaseVirtualDevice):
     def __init__(self):
+        super().__init__()
         self.pressed_btns: set[int] = set()
+        self.wheel_y = WheelAccumulator()
+        self.wheel_x = WheelAccumulator()
 
     @abstractmethod
     def move_absolute(self, x: int, y: int) -> None:
@@ -127,6 +184,16 @@ class BaseMouseVirtualDevice(BaseVirtualDevice):
         """Write wheel event"""
         pass
 
+    def wheel_hi_res(self, dy: int = 0, dx: int = 0) -> None:
+        """
+        Scroll by dy/dx in 1/120 of a notch. Backends without high-resolution wheel
+        events only get the legacy clicks, emitted as each notch completes.
+        """
+        clicks_y = self.wheel_y.feed(dy)
+        clicks_x = self.wheel_x.feed(dx)
+        if clicks_y != 0 or clicks_x != 0:
+            self.wheel_relative(clicks_y, clicks_x)
+
     @abstractmethod
     def wheel_absolute(self, degree: int = 0) -> None:
         """"""
@@ -145,6 +212,7 @@ class BaseMouseVirtualDevice(BaseVirtualDevice):
 
 class BaseKeyboardVirtualDevice(BaseVirtualDevice):
     def __init__(self):
+        super().__init__()
         self.pressed_keys: set[int] = set()
         self.current_modifiers: int = 0
 
@@ -10,18 +10,28 @@ from pynergy_client.device.base import BaseDeviceContext
 class WaylandDeviceContext(BaseDeviceContext):
     def __init__(self):
         super().__init__()
+        self.can_probe_cursor = os.getenv('XDG_CURRENT_DESKTOP') == 'Hyprland'
+
+    @staticmethod
+    def _current_mode() -> dict:
+        result = subprocess.run(['wlr-randr', '--json'], capture_output=True, text=True)
+        json_dict = json.loads(result.stdout)
+        for mode in json_dict[0]['modes']:
+            if mode['current']:
+                return mode
+        raise ValueError('wlr-randr reports no current mode')
 
     def update_screen_info(self) -> None:
         try:
-            result = subprocess.run(['wlr-randr', '--json'], capture_output=True, text=True)
-            json_dict = json.loads(result.stdout)
-            for mode in json_dict[0]['modes']:
-                if mode['current']:
-                    self.screen_size = (mode['width'], mode['height'])
-                    return
-        except Exception:
+            mode = self._current_mode()
+            self.screen_size = (mode['width'], mode['height'])
+            self.refresh_rate = mode.get('refresh')
+            return
+        except Exception as e:
+            err_str = str(e)
             logger.opt(lazy=True).warning(
-                '{log}', log=lambda: f'Failed to get active screen resolution by wlr-randr: {e}'
+                '{log}',
+                log=lambda: f'Failed to get active screen resolution by wlr-randr: {err_str}',
             )
 
         try:
@@ -41,22 +51,30 @@ class WaylandDeviceContext(BaseDeviceContext):
             '{log}', log=lambda: f'Using default screen size: {self.screen_size}'
         )
 
-    def get_real_cursor_pos(self) -> tuple[int, int] | None:
+    def update_refresh_rate(self) -> None:
         try:
-            match os.getenv('XDG_CURRENT_DESKTOP'):
-                case 'Hyprland':
-                    result = subprocess.run(
-                        ['hyprctl', 'cursorpos'], capture_output=True, text=True
-                    )
-                    x, y = [int(s) for s in result.stdout.split(',')]
-                    return x, y
-                case _:
-                    raise ValueError('Unsupported desktop environment')
-        except Exception:
+            self.refresh_rate = self._current_mode().get('refresh')
+        except Exception as e:
+            err_str = str(e)
             logger.opt(lazy=True).warning(
-                '{log}', log=lambda: f'get cursor pos by hyprctl failed: {e}'
+                '{log}', log=lambda: f'Failed to get refresh rate by wlr-randr: {err_str}'
             )
 
+    def probe_cursor_pos(self) -> tuple[int, int] | None:
+        if not self.can_probe_cursor:
+            return None
+        try:
+            result = subprocess.run(['hyprctl', 'cursorpos'], capture_output=True, text=True)
+            x, y = [int(s) for s in result.stdout.split(',')]
+            return x, y
+        except Exception:
+            return None
+
+    def get_real_cursor_pos(self) -> tuple[int, int] | None:
+        pos = self.probe_cursor_pos()
+        if pos is not None:
+            return pos
+
         # Last attempt: use environment variables or default values
         logger.opt(lazy=True).warning(
             '{log}',
@@ -0,0 +1,215 @@
+"""
+Dead-reckoning cursor tracker
+
+In relative mode the cursor is driven by deltas, which the compositor may scale
+(pointer acceleration) and other input devices may add to, so the local cursor can
+drift from the position the server sent. Instead of writing an absolute position
+every few moves, the tracker keeps the expected position from the injected deltas,
+clamped at the screen edges like the compositor does, and estimates the drift from
+the distance travelled since the position was last verified. Only when the estimate
+crosses the threshold is the real position probed, off the event loop, and an
+absolute correction is written only when the probe shows a real divergence.
+
+Whether the platform can probe is checked once. Without a probe the drift cannot be
+measured, so no corrections are written at all: the cursor is then only realigned
+when the server sends it onto the screen again (reset).
+"""
+
+import asyncio
+import math
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from pynergy_protocol import instrument
+
+if TYPE_CHECKING:
+    from .base import BaseDeviceContext, BaseMouseVirtualDevice
+
+INITIAL_DRIFT_RATE = 1 / 32  # Pixels of drift per pixel travelled, before any probe
+MIN_DRIFT_RATE = 1 / 1024  # Keeps probing, other devices can move the cursor too
+
+
+def _distance_to_path(
+    point: tuple[int, int], start: tuple[int, int], end: tuple[int, int]
+) -> float:
+    """Distance from point to the segment the cursor followed while a probe ran"""
+    px, py = point
+    ax, ay = start
+    vx, vy = end[0] - ax, end[1] - ay
+    length = vx * vx + vy * vy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((px - ax) * vx + (py - ay) * vy) / length))
+    return math.hypot(px - (ax + t * vx), py - (ay + t * vy))
+
+
+class CursorTracker:
+    """Track the cursor from injected deltas, correct it only when it has drifted"""
+
+    def __init__(
+        self,
+        ctx: 'BaseDeviceContext',
+        mouse: 'BaseMouseVirtualDevice',
+        drift_threshold: int = 4,
+        probe_interval: float = 0.25,
+    ):
+        self.ctx = ctx
+        self.mouse = mouse
+        self.drift_threshold = drift_threshold
+        self.probe_interval = probe_interval
+
+        self.drift_rate = INITIAL_DRIFT_RATE  # Learnt from the probes
+        self.travel = 0  # Pixels injected since the position was last verified
+        # Travel at which the estimate crosses the threshold, the only check per move
+        self._due_travel = self._next_due_travel()
+        self._scheduled: asyncio.TimerHandle | None = None
+        self._probe: asyncio.Future | None = None
+        self._probe_from = (0, 0)  # Expected position when the running probe started
+        self._probe_travel = 0
+        self._last_probe = -math.inf
+
+        self.probes = 0
+        self.corrections = 0
+        self.max_drift = 0.0
+
+        if not ctx.can_probe_cursor:
+            logger.opt(lazy=True).info(
+                '{log}',
+                log=lambda: 'Cursor position cannot be probed, relative moves are not corrected',
+            )
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.ctx.logical_pos
+
+    @property
+    def estimated_drift(self) -> float:
+        return self.travel * self.drift_rate
+
+    def reset(self, x: int, y: int):
+        """The real position is known, e.g. the cursor entered the screen there"""
+        self.ctx.logical_pos = (x, y)
+        self.travel = 0
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        self._probe = None  # A running probe measured the old position
+        self._due_travel = self._next_due_travel()
+
+    def _next_due_travel(self) -> float:
+        if not self.ctx.can_probe_cursor:
+            return math.inf  # Nothing to measure the drift with, never probe
+        return self.drift_threshold / self.drift_rate
+
+    def move_to(self, x: int, y: int):
+        """Inject the relative move reaching (x, y) from the expected position, unsynced"""
+        dx, dy = self.ctx.calculate_relative_move(x, y)
+        if dx != 0 or dy != 0:
+            self.mouse.move_relative(dx, dy)
+            self.travel += abs(dx) + abs(dy)
+            if self.travel >= self._due_travel:
+                self._probe_when_allowed()
+
+    def track_relative(self, dx: int, dy: int):
+        """Account for a relative move injected as is, clamped at the screen edges"""
+        ctx = self.ctx
+        x, y = ctx.logical_pos
+        x += dx
+        y += dy
+        width, height = ctx.screen_size
+        if x < 0:
+            x = 0
+        elif x >= width:
+            x = width - 1
+        if y < 0:
+            y = 0
+        elif y >= height:
+            y = height - 1
+        ctx.logical_pos = (x, y)
+        self.travel += abs(dx) + abs(dy)
+        if self.travel >= self._due_travel:
+            self._probe_when_allowed()
+
+    def _probe_when_allowed(self):
+        # Moves skip the check until this probe is done
+        self._due_travel = math.inf
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Not driven from the event loop, nothing to run the probe on
+        delay = self._last_probe + self.probe_interval - loop.time()
+        if delay > 0:
+            self._scheduled = loop.call_later(delay, self._start_probe)
+        else:
+            self._start_probe()
+
+    def _start_probe(self):
+        self._scheduled = None
+        loop = asyncio.get_running_loop()
+        self._last_probe = loop.time()
+        self._probe_from = self.ctx.logical_pos
+        self._probe_travel = self.travel
+        # The probe may run a command (hyprctl), keep it off the event loop
+        self._probe = loop.run_in_executor(None, self.ctx.probe_cursor_pos)
+        self._probe.add_done_callback(self._on_probe)
+
+    def _on_probe(self, future: asyncio.Future):
+        if future is not self._probe:
+            return
+        self._probe = None
+        try:
+            self._check_probe(future)
+        finally:
+            self._due_travel = self._next_due_travel()
+
+    def _check_probe(self, future: asyncio.Future):
+        if future.cancelled():
+            return
+        if (e := future.exception()) is not None:
+            err_str = str(e)
+            logger.opt(lazy=True).warning('{log}', log=lambda: f'Cursor probe failed: {err_str}')
+            return
+
+        real = future.result()
+        if real is None:
+            return  # The probe failed this time, e.g. hyprctl is unavailable
+
+        self.probes += 1
+        drift = _distance_to_path(real, self._probe_from, self.ctx.logical_pos)
+        self.max_drift = max(self.max_drift, drift)
+        if self._probe_travel > 0:
+            observed_rate = drift / self._probe_travel
+            self.drift_rate = max(MIN_DRIFT_RATE, (3 * self.drift_rate + observed_rate) / 4)
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace(
+                '{log}',
+                log=lambda: (
+                    f'Cursor probe: real {real}, drift {drift:.1f}px '
+                    f'after {self._probe_travel}px, rate {self.drift_rate:.4f}'
+                ),
+            )
+        if drift > self.drift_threshold:
+            self._correct()
+        else:
+            # Verified when the probe ran, only the later moves are unverified
+            self.travel -= self._probe_travel
+
+    def _correct(self):
+        self.corrections += 1
+        self.travel = 0
+        self.mouse.move_absolute(*self.ctx.logical_pos)
+        self.mouse.syn()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            'probes': self.probes,
+            'corrections': self.corrections,
+            'max_drift': self.max_drift,
+            'drift_rate': self.drift_rate,
+        }
+
+    def log_stats(self):
+        if instrument.DEBUG_ENABLED:
+            stats = self.stats()
+            logger.opt(lazy=True).debug(
+                '{log}',
+                log=lambda: 'Cursor tracker: ' + ', '.join(f'{k}={v:g}' for k, v in stats.items()),
+            )
@@ -1,10 +1,11 @@
+import asyncio
 import datetime
 import hashlib
 import json
 import ssl
 import sys
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Tuple
 
 import questionary
 import typer
@@ -14,6 +15,7 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.x509.oid import NameOID
 from loguru import logger
+from pynergy_protocol import instrument
 
 from . import config
 from .device import (
@@ -59,6 +61,35 @@ def init_logger(cfg: config.Config):
 
     logger.bind(name=cfg.logger_name)
 
+    # Hot paths skip trace/debug statements that no sink would record
+    instrument.set_log_level(
+        min(logger.level(cfg.log_level_stdout).no, logger.level(cfg.log_level_file).no)
+    )
+
+
+def get_loop_factory(
+    event_loop: config.EventLoop,
+) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    Resolve the event loop implementation to pass to ``asyncio.run(loop_factory=...)``.
+
+    Falls back to the default asyncio loop when uvloop is requested but not installed.
+
+    Args:
+        event_loop: 'asyncio' or 'uvloop'
+
+    Returns:
+        A loop factory, or None for the default asyncio loop
+    """
+    if event_loop == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning('uvloop is not installed, using the default asyncio event loop')
+            return None
+        return uvloop.new_event_loop
+    return None
+
 
 def init_backend(
     cfg: config.Config,
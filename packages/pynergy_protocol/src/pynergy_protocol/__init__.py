@@ -1,4 +1,6 @@
-from .core import MsgBase, Registry
+from . import instrument
+from .clipboard import ClipboardAssembler, ClipboardData, ClipboardMark
+from .core import MsgBase, MsgView, Registry
 from .messages import (
     CClipboardMsg,
     CCloseMsg,
@@ -36,6 +38,8 @@ from .messages import (
 from .parser import PynergyParser
 from .protocol_types import ModifierKeyMask, MsgID
 from .struct_types import (
+    Array,
+    DelimitedList,
     Double,
     DoubleComplex,
     FixedString,
@@ -47,6 +51,7 @@ from .struct_types import (
     Int32,
     Int64,
     LInt32,
+    NulList,
     SizeT,
     SSizeT,
     SString,
@@ -56,11 +61,13 @@ from .struct_types import (
     UInt32,
     UInt64,
     ULInt32,
+    VarBytes,
     VarString,
     XPad,
 )
 
-_core_exports = [Registry, MsgBase, PynergyParser, MsgID, ModifierKeyMask]
+_core_exports = [Registry, MsgBase, MsgView, PynergyParser, MsgID, ModifierKeyMask]
+_clipboard_exports = [ClipboardAssembler, ClipboardData, ClipboardMark]
 
 # 自动收集所有消息类（继承自 MsgBase）
 _message_classes = [
@@ -99,6 +106,8 @@ _message_classes = [
 ]
 
 _struct_types = [
+    Array,
+    DelimitedList,
     Double,
     DoubleComplex,
     FixedString,
@@ -110,6 +119,7 @@ _struct_types = [
     Int32,
     Int64,
     LInt32,
+    NulList,
     SizeT,
     SSizeT,
     SString,
@@ -119,6 +129,7 @@ _struct_types = [
     UInt32,
     UInt64,
     ULInt32,
+    VarBytes,
     VarString,
     XPad,
 ]
@@ -127,9 +138,15 @@ __all__ = [
     # Core
     'Registry',
     'MsgBase',
+    'MsgView',
     'PynergyParser',
     'MsgID',
     'ModifierKeyMask',
+    'instrument',
+    # Clipboard
+    'ClipboardAssembler',
+    'ClipboardData',
+    'ClipboardMark',
     # Message
     'HelloMsg',
     'HelloBackMsg',
@@ -164,6 +181,8 @@ __all__ = [
     'EIncompatibleMsg',
     'EBusyMsg',
     # Structs
+    'Array',
+    'DelimitedList',
     'Double',
     'DoubleComplex',
     'FixedString',
@@ -175,6 +194,7 @@ __all__ = [
     'Int32',
     'Int64',
     'LInt32',
+    'NulList',
     'SizeT',
     'SSizeT',
     'SString',
@@ -184,6 +204,7 @@ __all__ = [
     'UInt32',
     'UInt64',
     'ULInt32',
+    'VarBytes',
     'VarString',
     'XPad',
 ]
@@ -0,0 +1,186 @@
+"""
+Incremental reassembly of streamed clipboard transfers (DCLP, protocol v1.6+).
+
+The server splits large clipboard contents into chunks flagged by the mark byte:
+the first chunk carries the total size as a decimal string, middle chunks carry
+the data and the final chunk closes the transfer. Chunks are appended to a
+``SpooledTemporaryFile``, which keeps small transfers in memory and rolls over to a
+temporary file past ``spool_size``, so a large image or log never sits in memory
+as a whole while it is being received.
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+from loguru import logger
+
+from . import instrument
+from .messages import DClipboardMsg
+
+
+class ClipboardMark(IntEnum):
+    """Mark byte of a DCLP chunk"""
+
+    SINGLE = 0
+    FIRST = 1
+    MIDDLE = 2
+    FINAL = 3
+
+
+@dataclass(slots=True)
+class ClipboardData:
+    """
+    A completely received clipboard.
+
+    The content stays in the spooled file until it is read, ``read`` and ``text``
+    materialize it, ``stream`` gives file-like access without loading it at once.
+    """
+
+    identifier: int
+    sequence: int
+    size: int
+    stream: IO[bytes]
+
+    def read(self) -> bytes:
+        self.stream.seek(0)
+        return self.stream.read()
+
+    def text(self) -> str:
+        return self.read().decode('utf-8')
+
+    def close(self):
+        self.stream.close()
+
+
+@dataclass(slots=True)
+class _Transfer:
+    identifier: int
+    sequence: int
+    expected: int | None
+    stream: SpooledTemporaryFile = field(repr=False)
+    size: int = 0
+
+
+class ClipboardAssembler:
+    """
+    Reassemble chunked DCLP messages, keyed by clipboard identifier and sequence.
+
+    Each clipboard identifier has at most one transfer in progress: a new first chunk
+    abandons the previous one. Transfers larger than ``max_size`` are dropped.
+    """
+
+    DEFAULT_SPOOL_SIZE = 1024 * 1024
+    DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+    def __init__(self, spool_size: int = DEFAULT_SPOOL_SIZE, max_size: int = DEFAULT_MAX_SIZE):
+        self.spool_size = spool_size
+        self.max_size = max_size
+        self._transfers: dict[tuple[int, int], _Transfer] = {}
+
+    def __len__(self) -> int:
+        """Number of transfers in progress"""
+        return len(self._transfers)
+
+    def feed(self, msg: DClipboardMsg) -> ClipboardData | None:
+        """
+        Consume one DCLP message.
+
+        :return: The complete clipboard once its final chunk arrived, otherwise None
+        """
+        key = (msg.identifier, msg.sequence)
+        mark = msg.flag
+
+        if mark == ClipboardMark.SINGLE:
+            transfer = self._start(key, None)
+            self._append(transfer, msg.data)
+            return self._finish(key)
+
+        if mark == ClipboardMark.FIRST:
+            expected = bytes(msg.data).strip()
+            if not expected.isdigit():
+                logger.opt(lazy=True).warning(
+                    '{log}',
+                    log=lambda: (
+                        f'Invalid clipboard size {expected[:32]!r}, dropping transfer {key}'
+                    ),
+                )
+                return None
+            if int(expected) > self.max_size:
+                logger.opt(lazy=True).warning(
+                    '{log}',
+                    log=lambda: (
+                        f'Clipboard of {int(expected)} bytes exceeds {self.max_size}, dropping'
+                    ),
+                )
+                return None
+            self._start(key, int(expected))
+            return None
+
+        transfer = self._transfers.get(key)
+        if transfer is None:
+            logger.opt(lazy=True).warning(
+                '{log}', log=lambda: f'Clipboard chunk without a started transfer: {key}'
+            )
+            return None
+
+        if mark == ClipboardMark.MIDDLE:
+            self._append(transfer, msg.data)
+            return None
+
+        if mark == ClipboardMark.FINAL:
+            self._append(transfer, msg.data)
+            return self._finish(key)
+
+        logger.opt(lazy=True).warning('{log}', log=lambda: f'Unknown clipboard mark: {mark}')
+        return None
+
+    def discard(self, identifier: int | None = None):
+        """Abandon the transfers of one clipboard, or all of them"""
+        for key in [k for k in self._transfers if identifier is None or k[0] == identifier]:
+            self._transfers.pop(key).stream.close()
+
+    def _start(self, key: tuple[int, int], expected: int | None) -> _Transfer:
+        self.discard(key[0])
+        transfer = _Transfer(
+            *key, expected, SpooledTemporaryFile(max_size=self.spool_size, mode='w+b')
+        )
+        self._transfers[key] = transfer
+        return transfer
+
+    def _append(self, transfer: _Transfer, data: bytes | memoryview):
+        if not data:
+            return
+        transfer.size += len(data)
+        if transfer.size > self.max_size:
+            logger.opt(lazy=True).warning(
+                '{log}',
+                log=lambda: (
+                    f'Clipboard transfer {(transfer.identifier, transfer.sequence)} '
+                    f'exceeds {self.max_size} bytes, dropping'
+                ),
+            )
+            self.discard(transfer.identifier)
+            return
+        transfer.stream.write(data)
+
+    def _finish(self, key: tuple[int, int]) -> ClipboardData | None:
+        transfer = self._transfers.pop(key, None)
+        if transfer is None:
+            # Dropped while appending
+            return None
+        if transfer.expected is not None and transfer.expected != transfer.size:
+            logger.opt(lazy=True).warning(
+                '{log}',
+                log=lambda: (
+                    f'Clipboard transfer {key} announced {transfer.expected} bytes, '
+                    f'received {transfer.size}'
+                ),
+            )
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug(
+                '{log}', log=lambda: f'Clipboard {key} complete: {transfer.size} bytes'
+            )
+        transfer.stream.seek(0)
+        return ClipboardData(transfer.identifier, transfer.sequence, transfer.size, transfer.stream)
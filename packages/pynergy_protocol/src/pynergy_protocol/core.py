@@ -1,8 +1,14 @@
 import struct
-from dataclasses import dataclass, fields
-from types import NoneType
+import sys
+from array import array
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType, NoneType
 from typing import (
     Annotated,
+    Any,
     ClassVar,
     Literal,
     Self,
@@ -15,12 +21,295 @@ from typing import (
 
 from loguru import logger
 
+from . import instrument
 from .protocol_types import MsgID
 
-OpCode: TypeAlias = Literal['FIX_VAL', 'FIX_STR', 'VAR_STR']
+OpCode: TypeAlias = Literal['FIX_VAL', 'FIX_STR', 'VAR_STR', 'VAR_BYTES', 'ARRAY', 'VAR_LIST']
 InstructionType: TypeAlias = list[tuple[OpCode, int, str]]
+Decoder: TypeAlias = Callable[[bytes | memoryview], tuple[list[Any], int]]
+Encoder: TypeAlias = Callable[[tuple[Any, ...]], bytes]
 T = TypeVar('T', bound='MsgBase')
 
+_Segment: TypeAlias = tuple[struct.Struct, tuple[int, ...], int]
+# Decodes one variable-length field at an offset, returning (value, new offset)
+_FieldDecoder: TypeAlias = Callable[[bytes | memoryview, int], tuple[Any, int]]
+# Appends the encoded parts of one variable-length field to a list
+_FieldEncoder: TypeAlias = Callable[[Any, list], None]
+_VAR_OPS: dict[str, OpCode] = {'Is': 'VAR_STR', 'Iy': 'VAR_BYTES'}
+
+_LENGTH = struct.Struct('>I')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _opcode(struct_char: str) -> tuple[OpCode, int]:
+    """Returns the opcode of a field format and the size of its fixed part"""
+    if struct_char in _VAR_OPS:
+        return _VAR_OPS[struct_char], 4  # Size of the length prefix only
+    if '*' in struct_char:
+        # Count-prefixed array, e.g. "I*I": 4-byte count followed by 4-byte items
+        count_fmt, _item_fmt = struct_char.split('*', 1)
+        return 'ARRAY', struct.calcsize(f'>{count_fmt}')
+    if struct_char.startswith('I/'):
+        # Length-prefixed list of delimited strings, e.g. "I/\x00"
+        return 'VAR_LIST', 4
+    if 's' in struct_char:
+        return 'FIX_STR', struct.calcsize(struct_char)
+    return 'FIX_VAL', struct.calcsize(struct_char)
+
+
+def _array_typecode(item_fmt: str) -> str | None:
+    """Find the array.array typecode with the same size and kind as a struct format"""
+    size = struct.calcsize(f'>{item_fmt}')
+    if item_fmt in ('f', 'd'):
+        candidates = 'fd'
+    elif item_fmt in ('B', 'H', 'I', 'L', 'Q'):
+        candidates = 'BHILQ'
+    elif item_fmt in ('b', 'h', 'i', 'l', 'q'):
+        candidates = 'bhilq'
+    else:
+        # Bool, char, half float...: decoded with struct.iter_unpack instead
+        return None
+    for typecode in candidates:
+        if array(typecode).itemsize == size:
+            return typecode
+    return None
+
+
+def _compile_var_field(op: OpCode, fmt: str) -> tuple[_FieldDecoder, _FieldEncoder]:
+    """Compile the (decode, encode) pair of one variable-length field"""
+    length_unpack_from = _LENGTH.unpack_from
+    length_pack = _LENGTH.pack
+
+    if op == 'VAR_STR':
+
+        def decode_str(data, offset):
+            (length,) = length_unpack_from(data, offset)
+            offset += 4
+            end = offset + length
+            if end > len(data):
+                raise ValueError('Variable length string data is incomplete')
+            return str(data[offset:end], 'utf-8'), end
+
+        def encode_str(value, parts):
+            s_bytes = value.encode('utf-8')
+            parts.append(length_pack(len(s_bytes)))
+            parts.append(s_bytes)
+
+        return decode_str, encode_str
+
+    if op == 'VAR_BYTES':
+
+        def decode_bytes(data, offset):
+            (length,) = length_unpack_from(data, offset)
+            offset += 4
+            end = offset + length
+            if end > len(data):
+                raise ValueError('Variable length bytes data is incomplete')
+            if type(data) is not memoryview:
+                data = memoryview(data)
+            return data[offset:end], end
+
+        def encode_bytes(value, parts):
+            if type(value) is not bytes:
+                value = memoryview(value).cast('B')
+            parts.append(length_pack(len(value)))
+            parts.append(value)
+
+        return decode_bytes, encode_bytes
+
+    if op == 'VAR_LIST':
+        delimiter = fmt[2:]
+        encoded_delimiter = delimiter.encode('utf-8')
+
+        def decode_list(data, offset):
+            (length,) = length_unpack_from(data, offset)
+            offset += 4
+            end = offset + length
+            if end > len(data):
+                raise ValueError('Delimited list data is incomplete')
+            # Every item is terminated by the delimiter, split the whole list at once
+            items = str(data[offset:end], 'utf-8').split(delimiter)
+            if items[-1] == '':
+                items.pop()
+            return items, end
+
+        def encode_list(value, parts):
+            raw = b''.join(item.encode('utf-8') + encoded_delimiter for item in value)
+            parts.append(length_pack(len(raw)))
+            parts.append(raw)
+
+        return decode_list, encode_list
+
+    if op == 'ARRAY':
+        count_fmt, item_fmt = fmt.split('*', 1)
+        count_codec = struct.Struct(f'>{count_fmt}')
+        count_size = count_codec.size
+        item_codec = struct.Struct(f'>{item_fmt}')
+        item_size = item_codec.size
+        typecode = _array_typecode(item_fmt)
+
+        def decode_array(data, offset):
+            (count,) = count_codec.unpack_from(data, offset)
+            offset += count_size
+            end = offset + count * item_size
+            if end > len(data):
+                raise ValueError('Array data is incomplete')
+            if typecode is None:
+                return [v for (v,) in item_codec.iter_unpack(data[offset:end])], end
+            items = array(typecode)
+            items.frombytes(data[offset:end])
+            if not _BIG_ENDIAN:
+                items.byteswap()
+            return items.tolist(), end
+
+        def encode_array(value, parts):
+            parts.append(count_codec.pack(len(value)))
+            if typecode is None:
+                parts.append(b''.join(item_codec.pack(v) for v in value))
+                return
+            items = array(typecode, value)
+            if not _BIG_ENDIAN:
+                items.byteswap()
+            parts.append(items.tobytes())
+
+        return decode_array, encode_array
+
+    raise ValueError(f'Unknown variable-length opcode: {op}')
+
+
+def _compile_codec(instructions: InstructionType) -> tuple[Decoder, Encoder]:
+    """
+    Compile an instruction list into a (decode, encode) pair.
+
+    Consecutive fixed-width instructions are merged into a single precompiled
+    ``struct.Struct``, so an all-fixed message is decoded/encoded with one C-level call.
+    Variable-length instructions (``VAR_STR``, ``VAR_BYTES``, ``ARRAY``, ``VAR_LIST``)
+    split the message into segments, each decoded in bulk by its own compiled function.
+    The decoder returns ``(values, consumed_bytes)``, the encoder returns the packed body.
+    """
+    # Each segment is either (Struct, positions of FIX_STR values, field count)
+    # or the (decode, encode) pair of a variable-length field
+    segments: list[_Segment | tuple[_FieldDecoder, _FieldEncoder]] = []
+    fmt_parts: list[str] = []
+    str_pos: list[int] = []
+    fixed_only = True
+
+    def flush():
+        if fmt_parts:
+            codec = struct.Struct('>' + ''.join(fmt_parts))
+            segments.append((codec, tuple(str_pos), len(fmt_parts)))
+            fmt_parts.clear()
+            str_pos.clear()
+
+    for op, _size, fmt in instructions:
+        if op in ('FIX_VAL', 'FIX_STR'):
+            if op == 'FIX_STR':
+                str_pos.append(len(fmt_parts))
+            fmt_parts.append(fmt)
+        else:
+            flush()
+            segments.append(_compile_var_field(op, fmt))
+            fixed_only = False
+    flush()
+
+    if not segments:
+        return (lambda data: ([], 0)), (lambda values: b'')
+
+    if fixed_only:
+        codec, str_pos, _count = segments[0]
+        return _compile_fixed(codec, str_pos)
+
+    return _compile_segments(segments)
+
+
+def _compile_fixed(codec: struct.Struct, str_pos: tuple[int, ...]) -> tuple[Decoder, Encoder]:
+    """Codec for messages made only of fixed-width fields"""
+    size = codec.size
+    unpack_from = codec.unpack_from
+    pack = codec.pack
+
+    if not str_pos:
+
+        def decode(data):
+            return unpack_from(data), size
+
+        def encode(values):
+            return pack(*values)
+
+        return decode, encode
+
+    def decode_str(data):
+        values = list(unpack_from(data))
+        for i in str_pos:
+            values[i] = values[i].decode().rstrip('\x00')
+        return values, size
+
+    def encode_str(values):
+        values = list(values)
+        for i in str_pos:
+            values[i] = values[i].encode('utf-8')
+        return pack(*values)
+
+    return decode_str, encode_str
+
+
+def _compile_segments(
+    segments: list[_Segment | tuple[_FieldDecoder, _FieldEncoder]],
+) -> tuple[Decoder, Encoder]:
+    """
+    Codec for messages containing variable-length fields.
+
+    ``VAR_BYTES`` values are decoded as ``memoryview`` slices of the input, without copying.
+    """
+    # Tag each segment once, so the loops below do not inspect types per message
+    compiled = [(len(segment) == 3, segment) for segment in segments]
+
+    def decode(data):
+        values: list[Any] = []
+        offset = 0
+        for fixed, segment in compiled:
+            if fixed:
+                codec, str_pos, _count = segment
+                decoded = codec.unpack_from(data, offset)
+                if str_pos:
+                    decoded = list(decoded)
+                    for i in str_pos:
+                        decoded[i] = decoded[i].decode().rstrip('\x00')
+                values.extend(decoded)
+                offset += codec.size
+            else:
+                value, offset = segment[0](data, offset)
+                values.append(value)
+        return values, offset
+
+    def encode(values):
+        parts: list[bytes] = []
+        index = 0
+        for fixed, segment in compiled:
+            if fixed:
+                codec, str_pos, count = segment
+                chunk = list(values[index : index + count])
+                for i in str_pos:
+                    chunk[i] = chunk[i].encode('utf-8')
+                parts.append(codec.pack(*chunk))
+                index += count
+            else:
+                segment[1](values[index], parts)
+                index += 1
+        return b''.join(parts)
+
+    return decode, encode
+
+
+def _field_getter(names: tuple[str, ...]) -> Callable[[Any], tuple[Any, ...]]:
+    """Build a getter returning the field values of a message as a tuple"""
+    if not names:
+        return lambda obj: ()
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda obj: (getter(obj),)
+    return attrgetter(*names)
+
 
 @dataclass(slots=True)
 class MsgBase[T]:
@@ -28,6 +317,22 @@ class MsgBase[T]:
 
     _INSTRUCTIONS: ClassVar[InstructionType | NoneType] = None
     _FORMAT: ClassVar[str] = ''
+    _FIELD_NAMES: ClassVar[tuple[str, ...]] = ()
+    _DECODE: ClassVar[Decoder]
+    _ENCODE: ClassVar[Encoder]
+    _GET_FIELDS: ClassVar[Callable[[Any], tuple[Any, ...]]]
+    _CODE_BYTES: ClassVar[bytes] = b''
+    # Whether decoded instances hold memoryview slices of the unpacked data (VAR_BYTES)
+    _HAS_BYTES: ClassVar[bool] = False
+    # Whether the parser may hand out a lazy MsgView instead of an instance
+    _LAZY: ClassVar[bool] = False
+    # Size of the LRU of encoded wire bytes keyed by field values, 0 disables it
+    _WIRE_CACHE_SIZE: ClassVar[int] = 0
+    _WIRE: ClassVar[bytes | None] = None
+    _WIRE_CACHE: ClassVar[Callable[[tuple[Any, ...]], bytes] | None] = None
+    # Writes length prefix + code + fields straight into a buffer (fixed-width messages only)
+    _WIRE_INTO: ClassVar[Callable[[Any, int, tuple[Any, ...]], None] | None] = None
+    _WIRE_SIZE: ClassVar[int] = 0
     CODE: ClassVar[str] = ''
 
     def __init_subclass__(cls: T, **kwargs):
@@ -39,6 +344,7 @@ class MsgBase[T]:
 
         fmt_parts: list[str] = ['>']
         instructions: InstructionType = []
+        field_names: list[str] = []
         for field_name, hint in hints.items():
             if field_name.startswith('_') or field_name == 'CODE':
                 continue
@@ -48,19 +354,11 @@ class MsgBase[T]:
                 struct_char = metadata[1]
 
                 # Determine the type of operation
-                op: OpCode
-                if struct_char == 'Is':
-                    op = 'VAR_STR'
-                    size = 4  # Size of the length prefix only
-                elif 's' in struct_char:
-                    op = 'FIX_STR'
-                    size = struct.calcsize(struct_char)
-                else:
-                    op = 'FIX_VAL'
-                    size = struct.calcsize(struct_char)
+                op, size = _opcode(struct_char)
 
                 fmt_parts.append(struct_char)
                 instructions.append((op, size, struct_char))
+                field_names.append(field_name)
 
             else:
                 raise TypeError(
@@ -68,33 +366,84 @@ class MsgBase[T]:
                     f'Got {type(hint)} instead.'
                 )
 
+        # --- compile codec ---
+        # The closures only depend on the instructions, never on `cls` itself,
+        # so they stay valid for the class rebuilt by dataclass(slots=True).
+        decode, encode = _compile_codec(instructions)
+
         setattr(cls, '_FORMAT', ''.join(fmt_parts))
         setattr(cls, '_INSTRUCTIONS', instructions)
+        setattr(cls, '_FIELD_NAMES', tuple(field_names))
+        setattr(cls, '_DECODE', staticmethod(decode))
+        setattr(cls, '_ENCODE', staticmethod(encode))
+        setattr(cls, '_GET_FIELDS', staticmethod(_field_getter(tuple(field_names))))
+        setattr(cls, '_HAS_BYTES', any(op == 'VAR_BYTES' for op, _size, _fmt in instructions))
         setattr(cls, '_format_initialized', True)
 
     @classmethod
-    def unpack(cls, data: bytes) -> Self:
+    def unpack(cls, data: bytes | memoryview) -> Self:
         try:
-            logger.opt(lazy=True).trace(
-                '{log}', log=lambda: f'Unpacking {cls.__name__}: data length={len(data)} bytes'
-            )
+            if instrument.TRACE_ENABLED:
+                logger.opt(lazy=True).trace(
+                    '{log}', log=lambda: f'Unpacking {cls.__name__}: data length={len(data)} bytes'
+                )
             data = cls.before_unpack(data)
-            offset = 0
-            args = []
 
             if cls._INSTRUCTIONS is None:
                 raise ValueError(f'Instruction set not initialized: {cls.__name__}')
 
-            for i, (op, size, fmt) in enumerate(cls._INSTRUCTIONS):
-                if offset >= len(data):
-                    raise ValueError(f'Insufficient data: Out of range at directive {i} ({op}).')
+            try:
+                args, offset = cls._DECODE(data)
+            except (struct.error, UnicodeDecodeError, ValueError):
+                # Replay the instruction set to report exactly which directive failed
+                args, offset = cls._unpack_instructions(data)
+
+            if offset < len(data):
+                logger.opt(lazy=True).warning(
+                    '{log}',
+                    log=lambda: (
+                        f'{len(data) - offset} bytes of unprocessed data remaining after unpacking'
+                    ),
+                )
+
+            result = cls(*args)  # type: ignore[call-arg]
+            result = cls.after_unpack(result)
+            if instrument.TRACE_ENABLED:
+                logger.opt(lazy=True).trace(
+                    '{log}', log=lambda: f'Successful unpacking {cls.__name__}: {result}'
+                )
+            return result
+
+        except Exception as e:
+            err_str = str(e)
+            logger.opt(lazy=True).error(
+                '{log}',
+                log=lambda: f'Unpacking {cls.__name__} failed: {err_str}',
+            )
+            raise
 
-                try:
-                    if op == 'FIX_VAL':
-                        # Unpack the value directly
-                        val = struct.unpack_from(f'>{fmt}', data, offset)[0]
-                        args.append(val)
-                        offset += size
+    @classmethod
+    def _unpack_instructions(cls, data: bytes | memoryview) -> tuple[list[Any], int]:
+        """
+        Interpret _INSTRUCTIONS one directive at a time.
+
+        This is the reference decoder: it is slower than the compiled codec,
+        but raises a precise error for the directive that failed.
+        """
+        offset = 0
+        args = []
+
+        for i, (op, size, fmt) in enumerate(cls._INSTRUCTIONS or ()):
+            if offset >= len(data):
+                raise ValueError(f'Insufficient data: Out of range at directive {i} ({op}).')
+
+            try:
+                if op == 'FIX_VAL':
+                    # Unpack the value directly
+                    val = struct.unpack_from(f'>{fmt}', data, offset)[0]
+                    args.append(val)
+                    offset += size
+                    if instrument.TRACE_ENABLED:
                         logger.opt(lazy=True).trace(
                             '{log}',
                             log=lambda: (
@@ -102,12 +451,13 @@ class MsgBase[T]:
                             ),
                         )
 
-                    elif op == 'FIX_STR':
-                        # Unwrap fixed-length strings and strip
-                        raw_val = struct.unpack_from(f'>{fmt}', data, offset)[0]
-                        val = raw_val.decode().rstrip('\x00')
-                        args.append(val)
-                        offset += size
+                elif op == 'FIX_STR':
+                    # Unwrap fixed-length strings and strip
+                    raw_val = struct.unpack_from(f'>{fmt}', data, offset)[0]
+                    val = raw_val.decode().rstrip('\x00')
+                    args.append(val)
+                    offset += size
+                    if instrument.TRACE_ENABLED:
                         logger.opt(lazy=True).trace(
                             '{log}',
                             log=lambda: (
@@ -115,23 +465,24 @@ class MsgBase[T]:
                             ),
                         )
 
-                    elif op == 'VAR_STR':
-                        # Unpack a lengthened string: Read 4 bytes of length first
-                        if offset + 4 > len(data):
-                            raise ValueError('The length of the variable string is incomplete')
+                elif op == 'VAR_STR':
+                    # Unpack a lengthened string: Read 4 bytes of length first
+                    if offset + 4 > len(data):
+                        raise ValueError('The length of the variable string is incomplete')
 
-                        length = struct.unpack_from('>I', data, offset)[0]
-                        offset += size
+                    length = struct.unpack_from('>I', data, offset)[0]
+                    offset += size
 
-                        if offset + length > len(data):
-                            raise ValueError(
-                                f'Variable length string data is incomplete: '
-                                f'declared length={length}, available data={len(data) - offset}'
-                            )
+                    if offset + length > len(data):
+                        raise ValueError(
+                            f'Variable length string data is incomplete: '
+                            f'declared length={length}, available data={len(data) - offset}'
+                        )
 
-                        val = data[offset : offset + length].decode()
-                        args.append(val)
-                        offset += length
+                    val = str(data[offset : offset + length], 'utf-8')
+                    args.append(val)
+                    offset += length
+                    if instrument.DEBUG_ENABLED:
                         logger.opt(lazy=True).debug(
                             '{log}',
                             log=lambda: (
@@ -140,156 +491,391 @@ class MsgBase[T]:
                             ),
                         )
 
-                except UnicodeDecodeError as e:
-                    raise ValueError(f'UTF-8 decoding fails in directive {i} ({op}): {e}') from e
-                except struct.error as e:
-                    raise ValueError(
-                        f'Struct unpacking fails in directive {i} ({op}), format={fmt}: {e}'
-                    ) from e
+                elif op == 'VAR_BYTES':
+                    # Same layout as VAR_STR, the payload is kept as a view of the data
+                    if offset + 4 > len(data):
+                        raise ValueError('The length of the variable bytes is incomplete')
 
-            if offset < len(data):
-                logger.opt(lazy=True).warning(
-                    '{log}',
-                    log=lambda: (
-                        f'{len(data) - offset} bytes of unprocessed data remaining after unpacking'
-                    ),
-                )
+                    length = struct.unpack_from('>I', data, offset)[0]
+                    offset += size
 
-            result = cls(*args)  # type: ignore[call-arg]
-            result = cls.after_unpack(result)
-            logger.opt(lazy=True).trace(
-                '{log}', log=lambda: f'Successful unpacking {cls.__name__}: {result}'
-            )
-            return result
+                    if offset + length > len(data):
+                        raise ValueError(
+                            f'Variable length bytes data is incomplete: '
+                            f'declared length={length}, available data={len(data) - offset}'
+                        )
 
-        except Exception:
-            logger.opt(lazy=True).error(
-                '{log}',
-                log=lambda: f'Unpacking {cls.__name__} failed: {e}',
-            )
-            raise
+                    args.append(memoryview(data)[offset : offset + length])
+                    offset += length
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}',
+                            log=lambda: (
+                                f'Unpack variable bytes: length={length}, new offset={offset}'
+                            ),
+                        )
+
+                elif op == 'ARRAY':
+                    # Unpack a count-prefixed array one item at a time
+                    count_fmt, item_fmt = fmt.split('*', 1)
+                    count = struct.unpack_from(f'>{count_fmt}', data, offset)[0]
+                    offset += size
+                    item_size = struct.calcsize(f'>{item_fmt}')
+
+                    if offset + count * item_size > len(data):
+                        raise ValueError(
+                            f'Array data is incomplete: declared count={count}, '
+                            f'available data={len(data) - offset}'
+                        )
+
+                    items = []
+                    for _ in range(count):
+                        items.append(struct.unpack_from(f'>{item_fmt}', data, offset)[0])
+                        offset += item_size
+                    args.append(items)
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}',
+                            log=lambda: f'Unpack array: count={count}, new offset={offset}',
+                        )
+
+                elif op == 'VAR_LIST':
+                    # Unpack a length-prefixed list of delimiter-terminated strings
+                    if offset + 4 > len(data):
+                        raise ValueError('The length of the delimited list is incomplete')
+
+                    length = struct.unpack_from('>I', data, offset)[0]
+                    offset += size
+
+                    if offset + length > len(data):
+                        raise ValueError(
+                            f'Delimited list data is incomplete: '
+                            f'declared length={length}, available data={len(data) - offset}'
+                        )
+
+                    items = str(data[offset : offset + length], 'utf-8').split(fmt[2:])
+                    if items[-1] == '':
+                        items.pop()
+                    args.append(items)
+                    offset += length
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}',
+                            log=lambda: (
+                                f'Unpack delimited list: {len(items)} items, new offset={offset}'
+                            ),
+                        )
+
+            except UnicodeDecodeError as e:
+                raise ValueError(f'UTF-8 decoding fails in directive {i} ({op}): {e}') from e
+            except struct.error as e:
+                raise ValueError(
+                    f'Struct unpacking fails in directive {i} ({op}), format={fmt}: {e}'
+                ) from e
+
+        return args, offset
 
     def pack(self) -> bytes:
         """
         Dynamically Pack based on the order of fields defined by the class and _INSTRUCTIONS
         """
         try:
-            logger.opt(lazy=True).trace('{log}', log=lambda: f'Start packing {self}')
+            if instrument.TRACE_ENABLED:
+                logger.opt(lazy=True).trace('{log}', log=lambda: f'Start packing {self}')
             self.before_pack()
-            result = bytearray()
-
-            code_bytes = struct.pack(f'>{len(self.CODE)}s', self.CODE.encode('utf-8'))
-            result.extend(code_bytes)
-            logger.opt(lazy=True).trace(
-                '{log}', log=lambda: f'Pack message code: {self.CODE}, length={len(code_bytes)}'
-            )
-
-            # Get the values of all fields defined by the dataclass (in order of definition)
-            data_fields = [
-                f for f in fields(self) if not f.name.startswith('_') and f.name != 'CODE'
-            ]
 
             if self._INSTRUCTIONS is None:
                 raise ValueError('Instruction list undefined')
 
-            if len(data_fields) != len(self._INSTRUCTIONS):
-                raise ValueError(
-                    f'The number of fields ({len(data_fields)}) does not match '
-                    f'the number of instructions ({len(self._INSTRUCTIONS)}).'
+            try:
+                body = self._ENCODE(self._GET_FIELDS(self))
+            except Exception:
+                # Replay the instruction set to report exactly which field failed
+                body = self._pack_instructions()
+
+            final_result = self.after_pack(self._CODE_BYTES + body)
+            if instrument.TRACE_ENABLED:
+                logger.opt(lazy=True).trace(
+                    '{log}',
+                    log=lambda: (
+                        f'Successfully packed {self.__class__.__name__}: '
+                        f'total length={len(final_result)} bytes'
+                    ),
                 )
+            return final_result
+
+        except Exception as e:
+            err_str = str(e)
+            logger.opt(lazy=True).error(
+                '{log}',
+                log=lambda: f'Pack {self.__class__.__name__} failed: {err_str}',
+            )
+            raise
 
-            # Process the instructions and field values one by one
-            for i, ((op, size, fmt), field_def) in enumerate(zip(self._INSTRUCTIONS, data_fields)):
-                try:
-                    val = getattr(self, field_def.name)
+    def _pack_instructions(self) -> bytes:
+        """
+        Interpret _INSTRUCTIONS one field at a time and return the packed body.
+
+        This is the reference encoder used to produce precise errors
+        when the compiled codec rejects a value.
+        """
+        result = bytearray()
+        instructions = self._INSTRUCTIONS or []
+
+        if len(self._FIELD_NAMES) != len(instructions):
+            raise ValueError(
+                f'The number of fields ({len(self._FIELD_NAMES)}) does not match '
+                f'the number of instructions ({len(instructions)}).'
+            )
+
+        # Process the instructions and field values one by one
+        for i, ((op, size, fmt), field_name) in enumerate(zip(instructions, self._FIELD_NAMES)):
+            try:
+                val = getattr(self, field_name)
+                if instrument.TRACE_ENABLED:
                     logger.opt(lazy=True).trace(
                         '{log}',
                         log=lambda: (
-                            f'Process field {field_def.name}: value={val}, operation={op}, format={fmt}'
+                            f'Process field {field_name}: value={val}, operation={op}, format={fmt}'
                         ),
                     )
 
-                    if op == 'FIX_VAL':
-                        # Processing values (I, H, B, etc.)
-                        packed_val = struct.pack(f'>{fmt}', val)
-                        result.extend(packed_val)
+                if op == 'FIX_VAL':
+                    # Processing values (I, H, B, etc.)
+                    packed_val = struct.pack(f'>{fmt}', val)
+                    result.extend(packed_val)
+                    if instrument.TRACE_ENABLED:
                         logger.opt(lazy=True).trace(
                             '{log}', log=lambda: f'Packing fixed value: {val} -> {packed_val.hex()}'
                         )
 
-                    elif op == 'FIX_STR':
-                        # Handle fixed-length strings, ensuring they are encoded as
-                        # bytes and pfilled/truncated
-                        try:
-                            s_bytes = val.encode('utf-8')
-                            # struct.pack automatically handles truncation and
-                            # completion \x00 based on FMT (e.g. "7s").
-                            packed_str = struct.pack(f'>{fmt}', s_bytes)
-                            result.extend(packed_str)
+                elif op == 'FIX_STR':
+                    # Handle fixed-length strings, ensuring they are encoded as
+                    # bytes and pfilled/truncated
+                    try:
+                        s_bytes = val.encode('utf-8')
+                        # struct.pack automatically handles truncation and
+                        # completion \x00 based on FMT (e.g. "7s").
+                        packed_str = struct.pack(f'>{fmt}', s_bytes)
+                        result.extend(packed_str)
+                        if instrument.TRACE_ENABLED:
                             logger.opt(lazy=True).trace(
                                 '{log}',
                                 log=lambda: f"打包固定字符串: '{val}' -> {packed_str.hex()}",
                             )
-                        except UnicodeEncodeError as e:
-                            raise ValueError(f'编码字符串字段 {field_def.name} 失败: {e}') from e
-
-                    elif op == 'VAR_STR':
-                        # Handling Variable Strings (Synergy Style: Length + Data)
-                        try:
-                            s_bytes = val.encode('utf-8')
-                            length = len(s_bytes)
-                            # Punch in 4 bytes before punching in the actual content
-                            length_bytes = struct.pack('>I', length)
-                            result.extend(length_bytes)
-                            result.extend(s_bytes)
-                            logger.trace(
+                    except UnicodeEncodeError as e:
+                        raise ValueError(f'编码字符串字段 {field_name} 失败: {e}') from e
+
+                elif op == 'VAR_STR':
+                    # Handling Variable Strings (Synergy Style: Length + Data)
+                    try:
+                        s_bytes = val.encode('utf-8')
+                        length = len(s_bytes)
+                        # Punch in 4 bytes before punching in the actual content
+                        length_bytes = struct.pack('>I', length)
+                        result.extend(length_bytes)
+                        result.extend(s_bytes)
+                        if instrument.TRACE_ENABLED:
+                            logger.opt(lazy=True).trace(
                                 '{log}',
                                 log=lambda: (
                                     f'Packing Long String: {val} '
                                     f'(length={length}) -> {length_bytes.hex()}{s_bytes.hex()}'
                                 ),
                             )
-                        except UnicodeEncodeError as e:
-                            raise ValueError(
-                                f'Encoding a variable string field {field_def.name} fails: {e}'
-                            ) from e
-
-                except struct.error as e:
-                    raise ValueError(
-                        f'Packing field {field_def.name} (directive {i}) '
-                        f'failed with format={fmt}: {e}'
-                    ) from e
-                except Exception:
-                    logger.opt(lazy=True).error(
-                        '{log}',
-                        log=lambda: f'Error with packaging field {field_def.name}: {e}',
-                    )
-                    raise
+                    except UnicodeEncodeError as e:
+                        raise ValueError(
+                            f'Encoding a variable string field {field_name} fails: {e}'
+                        ) from e
 
-            final_result = bytes(result)
-            final_result = self.after_pack(final_result)
-            logger.opt(lazy=True).trace(
-                '{log}',
-                log=lambda: (
-                    f'Successfully packed {self.__class__.__name__}: '
-                    f'total length={len(final_result)} bytes'
-                ),
-            )
-            return final_result
+                elif op == 'VAR_BYTES':
+                    # Same layout as VAR_STR, the value must already be bytes-like
+                    try:
+                        raw = memoryview(val)
+                    except TypeError as e:
+                        raise ValueError(
+                            f'Variable bytes field {field_name} expects a bytes-like object, '
+                            f'got {type(val).__name__}'
+                        ) from e
+                    result.extend(struct.pack('>I', raw.nbytes))
+                    result.extend(raw)
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}', log=lambda: f'Packing variable bytes: length={raw.nbytes}'
+                        )
 
-        except Exception:
-            logger.opt(lazy=True).error(
-                '{log}',
-                log=lambda: f'Pack {self.__class__.__name__} failed: {e}',
-            )
-            raise
+                elif op == 'ARRAY':
+                    # Count prefix followed by every item
+                    count_fmt, item_fmt = fmt.split('*', 1)
+                    result.extend(struct.pack(f'>{count_fmt}', len(val)))
+                    for item in val:
+                        result.extend(struct.pack(f'>{item_fmt}', item))
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}', log=lambda: f'Packing array: count={len(val)}'
+                        )
+
+                elif op == 'VAR_LIST':
+                    # Length prefix followed by every item terminated by the delimiter
+                    delimiter = fmt[2:]
+                    try:
+                        raw = ''.join(item + delimiter for item in val).encode('utf-8')
+                    except (TypeError, UnicodeEncodeError) as e:
+                        raise ValueError(
+                            f'Encoding a delimited list field {field_name} fails: {e}'
+                        ) from e
+                    result.extend(struct.pack('>I', len(raw)))
+                    result.extend(raw)
+                    if instrument.TRACE_ENABLED:
+                        logger.opt(lazy=True).trace(
+                            '{log}', log=lambda: f'Packing delimited list: {len(val)} items'
+                        )
+
+            except struct.error as e:
+                raise ValueError(
+                    f'Packing field {field_name} (directive {i}) failed with format={fmt}: {e}'
+                ) from e
+            except Exception as e:
+                err_str = str(e)
+                logger.opt(lazy=True).error(
+                    '{log}',
+                    log=lambda: f'Error with packaging field {field_name}: {err_str}',
+                )
+                raise
+
+        return bytes(result)
 
     def pack_for_socket(self) -> bytes:
         """
         Append a 4-byte length prefix (Big-endian) before the message body
         """
+        wire = self._WIRE
+        if wire is not None:
+            return wire
+
+        wire_cache = self._WIRE_CACHE
+        if wire_cache is not None:
+            try:
+                return wire_cache(self._GET_FIELDS(self))
+            except Exception:
+                # Unhashable or invalid values, the generic path packs or reports them
+                pass
+
         payload = self.pack()
-        return struct.pack('>I', len(payload)) + payload
+        return _LENGTH.pack(len(payload)) + payload
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Write the length-prefixed message into buffer at offset, without intermediate copies.
+
+        The buffer must already have enough room after offset.
+        :return: Number of bytes written
+        """
+        wire_into = self._WIRE_INTO
+        if wire_into is not None:
+            size = self._WIRE_SIZE
+            wire = None
+        else:
+            wire = self.pack_for_socket()
+            size = len(wire)
+
+        if offset < 0 or offset + size > len(buffer):
+            raise ValueError(
+                f'Buffer too small to pack {self.__class__.__name__}: '
+                f'need {size} bytes at offset {offset}, buffer length={len(buffer)}'
+            )
+
+        if wire is None:
+            try:
+                wire_into(buffer, offset, self._GET_FIELDS(self))
+            except struct.error:
+                # Let the generic path report which field is invalid
+                wire = self.pack_for_socket()
+        if wire is not None:
+            buffer[offset : offset + size] = wire
+        return size
+
+    @staticmethod
+    def pack_many(msgs: Iterable['MsgBase']) -> bytearray:
+        """
+        Pack several messages (length prefixes included) into one new buffer,
+        allocated once and ready for a single socket write.
+        """
+        plan: list[tuple[MsgBase, bytes | None]] = []
+        total = 0
+        for msg in msgs:
+            # Lazy MsgView instances have no precomputed encoding, they pack themselves
+            if getattr(msg, '_WIRE_INTO', None) is not None:
+                plan.append((msg, None))
+                total += msg._WIRE_SIZE
+            else:
+                wire = msg.pack_for_socket()
+                plan.append((msg, wire))
+                total += len(wire)
+
+        buffer = bytearray(total)
+        offset = 0
+        for msg, wire in plan:
+            if wire is None:
+                offset += msg.pack_into(buffer, offset)
+            else:
+                buffer[offset : offset + len(wire)] = wire
+                offset += len(wire)
+        return buffer
+
+    @classmethod
+    def _compile_wire(cls):
+        """
+        Precompute outbound encodings once CODE is known (called on registration).
+
+        Messages without fields get constant wire bytes, messages setting
+        _WIRE_CACHE_SIZE get a bounded LRU keyed by their field values.
+        Classes customizing before_pack/after_pack always use the generic path.
+        """
+        cls._WIRE = None
+        cls._WIRE_CACHE = None
+        cls._WIRE_INTO = None
+        cls._WIRE_SIZE = 0
+        if cls.before_pack is not MsgBase.before_pack or cls.after_pack is not MsgBase.after_pack:
+            return
+
+        code_bytes = cls._CODE_BYTES
+        encode = cls._ENCODE
+
+        def encode_wire(values: tuple[Any, ...]) -> bytes:
+            body = code_bytes + encode(values)
+            return _LENGTH.pack(len(body)) + body
+
+        if all(op == 'FIX_VAL' for op, _size, _fmt in cls._INSTRUCTIONS or ()):
+            # One struct covers length prefix, code and every field
+            codec = struct.Struct(f'>I{len(code_bytes)}s' + cls._FORMAT[1:])
+            body_size = codec.size - 4
+            codec_pack_into = codec.pack_into
+
+            def wire_into(buffer, offset: int, values: tuple[Any, ...]):
+                codec_pack_into(buffer, offset, body_size, code_bytes, *values)
+
+            cls._WIRE_INTO = staticmethod(wire_into)
+            cls._WIRE_SIZE = codec.size
+
+        if not cls._INSTRUCTIONS:
+            cls._WIRE = encode_wire(())
+        elif cls._WIRE_CACHE_SIZE > 0:
+            cls._WIRE_CACHE = staticmethod(lru_cache(maxsize=cls._WIRE_CACHE_SIZE)(encode_wire))
+
+    @classmethod
+    def view_type(cls) -> type['MsgView']:
+        """
+        Returns the lazy view class of this message, built on first use.
+
+        Only messages made of fixed-width values with the default before_unpack
+        can be viewed, since their fields sit at constant offsets of the packet.
+        """
+        view_type = cls.__dict__.get('_VIEW_TYPE')
+        if view_type is None:
+            view_type = _build_view_type(cls)
+            setattr(cls, '_VIEW_TYPE', view_type)
+        return view_type
 
     @staticmethod
     def before_unpack(data: bytes) -> bytes:
@@ -311,8 +897,100 @@ class MsgBase[T]:
         return result
 
 
+class MsgView:
+    """
+    Lazy flyweight over an undecoded packet.
+
+    Exposes the same attributes as its message class, but only keeps the packet
+    and an offset until a field is first read, then decodes all fields with one call.
+    Dropped messages therefore cost neither a decode nor a dataclass instance.
+    """
+
+    __slots__ = ('_data', '_offset', '_values')
+
+    MSG_TYPE: ClassVar[type[MsgBase]]
+    CODE: ClassVar[str] = ''
+    SIZE: ClassVar[int] = 0  # Size of the message body after its code
+    _UNPACK_FROM: ClassVar[Callable[[bytes, int], tuple[Any, ...]]]
+
+    def __init__(self, data: bytes, offset: int = 0):
+        """
+        :param data: Buffer holding the packet (without length prefix)
+        :param offset: Offset of the message code in data
+        """
+        self._data = data
+        self._offset = offset
+        self._values: tuple[Any, ...] | None = None
+
+    def _fields(self) -> tuple[Any, ...]:
+        values = self._values
+        if values is None:
+            # Skip the 4-byte message code, like MsgBase.before_unpack
+            values = self._values = self._UNPACK_FROM(self._data, self._offset + 4)
+        return values
+
+    def materialize(self) -> MsgBase:
+        """Build the regular message instance"""
+        return self.MSG_TYPE(*self._fields())
+
+    def pack(self) -> bytes:
+        return self.materialize().pack()
+
+    def pack_for_socket(self) -> bytes:
+        return self.materialize().pack_for_socket()
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        return self.materialize().pack_into(buffer, offset)
+
+    def __eq__(self, other):
+        if isinstance(other, MsgView):
+            other = other.materialize()
+        return self.materialize() == other
+
+    def __hash__(self):
+        return hash((self.MSG_TYPE, self._fields()))
+
+    def __repr__(self):
+        values = zip(self.MSG_TYPE._FIELD_NAMES, self._fields())
+        return f'{type(self).__name__}({", ".join(f"{name}={val!r}" for name, val in values)})'
+
+
+def _build_view_type(msg_cls: type[MsgBase]) -> type[MsgView]:
+    """Generate a MsgView subclass with one property per field of msg_cls"""
+    instructions = msg_cls._INSTRUCTIONS or []
+    if any(op != 'FIX_VAL' for op, _size, _fmt in instructions):
+        raise TypeError(f'{msg_cls.__name__} has non fixed-width values and cannot be viewed')
+    if msg_cls.before_unpack is not MsgBase.before_unpack:
+        raise TypeError(f'{msg_cls.__name__} overrides before_unpack and cannot be viewed')
+
+    codec = struct.Struct(msg_cls._FORMAT)
+    namespace: dict[str, Any] = {
+        '__slots__': (),
+        'MSG_TYPE': msg_cls,
+        'CODE': msg_cls.CODE,
+        'SIZE': codec.size,
+        '_UNPACK_FROM': staticmethod(codec.unpack_from),
+    }
+    for index, name in enumerate(msg_cls._FIELD_NAMES):
+        namespace[name] = property(lambda self, i=index: self._fields()[i])
+    return type(f'{msg_cls.__name__}View', (MsgView,), namespace)
+
+
+def code_to_int(msg_code: str) -> int:
+    """Convert a 4-character message code to the integer read by ``struct.unpack('>I')``"""
+    return int.from_bytes(msg_code.encode('utf-8'), 'big')
+
+
 class Registry:
     _MAPPING: dict[MsgID, type['MsgBase']] = {}
+    # Raw 4-byte code (as read by '>I') -> message class, rebuilt on every registration
+    _CODE_TABLE: MappingProxyType[int, type['MsgBase']] = MappingProxyType({})
+    # Skipped unregistered codes. The codes come from the peer, so only the first
+    # MAX_UNKNOWN_CODES distinct ones are counted apart, the rest share one bucket
+    MAX_UNKNOWN_CODES = 256
+    _UNKNOWN_CODES: dict[int, int] = {}
+    _UNKNOWN_OTHER = 0
+    _UNKNOWN_TOTAL = 0
 
     @classmethod
     def register(cls, msg_code: MsgID):
@@ -332,9 +1010,18 @@ class Registry:
 
             cls._MAPPING[msg_code] = subclass
             subclass.CODE = msg_code
-            logger.opt(lazy=True).trace(
-                '{log}', log=lambda: f'Registration message type: {msg_code} -> {subclass.__name__}'
-            )
+            subclass._CODE_BYTES = msg_code.encode('utf-8')
+            if len(subclass._CODE_BYTES) == 4:
+                cls._CODE_TABLE = MappingProxyType({
+                    **cls._CODE_TABLE,
+                    code_to_int(msg_code): subclass,
+                })
+            subclass._compile_wire()
+            if instrument.TRACE_ENABLED:
+                logger.opt(lazy=True).trace(
+                    '{log}',
+                    log=lambda: f'Registration message type: {msg_code} -> {subclass.__name__}',
+                )
             return subclass
 
         return wrapper
@@ -346,11 +1033,52 @@ class Registry:
             raise KeyError(f'Unregistered message type: {msg_code}')
 
         result = cls._MAPPING[msg_code]
-        logger.opt(lazy=True).trace(
-            '{log}', log=lambda: f'Get message class: {msg_code} -> {result.__name__}'
-        )
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace(
+                '{log}', log=lambda: f'Get message class: {msg_code} -> {result.__name__}'
+            )
         return result
 
+    @classmethod
+    def lookup(cls, raw_code: int) -> type[MsgBase] | None:
+        """
+        Find a message class by its raw 4-byte code without decoding it.
+
+        Unknown codes return None and are counted instead of raising.
+        """
+        result = cls._CODE_TABLE.get(raw_code)
+        if result is None:
+            cls._UNKNOWN_TOTAL += 1
+            unknown = cls._UNKNOWN_CODES
+            if raw_code in unknown:
+                unknown[raw_code] += 1
+            elif len(unknown) < cls.MAX_UNKNOWN_CODES:
+                unknown[raw_code] = 1
+            else:
+                cls._UNKNOWN_OTHER += 1
+        return result
+
+    @classmethod
+    def code_table(cls) -> MappingProxyType[int, type[MsgBase]]:
+        """Returns the read-only raw code -> message class table"""
+        return cls._CODE_TABLE
+
+    @classmethod
+    def unknown_codes(cls) -> dict[bytes, int]:
+        """
+        Returns how many times each unregistered code has been skipped. Codes beyond
+        MAX_UNKNOWN_CODES distinct ones are counted together under b'other'.
+        """
+        result = {code.to_bytes(4, 'big'): count for code, count in cls._UNKNOWN_CODES.items()}
+        if cls._UNKNOWN_OTHER:
+            result[b'other'] = cls._UNKNOWN_OTHER
+        return result
+
+    @classmethod
+    def unknown_total(cls) -> int:
+        """Returns how many packets with an unregistered code have been skipped"""
+        return cls._UNKNOWN_TOTAL
+
     @classmethod
     def get_registered_types(cls) -> list[MsgID]:
         """Returns all registered message types"""
@@ -0,0 +1,26 @@
+"""
+Global instrumentation level.
+
+Even lazy loguru calls cost a closure and a function call each, which adds up on
+paths executed for every packet. Hot paths check these flags first, so trace/debug
+statements cost a single attribute read once the minimum sink level is higher.
+Both flags default to True, which keeps every log statement active until an
+application calls set_log_level.
+"""
+
+from loguru import logger
+
+TRACE_ENABLED: bool = True
+DEBUG_ENABLED: bool = True
+
+
+def set_log_level(level: str | int) -> None:
+    """
+    Resolve the flags from the lowest level any sink accepts.
+
+    :param level: Loguru level name (e.g. "INFO") or severity number
+    """
+    global TRACE_ENABLED, DEBUG_ENABLED
+    no = logger.level(level).no if isinstance(level, str) else level
+    TRACE_ENABLED = no <= logger.level('TRACE').no
+    DEBUG_ENABLED = no <= logger.level('DEBUG').no
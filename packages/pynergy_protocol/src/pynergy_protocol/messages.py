@@ -1,14 +1,18 @@
 from dataclasses import dataclass
+from typing import ClassVar
 
 from .core import MsgBase, Registry
 from .protocol_types import MsgID
 from .struct_types import (
+    Array,
     Bool,
     FixedString,
     Int16,
+    NulList,
     UInt8,
     UInt16,
     UInt32,
+    VarBytes,
     VarString,
 )
 
@@ -232,6 +236,8 @@ class DKeyDownMsg(MsgBase):
         This is the raw, platform-dependent scan code of the key pressed.
     """
 
+    _LAZY: ClassVar[bool] = True
+
     key_id: UInt16
     mod_key_mask: UInt16
     key_button: UInt16
@@ -314,6 +320,8 @@ class DKeyUpMsg(MsgBase):
         This is the raw, platform-dependent scan code of the key pressed.
     """
 
+    _LAZY: ClassVar[bool] = True
+
     key_id: UInt16
     mod_key_mask: UInt16
     key_button: UInt16
@@ -334,6 +342,8 @@ class DMouseDownMsg(MsgBase):
             button: ButtonID (1 byte) - Mouse button identifier
     """
 
+    _LAZY: ClassVar[bool] = True
+
     button: UInt8
 
 
@@ -350,6 +360,8 @@ class DMouseMoveMsg(MsgBase):
         y: Y coordinate (2 bytes, signed) - Absolute screen position
     """
 
+    _LAZY: ClassVar[bool] = True
+
     x: Int16
     y: Int16
 
@@ -369,6 +381,8 @@ class DMouseRelMoveMsg(MsgBase):
         dy: Y delta (2 bytes, signed) - Vertical movement
     """
 
+    _LAZY: ClassVar[bool] = True
+
     dx: Int16
     dy: Int16
 
@@ -384,6 +398,8 @@ class DMouseUpMsg(MsgBase):
         button: ButtonID (1 byte) - Mouse button identifier
     """
 
+    _LAZY: ClassVar[bool] = True
+
     button: UInt8
 
 
@@ -406,6 +422,8 @@ class DMouseWheelMsg(MsgBase):
         y_delta: Y delta (2 bytes, signed) - Vertical scroll
     """
 
+    _LAZY: ClassVar[bool] = True
+
     x_delta: Int16
     y_delta: Int16
 
@@ -433,7 +451,7 @@ class DClipboardMsg(MsgBase):
         identifier: Clipboard identifier (1 byte)
         sequence: Sequence number (4 bytes)
         flag: Mark/flags (1 byte) - For streaming support (v1.6+)
-        data: Clipboard data (string)
+        data: Clipboard data (bytes) - Kept as a view of the packet, decode it only when needed
 
     Examples:
         Primary clipboard, sequence 1, no flags, text "Hello World"
@@ -443,7 +461,7 @@ class DClipboardMsg(MsgBase):
     identifier: UInt8
     sequence: UInt32
     flag: UInt8
-    data: VarString
+    data: VarBytes
 
 
 @Registry.register(MsgID.DINF)
@@ -475,6 +493,8 @@ class DInfoMsg(MsgBase):
         "DINF\x00\x00\x00\x00\x07\x80\x04\x38\x00\x00\x01\x90\x01\x2c"
     """
 
+    _WIRE_CACHE_SIZE: ClassVar[int] = 16
+
     left_edge_coord: Int16
     top_edge_coord: Int16
     screen_width: UInt16
@@ -494,18 +514,18 @@ class DSetOptionsMsg(MsgBase):
     its behavior.
 
     Attributes:
-        options: Option/value pairs (4-byte integer list)
+        options: Option/value pairs (4-byte integer list) - Prefixed by the number of integers
 
     Examples:
         2 pairs: option 1 = value 1, option 2 = value 0
-        "DSOP\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x00"
+        "DSOP\x00\x00\x00\x04\x00\x00\x00\x01\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x00"
     """
 
-    paris: UInt32
+    options: Array[UInt32]
 
-    # TODO: Implement unpack method
-    # @classmethod
-    # def unpack(cls, data: bytes): ...
+    def pairs(self) -> dict[int, int]:
+        """Returns the options as an option ID -> value mapping"""
+        return dict(zip(self.options[::2], self.options[1::2]))
 
 
 @Registry.register(MsgID.DDRG)
@@ -523,18 +543,15 @@ class DDragInfoMsg(MsgBase):
 
     Attributes:
         file_counts: Number of files (2 bytes)
-        file_paths: File paths (string) - Null-separated file paths
+        file_paths: File paths (string list) - Null-terminated paths behind a 4-byte length
 
     Examples:
         Dragging 2 files
-        "DDRG\x00\x02/path/to/file1.txt\x00/path/to/file2.txt\x00"
+        "DDRG\x00\x02\x00\x00\x00\x26/path/to/file1.txt\x00/path/to/file2.txt\x00"
     """
 
     file_counts: UInt16
-
-    # TODO: Implement unpack method
-    # @classmethod
-    # def unpack(cls, data: bytes): ...
+    file_paths: NulList
 
 
 @Registry.register(MsgID.DFTR)
@@ -555,23 +572,20 @@ class DFileTransferMsg(MsgBase):
 
     Attributes:
         mark: Transfer mark (1 byte) - Transfer state
-        data: Data (string) - Content depends on mark
+        data: Data (bytes) - Content depends on mark, kept as a view of the packet
 
     Examples:
         Send 4096 bytes
-        "DFTR\x01\x00\x00\x00\x00\x00\x00\x10\x00"
-        "DFTR\x02[1024 bytes of file data]"
-        "DFTR\x02[1024 bytes of file data]"
-        "DFTR\x02[1024 bytes of file data]"
-        "DFTR\x02[1024 bytes of file data]"
-        "DFTR\x03"
+        "DFTR\x01\x00\x00\x00\x08\x00\x00\x00\x00\x00\x00\x10\x00"
+        "DFTR\x02\x00\x00\x04\x00[1024 bytes of file data]"
+        "DFTR\x02\x00\x00\x04\x00[1024 bytes of file data]"
+        "DFTR\x02\x00\x00\x04\x00[1024 bytes of file data]"
+        "DFTR\x02\x00\x00\x04\x00[1024 bytes of file data]"
+        "DFTR\x03\x00\x00\x00\x00"
     """
 
     mark: UInt8
-
-    # TODO: Implement unpack method
-    # @classmethod
-    # def unpack(cls, data: bytes): ...
+    data: VarBytes
 
 
 @Registry.register(MsgID.LSYN)
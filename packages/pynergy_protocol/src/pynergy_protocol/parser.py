@@ -1,22 +1,219 @@
+import re
 import struct
+from types import MappingProxyType
 from typing import Literal
 
 from loguru import logger
 
-from .core import MsgBase, Registry
+from . import instrument
+from .core import MsgBase, MsgView, Registry
 from .protocol_types import MsgID
 
+_LENGTH = struct.Struct('>I')
+
+# (code table, regex matching any of its codes), rebuilt when the registry changes
+_code_pattern: tuple[MappingProxyType, re.Pattern[bytes]] | None = None
+
+
+def _find_code_pattern() -> re.Pattern[bytes]:
+    """Regex matching any registered 4-byte code"""
+    global _code_pattern
+    table = Registry.code_table()
+    if _code_pattern is None or _code_pattern[0] is not table:
+        codes = sorted(code.to_bytes(4, 'big') for code in table)
+        _code_pattern = (table, re.compile(b'|'.join(re.escape(code) for code in codes)))
+    return _code_pattern[1]
+
 
 class PynergyParser[T: MsgBase]:
-    def __init__(self):
+    """
+    Incremental packet parser.
+
+    Received bytes are written into a single buffer at a write offset and consumed
+    through a read cursor, packets are handed to ``MsgBase.unpack`` as ``memoryview``
+    slices of that buffer. The bytes past the write offset are spare capacity kept
+    between reads, so receiving does not resize the buffer. The consumed prefix is only
+    discarded when it grows past ``COMPACT_THRESHOLD`` (or nothing is left unread), and
+    the buffer is reallocated once a large packet (e.g. DCLP) no longer needs the space,
+    so a single burst does not pin its memory for the whole session.
+
+    Messages with ``VAR_BYTES`` fields keep views of their packet. Packets below
+    ``DETACH_THRESHOLD`` are copied out of the buffer for them, larger ones (clipboard,
+    file chunks) take the buffer over: only the unread tail is copied into a new buffer,
+    so the payload itself is never copied.
+
+    With ``lazy=True`` messages flagged ``_LAZY`` (mouse moves, keys, buttons...)
+    are returned as ``MsgView`` flyweights that only decode when a field is read.
+
+    A length prefix that cannot be valid (shorter than a code, or over ``MAX_PACKET_SIZE``)
+    means the stream lost its alignment. Instead of dropping the whole buffer, the parser
+    resynchronizes: it scans forward for the next ``[length][registered code]`` header,
+    drops only the bytes before it and counts the event in ``resync_count``.
+    """
+
+    MAX_PACKET_SIZE = 10 * 1024 * 1024  # Assume max packet size is 10MB
+    COMPACT_THRESHOLD = 64 * 1024
+    SHRINK_THRESHOLD = 1024 * 1024
+    DETACH_THRESHOLD = 64 * 1024
+
+    def __init__(self, lazy: bool = False):
         self._buffer = bytearray()
+        self._read_pos = 0
+        self._end = 0  # End of the received data, the rest of the buffer is spare capacity
+        self._high_water = 0
+
+        # Resynchronization state and statistics
+        self._resyncing = False
+        self.resync_count = 0
+        self.resync_dropped = 0
+
+        # Free space handed out by get_buffer, until buffer_updated commits it
+        self._recv_view: memoryview | None = None
+        # Bytes copied by the parser itself: fed data, compaction, growth, detaching
+        self.bytes_copied = 0
+
+        self.lazy = lazy
+        # Raw code -> view class for the messages that may be decoded lazily
+        self._view_types: dict[int, type[MsgView]] = (
+            {code: cls.view_type() for code, cls in Registry.code_table().items() if cls._LAZY}
+            if lazy
+            else {}
+        )
+
+    def __len__(self) -> int:
+        """Number of buffered bytes not yet consumed"""
+        return self._end - self._read_pos
 
     def feed(self, data: bytes):
         """Store received raw bytes"""
         if not data:
             return
-        logger.opt(lazy=True).trace('{log}', log=lambda: f'Fed {len(data)} bytes into buffer')
-        self._buffer.extend(data)
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Fed {len(data)} bytes into buffer')
+        size = len(data)
+        start = self._reserve(size)
+        self._buffer[start : start + size] = data
+        self._end = start + size
+        self.bytes_copied += size
+
+    def get_buffer(self, size: int) -> memoryview:
+        """
+        Hand out size bytes of free space after the buffered data to receive into.
+
+        Together with buffer_updated this lets a transport (``asyncio.BufferedProtocol``)
+        receive straight into the parser buffer, instead of handing over a bytes
+        object that feed would copy. The space comes from the spare capacity, the
+        buffer only grows when it has less than size bytes left.
+        """
+        self.release_buffer()
+        start = self._reserve(size)
+        self._recv_view = memoryview(self._buffer)[start : start + size]
+        return self._recv_view
+
+    def buffer_updated(self, nbytes: int):
+        """Commit the first nbytes of the space handed out by get_buffer"""
+        assert self._recv_view is not None, 'buffer_updated without get_buffer'
+        self._recv_view.release()
+        self._recv_view = None
+        self._end += nbytes
+        if instrument.TRACE_ENABLED:
+            logger.opt(lazy=True).trace('{log}', log=lambda: f'Received {nbytes} bytes into buffer')
+
+    def release_buffer(self):
+        """Give back space handed out by get_buffer that was never written (EOF, failed read)"""
+        if self._recv_view is not None:
+            self._recv_view.release()
+            self._recv_view = None
+
+    def _reserve(self, size: int) -> int:
+        """Make room for size bytes after the buffered data, returns where it starts"""
+        self._compact()
+        end = self._end
+        missing = end + size - len(self._buffer)
+        if missing > 0:
+            try:
+                self._buffer.extend(bytes(missing))
+            except BufferError:
+                # A view of the buffer is still alive somewhere, detach from it
+                self._buffer = self._buffer[:end]
+                self._buffer.extend(bytes(size))
+                self.bytes_copied += end
+            self.bytes_copied += missing
+            if len(self._buffer) > self._high_water:
+                self._high_water = len(self._buffer)
+        return end
+
+    def _compact(self):
+        """Drop the consumed prefix and release memory held for oversized packets"""
+        pos = self._read_pos
+        end = self._end
+        unread = end - pos
+
+        if self._high_water > self.SHRINK_THRESHOLD and unread < self.SHRINK_THRESHOLD:
+            # Reallocate so the capacity grown for a large packet is returned
+            if instrument.DEBUG_ENABLED:
+                logger.opt(lazy=True).debug(
+                    '{log}', log=lambda: f'Shrinking parser buffer from {self._high_water} bytes'
+                )
+            self._buffer = self._buffer[pos:end]
+            self._read_pos = 0
+            self._end = unread
+            self._high_water = unread
+            self.bytes_copied += unread
+            return
+
+        if pos == 0 or (pos < self.COMPACT_THRESHOLD and unread):
+            return
+
+        # Move the unread tail to the front, the capacity stays for the next reads
+        if unread:
+            self._buffer[:unread] = self._buffer[pos:end]
+            self.bytes_copied += unread
+        self._read_pos = 0
+        self._end = unread
+
+    def _resync(self, pos: int, skip: int) -> int | None:
+        """
+        Private helper method: Find the next plausible packet boundary at or after pos + skip.
+
+        Bytes before the boundary are dropped. When none is buffered yet, everything but
+        a possible partial header is dropped and the search resumes on the next feed.
+        :return: Position of the boundary or None
+        """
+        buffer = self._buffer
+        end = self._end
+        max_size = self.MAX_PACKET_SIZE
+        search = _find_code_pattern().search
+        unpack_length = _LENGTH.unpack_from
+
+        start = pos + skip + 4
+        while (match := search(buffer, start, end)) is not None:
+            boundary = match.start() - 4
+            if 4 <= unpack_length(buffer, boundary)[0] <= max_size:
+                self.resync_dropped += boundary - pos
+                self._read_pos = boundary
+                self._resyncing = False
+                logger.opt(lazy=True).warning(
+                    '{log}',
+                    log=lambda: f'Resynchronized stream after dropping {boundary - pos} bytes',
+                )
+                return boundary
+            start = match.start() + 1
+
+        # Keep the last bytes, they may be the beginning of the next header
+        keep_from = max(pos, end - 7)
+        self.resync_dropped += keep_from - pos
+        self._read_pos = keep_from
+        self._resyncing = True
+        return None
+
+    def _bad_length(self, pos: int, length: int) -> int | None:
+        """Private helper method: Start resynchronizing after an impossible length prefix"""
+        self.resync_count += 1
+        logger.opt(lazy=True).error(
+            '{log}', log=lambda: f'Invalid packet length: {length}, resynchronizing stream'
+        )
+        return self._resync(pos, 1)
 
     def _parse_packet(self, get_class_func):
         """
@@ -24,85 +221,212 @@ class PynergyParser[T: MsgBase]:
         :param get_class_func: Function to get message class (for distinguishing next_msg and next_handshake_msg)
         :return: Parsed message object or None
         """
-        total_packet_size = 0
+        buffer = self._buffer
+        pos = self._read_pos
+        if self._resyncing and (pos := self._resync(pos, 0)) is None:
+            return None
+        available = self._end - pos
 
         # Basic length check (first 4 bytes are packet length)
-        if len(self._buffer) < 4:
+        if available < 4:
             return None
 
-        try:
-            # 1. Read length prefix
-            length = struct.unpack_from('>I', self._buffer)[0]
+        # 1. Read length prefix
+        length = _LENGTH.unpack_from(buffer, pos)[0]
 
-            # Protocol security check: Prevent malicious oversized packets from causing OOM
-            if length > 10 * 1024 * 1024:  # Assume max packet size is 10MB
-                logger.opt(lazy=True).error(
-                    '{log}', log=lambda: f'Invalid packet length: {length}, clearing buffer'
-                )
-                self._buffer.clear()
+        # Protocol security check: Prevent malicious oversized packets from causing OOM,
+        # an impossible length means the stream is misaligned
+        if not 4 <= length <= self.MAX_PACKET_SIZE:
+            if (pos := self._bad_length(pos, length)) is None:
+                return None
+            available = self._end - pos
+            if available < 4:
                 return None
+            length = _LENGTH.unpack_from(buffer, pos)[0]
 
-            # Check if buffer has enough data
-            total_packet_size = 4 + length
-            if len(self._buffer) < total_packet_size:
+        # Check if buffer has enough data
+        total_packet_size = 4 + length
+        if available < total_packet_size:
+            if instrument.TRACE_ENABLED:
                 logger.opt(lazy=True).trace(
                     '{log}',
-                    log=lambda: f'Wait for more data: {len(self._buffer)}/{total_packet_size}',
+                    log=lambda: f'Wait for more data: {available}/{total_packet_size}',
                 )
+            return None
+
+        # Core principle: Regardless of parsing success, consume this data as long as
+        # length is sufficient
+        self._read_pos = pos + total_packet_size
+
+        # 2. Extract packet (skip first 4 bytes of length) without copying
+        with memoryview(buffer) as view:
+            packet = view[pos + 4 : pos + total_packet_size]
+
+            # 3. Call passed function to get message class
+            cls = get_class_func(packet)
+            if cls is None:
+                self._skip_unknown(packet)
+                packet.release()
                 return None
 
-            # 2. Extract packet (skip first 4 bytes of length)
-            packet = self._buffer[4:total_packet_size]
+            if self.lazy and cls._LAZY and length - 4 >= cls.view_type().SIZE:
+                return cls.view_type()(bytes(packet))
 
-            try:
-                # 3. Call passed function to get message class
-                cls = get_class_func(packet)
-
-                if not cls:
-                    logger.opt(lazy=True).warning(
-                        '{log}',
-                        log=lambda: (
-                            f'Unknown message code: {packet[:4].decode()}, size: {length}. Skipping.'
-                        ),
-                    )
-                    return None
-
-                # 4. Perform deserialization
-                msg_obj = cls.unpack(packet)
+            if cls._HAS_BYTES:
+                if length < self.DETACH_THRESHOLD:
+                    packet = self._copy_packet(packet)
+                else:
+                    self._detach(self._read_pos)
+
+            return self._decode_packet(packet, cls)
+
+    def _detach(self, pos: int):
+        """Leave the current buffer to the views still using it, keep the data from pos on"""
+        if instrument.DEBUG_ENABLED:
+            logger.opt(lazy=True).debug(
+                '{log}', log=lambda: f'Detaching parser buffer of {len(self._buffer)} bytes'
+            )
+        self._buffer = self._buffer[pos : self._end]
+        self._read_pos = 0
+        self._end = len(self._buffer)
+        self._high_water = self._end
+        self.bytes_copied += self._end
+
+    @staticmethod
+    def _copy_packet(packet: memoryview) -> memoryview:
+        """Private helper method: Move a small packet out of the parser buffer"""
+        owned = memoryview(bytes(packet))
+        packet.release()
+        return owned
+
+    @staticmethod
+    def _skip_unknown(packet: memoryview):
+        """Private helper method: Report a packet whose code is not registered"""
+        logger.opt(lazy=True).warning(
+            '{log}',
+            log=lambda: (
+                f'Unknown message code: {bytes(packet[:4])!r}, size: {len(packet)}. Skipping.'
+            ),
+        )
+
+    @staticmethod
+    def _decode_packet(packet: memoryview, cls: type[MsgBase]):
+        """
+        Private helper method: Turn one complete packet (without length prefix) into a message.
+        :return: Parsed message object or None if it could not be decoded
+        """
+        try:
+            # 4. Perform deserialization
+            msg_obj = cls.unpack(packet)
+            if instrument.TRACE_ENABLED:
                 logger.opt(lazy=True).trace(
                     '{log}', log=lambda: f'Successfully parsed message: {msg_obj}'
                 )
-                return msg_obj
+            return msg_obj
 
-            except (struct.error, UnicodeDecodeError, ValueError):
-                logger.opt(lazy=True).error(
-                    '{log}',
-                    log=lambda: f'Failed to unpack message body (CODE: {packet[:4].decode()}): {e}',
-                )
-                return None
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            err_str = str(e)
+            logger.opt(lazy=True).error(
+                '{log}',
+                log=lambda: (
+                    f'Failed to unpack message body (CODE: {bytes(packet[:4])!r}): {err_str}'
+                ),
+            )
+            return None
 
-            except Exception:
-                logger.opt(lazy=True).exception(
-                    '{log}', log=lambda: f'Unexpected error during message construction: {e}'
-                )
-                return None
+        except Exception as e:
+            err_str = str(e)
+            logger.opt(lazy=True).exception(
+                '{log}', log=lambda: f'Unexpected error during message construction: {err_str}'
+            )
+            return None
 
         finally:
-            # Core principle: Regardless of parsing success, consume this data as long as length is sufficient
-            if len(self._buffer) >= total_packet_size:
-                del self._buffer[:total_packet_size]
+            packet.release()
+
+    def parse_all(self) -> list[T]:
+        """
+        Decode every complete packet currently buffered in a single pass.
+
+        Incomplete trailing data stays buffered for the next feed.
+        """
+        buffer = self._buffer
+        pos = self._read_pos
+        end = self._end
+        max_size = self.MAX_PACKET_SIZE
+        detach_size = self.DETACH_THRESHOLD
+        detach = False
+        unpack_length = _LENGTH.unpack_from
+        decode = self._decode_packet
+        lookup = Registry.lookup
+        view_types = self._view_types
+        msgs: list[T] = []
+
+        if self._resyncing and (pos := self._resync(pos, 0)) is None:
+            return msgs
+
+        with memoryview(buffer) as view:
+            while end - pos >= 4:
+                length = unpack_length(buffer, pos)[0]
+                if not 4 <= length <= max_size:
+                    if (pos := self._bad_length(pos, length)) is None:
+                        pos = self._read_pos
+                        break
+                    continue
+
+                packet_end = pos + 4 + length
+                if packet_end > end:
+                    break
+
+                # The code is looked up straight from the buffer, without slicing or decoding
+                code = unpack_length(buffer, pos + 4)[0]
+                view_type = view_types.get(code)
+                if view_type is not None and length - 4 >= view_type.SIZE:
+                    msgs.append(view_type(bytes(view[pos + 4 : packet_end])))
+                    pos = packet_end
+                    continue
+
+                cls = lookup(code)
+                if cls is None:
+                    self._skip_unknown(view[pos + 4 : packet_end])
+                else:
+                    packet = view[pos + 4 : packet_end]
+                    if cls._HAS_BYTES:
+                        if length < detach_size:
+                            packet = self._copy_packet(packet)
+                        else:
+                            detach = True
+                    msg = decode(packet, cls)
+                    if msg is not None:
+                        msgs.append(msg)
+                pos = packet_end
+
+        if detach:
+            self._detach(pos)
+        else:
+            self._read_pos = pos
+        return msgs
+
+    def feed_and_parse_all(self, data: bytes) -> list[T]:
+        """
+        Store received raw bytes and return every message completed by them.
+        """
+        self.feed(data)
+        return self.parse_all()
+
+    @staticmethod
+    def _get_msg_class(packet):
+        # Extract the raw msg_code from packet and find corresponding message class
+        if len(packet) < 4:
+            return None
+        return Registry.lookup(_LENGTH.unpack_from(packet)[0])
 
     def next_msg(self) -> T | None:
         """
         Try to parse and return a regular message object.
         """
 
-        def get_class(packet):
-            # Extract msg_code from packet and find corresponding message class
-            msg_code = struct.unpack_from('>4s', packet)[0]
-            return Registry.get_class(msg_code.decode())
-
-        return self._parse_packet(get_class)
+        return self._parse_packet(self._get_msg_class)
 
     def next_handshake_msg(self, msg_type: Literal[MsgID.Hello, MsgID.HelloBack]) -> T | None:
         """
@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, get_args
 
 XPad = Annotated[None, 'x']
 Char = Annotated[str, 'c']
@@ -23,8 +23,30 @@ DoubleComplex = Annotated[complex, 'D']
 SString = Annotated[str, 'p']
 String = Annotated[str, 's']
 VarString = Annotated[str, 'Is']
+# Length-prefixed raw payload, decoded as a zero-copy memoryview of the packet
+VarBytes = Annotated[bytes, 'Iy']
 
 
 class FixedString:
     def __class_getitem__(cls, length: int):
         return Annotated[str, f'{length}s']
+
+
+class Array:
+    """Count-prefixed array: Array[UInt32] has a 4-byte count, Array[UInt32, UInt16] a 2-byte one"""
+
+    def __class_getitem__(cls, params):
+        item, count = params if isinstance(params, tuple) else (params, UInt32)
+        return Annotated[list[get_args(item)[0]], f'{get_args(count)[1]}*{get_args(item)[1]}']
+
+
+class DelimitedList:
+    """Length-prefixed list of strings, each terminated by the delimiter (e.g. NUL)"""
+
+    def __class_getitem__(cls, delimiter: str):
+        return Annotated[list[str], f'I/{delimiter}']
+
+
+# NUL-terminated strings, as in DDRG. A named alias: pyflakes reads a string subscript
+# in an annotation as a forward reference
+NulList = DelimitedList['\x00']
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""性能基准测试脚本：运行微基准并与已提交的基线比较"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# 基准用例模块，导入时自动注册
+BENCH_MODULES = [
+    'benchmarks.bench_protocol',
+    'benchmarks.bench_keymaps',
+    'benchmarks.bench_file_transfer',
+    'benchmarks.bench_transport',
+    'benchmarks.bench_latency',
+    'benchmarks.bench_dispatch',
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Pynergy micro-benchmarks')
+    parser.add_argument('-k', '--filter', help='只运行名称包含该字符串的用例')
+    parser.add_argument(
+        '-o', '--output', type=Path, default=Path('bench_results.json'), help='结果 JSON 路径'
+    )
+    parser.add_argument('--baseline', type=Path, default=None, help='基线 JSON 路径')
+    parser.add_argument('--update-baseline', action='store_true', help='用本次结果覆盖基线')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25, help='允许的性能退化比例（默认 25%%）'
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='每个用例重复次数，取最好成绩')
+    parser.add_argument('--list', action='store_true', help='只列出用例')
+    return parser.parse_args()
+
+
+def main() -> int:
+    # 1. 路径自动定位
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+    from loguru import logger
+    from pynergy_protocol import instrument
+
+    from benchmarks.harness import (
+        BASELINE_PATH,
+        compare,
+        get_benchmarks,
+        load_results,
+        run_benchmark,
+        save_results,
+    )
+
+    args = parse_args()
+    for module in BENCH_MODULES:
+        importlib.import_module(module)
+
+    # 基准只衡量编解码本身，移除日志输出，并按生产环境默认的 INFO 级别关闭热路径日志
+    logger.remove()
+    instrument.set_log_level('INFO')
+
+    benches = get_benchmarks(args.filter)
+    if args.list:
+        for bench in benches:
+            print(bench.name)
+        return 0
+
+    # 2. 运行用例
+    baseline_path = args.baseline or BASELINE_PATH
+    baseline = load_results(baseline_path)
+    results = {}
+    for bench in benches:
+        result = run_benchmark(bench, repeat=args.repeat)
+        results[bench.name] = result
+        base = baseline.get(bench.name)
+        delta = f'{result["ns_per_op"] / base["ns_per_op"] - 1:+.1%}' if base else 'new'
+        print(f'{bench.name:<45} {result["ns_per_op"]:>12.1f} ns/op  {delta}')
+        for key, value in result.get('counters', {}).items():
+            print(f'    {key:<41} {value:>12.1f}')
+
+    save_results(args.output, results)
+    print(f'\n📊 结果已写入 {args.output}')
+
+    if args.update_baseline:
+        # 只更新本次运行的用例，保留其他用例的基线
+        save_results(baseline_path, {**baseline, **results})
+        print(f'📌 基线已更新: {baseline_path}')
+        return 0
+
+    # 3. 与基线比较
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f'\n❌ {len(regressions)} 个用例慢于基线 {args.tolerance:.0%} 以上:')
+        for name, base_ns, current_ns, ratio in regressions:
+            print(f'  {name}: {base_ns:.1f} -> {current_ns:.1f} ns/op (x{ratio:.2f})')
+        return 1
+
+    print('\n✨ ✅ 没有发现性能退化')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+from packages.pynergy_protocol.src.pynergy_protocol import (
+    ClipboardAssembler,
+    ClipboardMark,
+    DClipboardMsg,
+)
+
+
+def _chunks(identifier, sequence, text, size=4):
+    data = text.encode()
+    yield DClipboardMsg(identifier, sequence, ClipboardMark.FIRST, str(len(data)).encode())
+    for i in range(0, len(data), size):
+        yield DClipboardMsg(identifier, sequence, ClipboardMark.MIDDLE, data[i : i + size])
+    yield DClipboardMsg(identifier, sequence, ClipboardMark.FINAL, b'')
+
+
+def test_single_chunk():
+    """测试单块剪贴板数据直接完成"""
+    assembler = ClipboardAssembler()
+    clipboard = assembler.feed(DClipboardMsg(0, 0, ClipboardMark.SINGLE, b'Hello World'))
+
+    assert clipboard.text() == 'Hello World'
+    assert (clipboard.identifier, clipboard.size) == (0, 11)
+    assert len(assembler) == 0
+
+
+def test_chunks_are_reassembled_on_final():
+    """测试分块数据只在最后一块到达时才完成"""
+    assembler = ClipboardAssembler()
+    results = [assembler.feed(msg) for msg in _chunks(1, 7, 'héllo wörld, chunked')]
+
+    assert results[:-1] == [None] * (len(results) - 1)
+    assert results[-1].text() == 'héllo wörld, chunked'
+    assert results[-1].sequence == 7
+
+
+def test_large_transfer_spills_to_disk():
+    """测试超过阈值的数据写入临时文件而不是内存"""
+    assembler = ClipboardAssembler(spool_size=64)
+    text = 'x' * 1000
+    *_, clipboard = (assembler.feed(msg) for msg in _chunks(0, 0, text, size=100))
+
+    assert clipboard.stream._rolled
+    assert clipboard.read() == text.encode()
+    clipboard.close()
+
+
+def test_interleaved_clipboards():
+    """测试不同剪贴板的分块交错到达"""
+    assembler = ClipboardAssembler()
+    primary = list(_chunks(0, 1, 'primary'))
+    selection = list(_chunks(1, 2, 'selection'))
+    done = [
+        clipboard
+        for pair in zip(primary, selection, strict=False)
+        for msg in pair
+        if (clipboard := assembler.feed(msg)) is not None
+    ]
+    done += [assembler.feed(msg) for msg in selection[len(primary) :]]
+
+    assert {c.identifier: c.text() for c in done} == {0: 'primary', 1: 'selection'}
+
+
+def test_restart_and_orphan_chunks():
+    """测试新的首块会放弃旧传输，未开始的分块被忽略"""
+    assembler = ClipboardAssembler()
+    assert assembler.feed(DClipboardMsg(0, 0, ClipboardMark.MIDDLE, b'lost')) is None
+
+    assembler.feed(DClipboardMsg(0, 1, ClipboardMark.FIRST, b'3'))
+    assembler.feed(DClipboardMsg(0, 1, ClipboardMark.MIDDLE, b'old'))
+    assembler.feed(DClipboardMsg(0, 2, ClipboardMark.FIRST, b'3'))
+    assert len(assembler) == 1
+    assert assembler.feed(DClipboardMsg(0, 1, ClipboardMark.FINAL, b'')) is None
+
+    assembler.feed(DClipboardMsg(0, 2, ClipboardMark.MIDDLE, b'new'))
+    assert assembler.feed(DClipboardMsg(0, 2, ClipboardMark.FINAL, b'')).text() == 'new'
+
+
+def test_oversized_transfer_is_dropped():
+    """测试超过上限的传输被丢弃"""
+    assembler = ClipboardAssembler(max_size=8)
+    assert assembler.feed(DClipboardMsg(0, 0, ClipboardMark.FIRST, b'100')) is None
+    assert len(assembler) == 0
+
+    assembler.feed(DClipboardMsg(0, 0, ClipboardMark.FIRST, b'4'))
+    assembler.feed(DClipboardMsg(0, 0, ClipboardMark.MIDDLE, b'x' * 9))
+    assert len(assembler) == 0
+    assert assembler.feed(DClipboardMsg(0, 0, ClipboardMark.FINAL, b'')) is None
@@ -0,0 +1,215 @@
+import struct
+
+import pytest
+
+from packages.pynergy_protocol.src.pynergy_protocol import (
+    CInfoAckMsg,
+    CKeepAliveMsg,
+    DClipboardMsg,
+    DDragInfoMsg,
+    DInfoMsg,
+    DKeyDownLangMsg,
+    DMouseMoveMsg,
+    DSetOptionsMsg,
+    MsgBase,
+    MsgID,
+    MsgView,
+    PynergyParser,
+    Registry,
+)
+from packages.pynergy_protocol.src.pynergy_protocol.core import _compile_codec
+
+SAMPLE_VALUES = {
+    'FIX_VAL': lambda fmt: {'B': 7, 'H': 513, 'h': -300, 'I': 70000, '?': True}[fmt],
+    'FIX_STR': lambda fmt: 'Barrier',
+    'VAR_STR': lambda fmt: 'héllo',
+    'VAR_BYTES': lambda fmt: b'\x00\xffraw',
+    'ARRAY': lambda fmt: [0, 1, 70000, 2**32 - 1],
+    'VAR_LIST': lambda fmt: ['/tmp/a.txt', '/home/ü/b'],
+}
+
+
+def _sample(msg_cls):
+    return msg_cls(*(SAMPLE_VALUES[op](fmt) for op, _size, fmt in msg_cls._INSTRUCTIONS))
+
+
+@pytest.mark.parametrize('msg_id', list(Registry.get_registered_types()), ids=str)
+def test_compiled_codec_matches_instructions(msg_id):
+    """测试编译后的编解码器与逐条指令解释的结果一致"""
+    msg_cls = Registry.get_class(msg_id)
+    msg = _sample(msg_cls)
+
+    body = msg._ENCODE(msg._GET_FIELDS(msg))
+    assert body == msg._pack_instructions()
+
+    packed = msg.pack()
+    assert msg_cls.unpack(packed) == msg
+    values, offset = msg_cls._DECODE(msg_cls.before_unpack(packed))
+    assert (list(values), offset) == msg_cls._unpack_instructions(msg_cls.before_unpack(packed))
+
+
+def test_fixed_message_uses_single_struct():
+    """测试定长消息编译为单个 struct.Struct"""
+    raw = b'DINF' + struct.pack('>hhHHhhh', 0, 0, 1920, 1080, 0, 400, 300)
+    msg = DInfoMsg.unpack(raw)
+    assert msg == DInfoMsg(0, 0, 1920, 1080, 0, 400, 300)
+    assert msg.pack() == raw
+    assert DMouseMoveMsg.unpack(memoryview(b'DMMV\xff\xfe\x00\x10')) == DMouseMoveMsg(-2, 16)
+
+
+def test_var_string_message_round_trip():
+    """测试含变长字符串的消息往返一致"""
+    raw = b'DKDL\x00\x61\x00\x00\x00\x1e\x00\x00\x00\x02en'
+    msg = DKeyDownLangMsg.unpack(raw)
+    assert msg == DKeyDownLangMsg(0x61, 0, 0x1E, 'en')
+    assert msg.pack() == raw
+    assert DClipboardMsg(0, 1, 0, b'').pack_for_socket()[4:8] == MsgID.DCLP.encode()
+
+
+def test_var_bytes_are_zero_copy():
+    """测试变长字节字段解码为数据包的视图而不是拷贝"""
+    raw = bytearray(b'DCLP\x00\x00\x00\x00\x01\x00\x00\x00\x00\x04\xff\xfe\x00\x01')
+    msg = DClipboardMsg.unpack(memoryview(raw))
+
+    assert isinstance(msg.data, memoryview)
+    assert msg.data == b'\xff\xfe\x00\x01'
+    raw[-1] = 0x02
+    assert msg.data == b'\xff\xfe\x00\x02'
+    assert msg.pack() == bytes(raw)
+
+    values, offset = DClipboardMsg._unpack_instructions(bytes(raw[4:]))
+    assert (values[-1], offset) == (b'\xff\xfe\x00\x02', len(raw) - 4)
+    assert DClipboardMsg.unpack(bytes(raw)) == msg
+
+
+def test_var_bytes_rejects_text():
+    """测试变长字节字段不接受字符串"""
+    with pytest.raises(ValueError, match='expects a bytes-like object'):
+        DClipboardMsg(0, 0, 0, 'text').pack()
+
+
+def test_option_array_round_trip():
+    """测试计数前缀数组整体解码"""
+    raw = b'DSOP\x00\x00\x00\x04\x00\x00\x00\x01\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x00'
+    msg = DSetOptionsMsg.unpack(raw)
+    assert msg == DSetOptionsMsg([1, 1, 2, 0])
+    assert msg.pairs() == {1: 1, 2: 0}
+    assert msg.pack() == raw
+    assert DSetOptionsMsg.unpack(b'DSOP\x00\x00\x00\x00') == DSetOptionsMsg([])
+
+
+def test_drag_info_path_list():
+    """测试以 NUL 结尾的路径列表一次性解码"""
+    paths = [f'/home/user/file{i}.txt' for i in range(1000)]
+    raw = b'DDRG' + struct.pack('>H', 1000)
+    body = ''.join(p + '\x00' for p in paths).encode()
+    raw += struct.pack('>I', len(body)) + body
+    msg = DDragInfoMsg.unpack(raw)
+
+    assert msg.file_paths == paths
+    assert msg.pack() == raw
+    assert DDragInfoMsg(0, []).pack() == b'DDRG\x00\x00\x00\x00\x00\x00'
+
+
+@pytest.mark.parametrize(
+    'fmt, values',
+    [
+        ('H*h', [-1, 0, 300]),
+        ('I*Q', [0, 2**64 - 1]),
+        ('I*d', [0.5, -2.25]),
+        ('I*?', [True, False]),
+        ('B*e', [1.5]),
+    ],
+)
+def test_array_item_types(fmt, values):
+    """测试不同元素类型的数组与逐条解释结果一致"""
+    decode, encode = _compile_codec([('ARRAY', struct.calcsize('>' + fmt[0]), fmt)])
+    body = encode((values,))
+    assert decode(body) == ([values], len(body))
+    assert body == struct.pack(f'>{fmt[0]}{len(values)}{fmt[2]}', len(values), *values)
+
+
+@pytest.mark.parametrize(
+    'raw, match_text',
+    [
+        (b'DMMV\x00', 'Struct unpacking fails'),
+        (b'DKDL\x00\x61\x00\x00\x00\x1e\x00\x00\x00\x05en', 'incomplete'),
+        (b'DCLP\x00\x00\x00\x00\x01\x00\x00\x00\x00\x09data', 'bytes data is incomplete'),
+        (b'DSOP\x00\x00\x00\x03\x00\x00\x00\x01', 'Array data is incomplete'),
+        (b'DDRG\x00\x01\x00\x00\x00\x10/a\x00', 'Delimited list data is incomplete'),
+    ],
+)
+def test_codec_error_falls_back_to_instructions(raw, match_text):
+    """测试编解码失败时回退到逐条指令解析以给出准确错误"""
+    msg_cls = Registry.get_class(raw[:4].decode())
+    with pytest.raises(ValueError, match=match_text):
+        msg_cls.unpack(raw)
+
+
+def test_zero_field_message_wire_is_constant():
+    """测试无字段消息的线上字节在注册时预先计算"""
+    assert CKeepAliveMsg().pack_for_socket() == b'\x00\x00\x00\x04CALV'
+    assert CKeepAliveMsg().pack_for_socket() is CKeepAliveMsg._WIRE
+    assert CInfoAckMsg().pack_for_socket() == b'\x00\x00\x00\x04CIAK'
+
+
+def test_wire_cache_reuses_encoding():
+    """测试小型消息按字段值缓存编码结果"""
+    msg = DInfoMsg(0, 0, 2560, 1440, 0, 10, 20)
+    expected = struct.pack('>I', 18) + msg.pack()
+    hits = DInfoMsg._WIRE_CACHE.cache_info().hits
+
+    assert msg.pack_for_socket() == expected
+    assert DInfoMsg(0, 0, 2560, 1440, 0, 10, 20).pack_for_socket() == expected
+    assert DInfoMsg._WIRE_CACHE.cache_info().hits == hits + 1
+
+    msg.mouse_x = 11
+    assert msg.pack_for_socket() != expected
+
+
+def test_wire_cache_reports_invalid_values():
+    """测试缓存路径遇到非法值时仍给出打包错误"""
+    with pytest.raises(ValueError, match='Packing field screen_width'):
+        DInfoMsg(0, 0, -1, 1440, 0, 10, 20).pack_for_socket()
+
+
+@pytest.mark.parametrize(
+    'msg',
+    [
+        DMouseMoveMsg(-1, 2),
+        CKeepAliveMsg(),
+        DInfoMsg(0, 0, 1920, 1080, 0, 1, 2),
+        DKeyDownLangMsg(1, 2, 3, 'fr'),
+    ],
+    ids=repr,
+)
+def test_pack_into_matches_pack_for_socket(msg):
+    """测试 pack_into 写入的字节与 pack_for_socket 一致"""
+    expected = msg.pack_for_socket()
+    buffer = bytearray(b'\xff' * (len(expected) + 3))
+
+    assert msg.pack_into(memoryview(buffer), 3) == len(expected)
+    assert buffer[:3] == b'\xff' * 3
+    assert buffer[3:] == expected
+
+
+def test_pack_into_rejects_small_buffer():
+    """测试缓冲区空间不足时报错"""
+    with pytest.raises(ValueError, match='Buffer too small'):
+        DMouseMoveMsg(1, 2).pack_into(bytearray(11), 1)
+
+
+def test_pack_many():
+    """测试多条消息打包进同一个缓冲区"""
+    msgs = [CKeepAliveMsg(), DMouseMoveMsg(3, 4), DKeyDownLangMsg(1, 2, 3, 'de'), CInfoAckMsg()]
+    assert MsgBase.pack_many(msgs) == b''.join(m.pack_for_socket() for m in msgs)
+    assert MsgBase.pack_many([]) == b''
+
+
+def test_pack_many_accepts_views():
+    """测试延迟解码的视图也可以批量打包"""
+    parser = PynergyParser(lazy=True)
+    (view,) = parser.feed_and_parse_all(DMouseMoveMsg(5, 6).pack_for_socket())
+    assert isinstance(view, MsgView)
+    msgs = [view, CKeepAliveMsg()]
+    assert MsgBase.pack_many(msgs) == b''.join(m.pack_for_socket() for m in msgs)
@@ -0,0 +1,39 @@
+import pytest
+from loguru import logger
+
+from packages.pynergy_protocol.src.pynergy_protocol import DMouseMoveMsg, instrument
+
+
+@pytest.fixture
+def restore_level():
+    yield
+    instrument.set_log_level('TRACE')
+
+
+@pytest.mark.parametrize(
+    'level, trace, debug',
+    [('TRACE', True, True), ('DEBUG', False, True), ('INFO', False, False), (40, False, False)],
+)
+def test_set_log_level(level, trace, debug, restore_level):
+    """测试根据最低日志级别计算开关"""
+    instrument.set_log_level(level)
+    assert instrument.TRACE_ENABLED is trace
+    assert instrument.DEBUG_ENABLED is debug
+
+
+def test_gated_trace_is_skipped(restore_level):
+    """测试关闭开关后热路径不再产生 trace 日志，警告仍然输出"""
+    messages = []
+    handler_id = logger.add(messages.append, level='TRACE', format='{message}')
+    try:
+        DMouseMoveMsg.unpack(b'DMMV\x00\x01\x00\x02')
+        assert any('Unpacking DMouseMoveMsg' in m for m in messages)
+
+        messages.clear()
+        instrument.set_log_level('INFO')
+        DMouseMoveMsg.unpack(b'DMMV\x00\x01\x00\x02\x00')
+    finally:
+        logger.remove(handler_id)
+
+    assert not any('Unpacking DMouseMoveMsg' in m for m in messages)
+    assert any('1 bytes of unprocessed data' in m for m in messages)
@@ -0,0 +1,284 @@
+from packages.pynergy_protocol.src.pynergy_protocol import (
+    CKeepAliveMsg,
+    DClipboardMsg,
+    DKeyDownLangMsg,
+    DMouseMoveMsg,
+    MsgID,
+    MsgView,
+    PynergyParser,
+    Registry,
+)
+
+
+def _drain(parser):
+    msgs = []
+    while (msg := parser.next_msg()) is not None:
+        msgs.append(msg)
+    return msgs
+
+
+class TestPynergyParser:
+    def test_many_packets_in_one_feed(self):
+        """测试一次 feed 中包含大量数据包"""
+        moves = [DMouseMoveMsg(i, -i) for i in range(500)]
+        parser = PynergyParser()
+        parser.feed(b''.join(m.pack_for_socket() for m in moves))
+
+        assert _drain(parser) == moves
+        assert len(parser) == 0
+
+    def test_split_packet_across_feeds(self):
+        """测试数据包被拆分到多次 feed"""
+        stream = DMouseMoveMsg(1, 2).pack_for_socket() + CKeepAliveMsg().pack_for_socket()
+        parser = PynergyParser()
+        msgs = []
+        for i in range(len(stream)):
+            parser.feed(stream[i : i + 1])
+            msgs.extend(_drain(parser))
+
+        assert msgs == [DMouseMoveMsg(1, 2), CKeepAliveMsg()]
+
+    def test_consumed_prefix_is_compacted(self):
+        """测试读游标超过阈值后压缩已消费的数据"""
+        parser = PynergyParser()
+        packet = DMouseMoveMsg(3, 4).pack_for_socket()
+        count = PynergyParser.COMPACT_THRESHOLD // len(packet) + 1
+        parser.feed(packet * count + packet[:5])
+        assert len(_drain(parser)) == count
+
+        parser.feed(packet[5:])
+        assert parser._read_pos == 0
+        assert _drain(parser) == [DMouseMoveMsg(3, 4)]
+
+    def test_buffer_shrinks_after_large_packet(self):
+        """测试大数据包被消费后缓冲区会重新收缩"""
+        parser = PynergyParser()
+        big = DClipboardMsg(0, 1, 0, b'x' * (2 * PynergyParser.SHRINK_THRESHOLD))
+        parser.feed(big.pack_for_socket())
+        assert _drain(parser) == [big]
+
+        parser.feed(DMouseMoveMsg(5, 6).pack_for_socket())
+        assert len(parser._buffer) < PynergyParser.SHRINK_THRESHOLD
+        assert _drain(parser) == [DMouseMoveMsg(5, 6)]
+
+    def test_feed_while_view_is_alive(self):
+        """测试缓冲区仍被 memoryview 引用时 feed 不会失败"""
+        parser = PynergyParser()
+        parser.feed(DMouseMoveMsg(7, 8).pack_for_socket())
+        view = memoryview(parser._buffer)
+        parser.feed(DMouseMoveMsg(9, 10).pack_for_socket())
+
+        assert _drain(parser) == [DMouseMoveMsg(7, 8), DMouseMoveMsg(9, 10)]
+        view.release()
+
+    def test_feed_and_parse_all(self):
+        """测试批量解析一次返回所有完整消息，残缺数据保留到下一次"""
+        moves = [DMouseMoveMsg(i, i) for i in range(50)]
+        stream = b''.join(m.pack_for_socket() for m in moves)
+        stream += CKeepAliveMsg().pack_for_socket()
+        parser = PynergyParser()
+
+        assert parser.feed_and_parse_all(stream[:-3]) == moves
+        assert parser.feed_and_parse_all(stream[-3:]) == [CKeepAliveMsg()]
+        assert parser.feed_and_parse_all(b'') == []
+
+    def test_parse_all_skips_bad_packets(self):
+        """测试批量解析跳过无法识别的数据包"""
+        unknown = b'\x00\x00\x00\x06ZZZZ\x00\x01'
+        stream = unknown + DMouseMoveMsg(1, 1).pack_for_socket()
+        parser = PynergyParser()
+
+        assert parser.feed_and_parse_all(stream) == [DMouseMoveMsg(1, 1)]
+        assert len(parser) == 0
+
+    def test_small_bytes_packet_is_copied(self):
+        """测试小数据包的字节字段拷贝出缓冲区，不占用解析缓冲区"""
+        parser = PynergyParser()
+        stream = DClipboardMsg(0, 0, 0, b'small').pack_for_socket()
+        stream += DMouseMoveMsg(1, 2).pack_for_socket()
+        clip, move = parser.feed_and_parse_all(stream)
+        buffer = parser._buffer
+
+        assert clip.data == b'small'
+        assert move == DMouseMoveMsg(1, 2)
+        parser.feed(DMouseMoveMsg(3, 4).pack_for_socket())
+        assert parser._buffer is buffer
+
+    def test_large_bytes_packet_takes_buffer_over(self):
+        """测试大数据包的字节字段直接引用原缓冲区，解析器换用新的缓冲区"""
+        payload = bytes(range(256)) * (PynergyParser.DETACH_THRESHOLD // 256 + 1)
+        stream = DClipboardMsg(0, 0, 0, payload).pack_for_socket()
+        stream += DMouseMoveMsg(5, 6).pack_for_socket()
+        tail = DClipboardMsg(1, 0, 0, payload).pack_for_socket()
+
+        for batch in (True, False):
+            parser = PynergyParser()
+            parser.feed(stream + tail[:10])
+            buffer = parser._buffer
+            msgs = parser.parse_all() if batch else _drain(parser)
+
+            assert [type(m) for m in msgs] == [DClipboardMsg, DMouseMoveMsg]
+            assert msgs[0].data.obj is buffer
+            assert parser._buffer is not buffer
+            parser.feed(tail[10:])
+            assert msgs[0].data == payload
+            assert _drain(parser) == [DClipboardMsg(1, 0, 0, payload)]
+
+
+class TestReceiveIntoBuffer:
+    def test_receive_into_free_space(self):
+        """测试直接写入 get_buffer 交出的空间，只保留实际收到的字节"""
+        moves = [DMouseMoveMsg(i, -i) for i in range(100)]
+        stream = b''.join(m.pack_for_socket() for m in moves)
+        parser = PynergyParser()
+        msgs = []
+        for i in range(0, len(stream), 37):
+            chunk = stream[i : i + 37]
+            view = parser.get_buffer(64)
+            view[: len(chunk)] = chunk
+            parser.buffer_updated(len(chunk))
+            msgs += parser.parse_all()
+
+        assert msgs == moves
+        assert len(parser) == 0
+
+    def test_receive_while_buffer_is_exported(self):
+        """测试缓冲区仍被其他视图引用时依然可以接收"""
+        packet = DMouseMoveMsg(7, 8).pack_for_socket()
+        parser = PynergyParser()
+        parser.feed(packet[:3])
+        exported = memoryview(parser._buffer)
+
+        view = parser.get_buffer(64)
+        view[: len(packet) - 3] = packet[3:]
+        parser.buffer_updated(len(packet) - 3)
+        assert parser.parse_all() == [DMouseMoveMsg(7, 8)]
+        assert exported[:3] == packet[:3]
+
+    def test_capacity_is_kept_between_reads(self):
+        """测试读取之间保留空闲容量，稳定后接收不再扩容也不拷贝"""
+        packet = DMouseMoveMsg(1, 2).pack_for_socket()
+        parser = PynergyParser()
+        for i in range(5):
+            view = parser.get_buffer(4096)
+            view[: len(packet)] = packet
+            parser.buffer_updated(len(packet))
+            assert parser.parse_all() == [DMouseMoveMsg(1, 2)]
+            if i == 0:
+                buffer, copied = parser._buffer, parser.bytes_copied
+
+        assert parser._buffer is buffer
+        assert len(buffer) == 4096
+        assert parser.bytes_copied == copied
+
+    def test_unused_reservation_is_released(self):
+        """测试未写入的预留空间（EOF）被归还"""
+        parser = PynergyParser()
+        parser.feed(b'\x00\x00')
+        parser.get_buffer(4096)
+        parser.release_buffer()
+        assert len(parser) == 2
+        parser.get_buffer(4096)
+        parser.get_buffer(4096)
+        assert len(parser._buffer) == 2 + 4096
+
+
+class TestResync:
+    def test_bad_length_drops_only_garbage(self):
+        """测试非法长度只丢弃垃圾数据，后续数据包仍被解析"""
+        moves = [DMouseMoveMsg(i, i) for i in range(10)]
+        garbage = b'\xff\xff\xff\xff\x01\x02\x03'
+        stream = b''.join(m.pack_for_socket() for m in moves[:5]) + garbage
+        stream += b''.join(m.pack_for_socket() for m in moves[5:])
+
+        for batch in (True, False):
+            parser = PynergyParser()
+            parser.feed(stream)
+            assert (parser.parse_all() if batch else _drain(parser)) == moves
+            assert (parser.resync_count, parser.resync_dropped) == (1, len(garbage))
+            assert len(parser) == 0
+
+    def test_resync_across_feeds(self):
+        """测试垃圾数据跨越多次 feed 时继续同步"""
+        parser = PynergyParser()
+        packet = CKeepAliveMsg().pack_for_socket()
+        assert parser.feed_and_parse_all(b'\x00\x00\x00\x01' + b'\xaa' * 20) == []
+        assert parser.feed_and_parse_all(b'\xbb' * 20 + packet[:6]) == []
+        assert parser.feed_and_parse_all(packet[6:] + packet) == [CKeepAliveMsg()] * 2
+        assert parser.resync_count == 1
+        assert parser.resync_dropped == 44
+
+    def test_implausible_boundary_is_skipped(self):
+        """测试编码匹配但长度不合理的位置不会被当作边界"""
+        fake = b'\xff\xff\xff\xffDMMV'
+        stream = b'\xff\xff\xff\xff' + fake + DMouseMoveMsg(1, 2).pack_for_socket()
+        parser = PynergyParser()
+        assert parser.feed_and_parse_all(stream) == [DMouseMoveMsg(1, 2)]
+        assert parser.resync_dropped == 12
+
+
+class TestLazyMessages:
+    def test_lazy_parser_returns_views(self):
+        """测试惰性模式下高频消息以视图返回，字段在访问时解码"""
+        stream = DMouseMoveMsg(-5, 300).pack_for_socket()
+        stream += DKeyDownLangMsg(0x61, 0, 0x1E, 'en').pack_for_socket()
+        parser = PynergyParser(lazy=True)
+        move, key = parser.feed_and_parse_all(stream)
+
+        assert isinstance(move, MsgView)
+        assert move.CODE == MsgID.DMMV
+        assert move._values is None
+        assert (move.x, move.y) == (-5, 300)
+        assert move == DMouseMoveMsg(-5, 300)
+        assert move.pack_for_socket() == DMouseMoveMsg(-5, 300).pack_for_socket()
+        assert key == DKeyDownLangMsg(0x61, 0, 0x1E, 'en')
+
+    def test_lazy_next_msg(self):
+        """测试逐条解析接口同样返回视图"""
+        parser = PynergyParser(lazy=True)
+        parser.feed(DMouseMoveMsg(1, 2).pack_for_socket())
+        msg = parser.next_msg()
+
+        assert type(msg) is DMouseMoveMsg.view_type()
+        assert repr(msg) == 'DMouseMoveMsgView(x=1, y=2)'
+
+    def test_truncated_packet_is_not_viewed(self):
+        """测试长度不足的数据包不会生成视图"""
+        parser = PynergyParser(lazy=True)
+        assert parser.feed_and_parse_all(b'\x00\x00\x00\x06DMMV\x00\x01') == []
+
+
+class TestRegistryCodeTable:
+    def test_code_table_contains_four_byte_codes(self):
+        """测试原始 4 字节编码表覆盖所有 4 字符消息类型"""
+        table = Registry.code_table()
+        assert table[int.from_bytes(b'DMMV', 'big')] is DMouseMoveMsg
+        assert len(table) == len(Registry.get_registered_types()) - 2  # Hello / HelloBack
+        assert MsgID.Hello not in {cls.CODE for cls in table.values()}
+
+    def test_unknown_code_is_counted(self):
+        """测试未知编码被计数并跳过，而不是抛出异常"""
+        before = Registry.unknown_codes().get(b'QQQQ', 0)
+        parser = PynergyParser()
+        parser.feed(b'\x00\x00\x00\x04QQQQ' * 3)
+
+        assert parser.next_msg() is None
+        assert parser.feed_and_parse_all(b'') == []
+        assert Registry.unknown_codes()[b'QQQQ'] == before + 3
+
+    def test_unknown_codes_are_bounded(self, monkeypatch):
+        """测试不同的未知编码超过上限后计入 other，总数仍然准确"""
+        monkeypatch.setattr(Registry, '_UNKNOWN_CODES', {})
+        monkeypatch.setattr(Registry, '_UNKNOWN_OTHER', 0)
+        monkeypatch.setattr(Registry, 'MAX_UNKNOWN_CODES', 4)
+        total = Registry.unknown_total()
+
+        for i in range(10):
+            assert Registry.lookup(int.from_bytes(b'ZZ\x00\x00', 'big') + i) is None
+        Registry.lookup(int.from_bytes(b'ZZ\x00\x00', 'big'))
+
+        counts = Registry.unknown_codes()
+        assert len(counts) == 5
+        assert counts[b'ZZ\x00\x00'] == 2
+        assert counts[b'other'] == 6
+        assert Registry.unknown_total() == total + 11
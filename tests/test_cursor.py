@@ -0,0 +1,131 @@
+"""
+光标航位推算测试
+
+测试 CursorTracker：按注入的位移跟踪光标并在屏幕边缘截断，仅在探测到的偏移超过阈值时写入绝对位置校正。
+"""
+
+import asyncio
+from unittest.mock import MagicMock, call
+
+import pytest
+from pynergy_client.config import Config
+from pynergy_client.device import BaseDeviceContext, CursorTracker
+
+
+class _Context(BaseDeviceContext):
+    def __init__(self, real=None, can_probe=True):
+        super().__init__()
+        self.screen_size = (1920, 1080)
+        self.can_probe_cursor = can_probe
+        self.real = real
+        self.probed = 0
+
+    def update_screen_info(self): ...
+
+    def get_real_cursor_pos(self):
+        return self.real
+
+    def probe_cursor_pos(self):
+        self.probed += 1
+        return self.real
+
+
+async def _move(tracker, positions):
+    for x, y in positions:
+        tracker.move_to(x, y)
+    # Let the probe finish on the executor and its callback run
+    while tracker._probe is not None:
+        await asyncio.sleep(0.001)
+
+
+def test_moves_are_tracked_and_clamped_at_edges():
+    """测试相对移动按模型位置计算，越过屏幕边缘的位移被截断"""
+    ctx = _Context()
+    tracker = CursorTracker(ctx, MagicMock(), drift_threshold=1000)
+    tracker.reset(1900, 10)
+
+    asyncio.run(_move(tracker, [(1950, 10), (1960, 0), (1000, -5)]))
+
+    assert tracker.mouse.move_relative.call_args_list == [
+        call(19, 0),
+        call(0, -10),
+        call(-919, 0),
+    ]
+    assert tracker.position == (1000, 0)
+    tracker.track_relative(-2000, 5)
+    assert tracker.position == (0, 5)
+    assert ctx.probed == 0
+    tracker.mouse.move_absolute.assert_not_called()
+
+
+def test_probe_within_threshold_does_not_correct():
+    """测试探测到的偏移不超过阈值时不写入绝对位置，并学习偏移率"""
+    ctx = _Context(real=(300, 102))
+    tracker = CursorTracker(ctx, MagicMock(), drift_threshold=4, probe_interval=0)
+    tracker.reset(100, 100)
+
+    asyncio.run(_move(tracker, [(228, 100), (302, 100)]))
+
+    assert ctx.probed == 1
+    assert tracker.probes == 1
+    assert tracker.max_drift == 2
+    assert tracker.corrections == 0
+    tracker.mouse.move_absolute.assert_not_called()
+    assert tracker.drift_rate < 1 / 32
+
+
+def test_drift_above_threshold_is_corrected():
+    """测试偏移超过阈值时写入一次绝对位置校正"""
+    ctx = _Context(real=(200, 100))
+    tracker = CursorTracker(ctx, MagicMock(), drift_threshold=4, probe_interval=0)
+    tracker.reset(100, 100)
+
+    asyncio.run(_move(tracker, [(300, 100)]))
+
+    assert tracker.corrections == 1
+    assert tracker.travel == 0
+    tracker.mouse.move_absolute.assert_called_once_with(300, 100)
+
+
+def test_no_probe_no_correction():
+    """测试平台无法探测光标时，不调用探测也不写入盲目的绝对位置校正"""
+    ctx = _Context(can_probe=False)
+    tracker = CursorTracker(ctx, MagicMock(), drift_threshold=4, probe_interval=0)
+    tracker.reset(0, 0)
+
+    asyncio.run(_move(tracker, [(i * 10, 0) for i in range(1, 101)]))
+
+    assert tracker.position == (1000, 0)
+    assert ctx.probed == 0
+    assert tracker._probe is None and tracker._scheduled is None
+    assert tracker.corrections == 0
+    tracker.mouse.move_absolute.assert_not_called()
+
+
+def test_probe_without_travel_does_not_fail():
+    """测试探测期间没有位移时（阈值为 0）不会除以零"""
+    ctx = _Context(real=(100, 100))
+    tracker = CursorTracker(ctx, MagicMock(), drift_threshold=0, probe_interval=0)
+    tracker.reset(100, 100)
+
+    errors = []
+
+    async def probe():
+        # Exceptions in the probe callback only reach the loop's handler
+        asyncio.get_running_loop().set_exception_handler(lambda _, context: errors.append(context))
+        tracker.track_relative(0, 0)
+        while tracker._probe is not None:
+            await asyncio.sleep(0.001)
+
+    asyncio.run(probe())
+
+    assert errors == []
+    assert tracker.probes == 1
+    assert tracker.drift_rate == 1 / 32
+    tracker.mouse.move_absolute.assert_not_called()
+
+
+def test_config_rejects_zero_drift_threshold():
+    """测试配置拒绝小于 1 px 的偏移阈值"""
+    with pytest.raises(ValueError):
+        Config(mouse_drift_threshold=0)
@@ -0,0 +1,192 @@
+"""
+消息分发测试
+
+测试控制消息优先通道：控制消息总是先于排队的输入消息处理；以及直接分发模式。
+"""
+
+import asyncio
+
+from pynergy_client.client import MessageDispatcher
+from pynergy_client.client.handlers import sync_handler
+from pynergy_protocol import (
+    CEnterMsg,
+    CKeepAliveMsg,
+    DKeyDownMsg,
+    DKeyUpMsg,
+    DMouseMoveMsg,
+    DMouseRelMoveMsg,
+)
+
+
+class _RecordingHandler:
+    def __init__(self):
+        self.handled = []
+
+    async def default_handler(self, msg, client=None):
+        self.handled.append(msg)
+
+    async def on_calv(self, msg, client):
+        self.handled.append(msg)
+
+    async def on_cinn(self, msg, client):
+        self.handled.append(msg)
+
+    async def on_dmmv(self, msg, client):
+        self.handled.append(msg)
+
+
+class _DirectHandler(_RecordingHandler):
+    @sync_handler
+    def on_dmmv(self, msg, client):
+        self.handled.append(msg)
+
+    async def on_calv(self, msg, client):
+        # Yields to the loop like a handler sending a reply
+        await asyncio.sleep(0)
+        self.handled.append(msg)
+
+
+async def _dispatch(msgs, count):
+    handler = _RecordingHandler()
+    dispatcher = MessageDispatcher(handler)
+    rest = dispatcher.enqueue_batch_nowait(msgs, None)
+    depths = dispatcher.queue_depths()
+
+    worker = asyncio.create_task(dispatcher.worker(0))
+    while len(handler.handled) < count:
+        await asyncio.sleep(0)
+    worker.cancel()
+    return handler.handled, rest, depths, dispatcher
+
+
+def _keys(count):
+    return [DKeyDownMsg(i, 0, i) for i in range(count)]
+
+
+def test_control_messages_skip_queued_input():
+    """测试控制消息越过排队的输入消息优先处理"""
+    keys = _keys(10)
+    msgs = [*keys[:5], CKeepAliveMsg(), *keys[5:], CEnterMsg(1, 2, 3, 0)]
+
+    handled, rest, depths, dispatcher = asyncio.run(_dispatch(msgs, len(msgs)))
+
+    assert handled == [CKeepAliveMsg(), CEnterMsg(1, 2, 3, 0), *keys]
+    assert rest == []
+    assert depths == {'control': 2, 'input': 10}
+    assert dispatcher.max_depth == {'control': 2, 'input': 10}
+
+
+def test_control_messages_are_queued_when_input_is_full():
+    """测试输入队列已满时控制消息仍然入队，输入消息按顺序返回"""
+    keys = _keys(105)
+    msgs = [*keys, CKeepAliveMsg()]
+
+    handled, rest, depths, _ = asyncio.run(_dispatch(msgs, 101))
+
+    assert rest == keys[100:]
+    assert depths == {'control': 1, 'input': 100}
+    assert handled[0] == CKeepAliveMsg()
+    assert handled[1:] == keys[:100]
+
+
+def test_queued_moves_are_coalesced():
+    """测试连续的鼠标移动合并为最新位置，相对移动累加，按键不被合并或重排"""
+    msgs = [
+        *(DMouseMoveMsg(i, i) for i in range(5)),
+        DKeyDownMsg(1, 0, 1),
+        DMouseMoveMsg(10, 10),
+        *(DMouseRelMoveMsg(1, -2) for _ in range(4)),
+        CKeepAliveMsg(),
+        DMouseRelMoveMsg(3, 3),
+        DKeyUpMsg(1, 0, 1),
+    ]
+
+    handled, rest, depths, dispatcher = asyncio.run(_dispatch(msgs, 6))
+
+    assert handled == [
+        CKeepAliveMsg(),
+        DMouseMoveMsg(4, 4),
+        DKeyDownMsg(1, 0, 1),
+        DMouseMoveMsg(10, 10),
+        DMouseRelMoveMsg(7, -5),
+        DKeyUpMsg(1, 0, 1),
+    ]
+    assert depths == {'control': 1, 'input': 5}
+    assert dispatcher.coalesced() == {'DMMV': 4, 'DMRM': 4}
+
+
+def test_coalesced_moves_complete_join():
+    """测试合并后的消息不会让 queue.join 永远等待"""
+
+    async def run():
+        handler = _RecordingHandler()
+        dispatcher = MessageDispatcher(handler)
+        await dispatcher.enqueue_batch([DMouseMoveMsg(i, i) for i in range(50)], None)
+        worker = asyncio.create_task(dispatcher.worker(0))
+        await asyncio.wait_for(dispatcher.queue.join(), timeout=5)
+        worker.cancel()
+        return handler.handled
+
+    assert asyncio.run(run()) == [DMouseMoveMsg(49, 49)]
+
+
+def test_direct_dispatch_keeps_order():
+    """测试直接分发模式下同步处理器立即执行，异步处理器之后的消息保持顺序"""
+
+    async def run():
+        handler = _DirectHandler()
+        dispatcher = MessageDispatcher(handler, direct=True)
+        moves = [DMouseMoveMsg(i, i) for i in range(6)]
+
+        dispatcher.dispatch_batch(moves[:2], None)
+        assert handler.handled == moves[:2]
+
+        dispatcher.dispatch_batch([CKeepAliveMsg(), moves[2]], None)
+        dispatcher.dispatch_batch(moves[3:], None)
+        assert handler.handled == moves[:2]
+
+        while dispatcher._async_task is not None:
+            await asyncio.sleep(0)
+        assert dispatcher.queue_depths() == {'control': 0, 'input': 0}
+        return handler.handled, moves
+
+    handled, moves = asyncio.run(run())
+    assert handled == [*moves[:2], CKeepAliveMsg(), *moves[2:]]
+
+
+def test_direct_dispatch_backlog_is_bounded():
+    """测试异步处理器阻塞时积压达到上限，读取方等待积压消化到一半后再继续"""
+
+    class _SlowHandler(_DirectHandler):
+        def __init__(self):
+            super().__init__()
+            self.release = asyncio.Event()
+
+        async def on_calv(self, msg, client):
+            await self.release.wait()
+            self.handled.append(msg)
+
+    async def run():
+        handler = _SlowHandler()
+        dispatcher = MessageDispatcher(handler, direct=True)
+        dispatcher.max_backlog = 10
+        moves = [DMouseMoveMsg(i, i) for i in range(12)]
+
+        dispatcher.dispatch_batch([CKeepAliveMsg(), *moves[:9]], None)
+        assert not dispatcher.backlog_full()
+        dispatcher.dispatch_batch(moves[9:], None)
+        assert dispatcher.backlog_full()
+
+        drained = asyncio.create_task(dispatcher.drain_backlog())
+        await asyncio.sleep(0.01)
+        assert not drained.done()
+
+        handler.release.set()
+        await asyncio.wait_for(drained, timeout=5)
+        assert len(dispatcher._backlog) <= 5
+        while dispatcher._async_task is not None:
+            await asyncio.sleep(0)
+        return handler.handled, moves
+
+    handled, moves = asyncio.run(run())
+    assert handled == [CKeepAliveMsg(), *moves]
@@ -0,0 +1,21 @@
+"""
+事件循环选择测试
+"""
+
+import asyncio
+import sys
+
+from pynergy_client.utils import get_loop_factory
+
+
+def test_default_loop():
+    """测试默认使用 asyncio 事件循环"""
+    assert get_loop_factory('asyncio') is None
+
+
+def test_uvloop_fallback(monkeypatch):
+    """测试未安装 uvloop 时回退到 asyncio 事件循环"""
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+    factory = get_loop_factory('uvloop')
+    assert factory is None
+    assert asyncio.run(asyncio.sleep(0, 'ok'), loop_factory=factory) == 'ok'
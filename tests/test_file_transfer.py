@@ -0,0 +1,125 @@
+"""
+文件传输接收测试
+
+测试 FileTransferReceiver 将 DFTR 分块写入磁盘的行为。
+"""
+
+import struct
+import threading
+
+import pytest
+from pynergy_client.client.file_transfer import (
+    DATA_CHUNK,
+    DATA_END,
+    DATA_START,
+    FileTransferReceiver,
+    parse_size,
+)
+from pynergy_protocol import DFileTransferMsg, PynergyParser
+
+
+def _send(receiver, payload, chunk_size=1000, size=None):
+    receiver.feed(
+        DFileTransferMsg(DATA_START, struct.pack('>Q', len(payload) if size is None else size))
+    )
+    for i in range(0, len(payload), chunk_size):
+        assert receiver.feed(DFileTransferMsg(DATA_CHUNK, payload[i : i + chunk_size])) is None
+    return receiver.feed(DFileTransferMsg(DATA_END, b''))
+
+
+@pytest.fixture
+def receiver(tmp_path):
+    receiver = FileTransferReceiver(tmp_path / 'downloads')
+    yield receiver
+    receiver.close()
+
+
+def test_parse_size():
+    """测试起始块的文件大小支持 8 字节整数和十进制文本"""
+    assert parse_size(struct.pack('>Q', 4096)) == 4096
+    assert parse_size(b'123') == 123
+    with pytest.raises(ValueError):
+        parse_size(b'abc')
+
+
+def test_receive_file(receiver):
+    """测试分块写入并在结束时重命名为最终文件"""
+    payload = bytes(range(256)) * 40
+    receiver.next_name = 'data.bin'
+    path = _send(receiver, payload).result(timeout=5)
+
+    assert path == receiver.directory / 'data.bin'
+    assert path.read_bytes() == payload
+    assert not list(receiver.directory.glob('.*.part'))
+    assert (receiver.files_received, receiver.bytes_received) == (1, len(payload))
+
+    receiver.next_name = 'data.bin'
+    assert _send(receiver, b'again').result(timeout=5).name == 'data (1).bin'
+
+
+def test_short_transfer_is_truncated(receiver):
+    """测试实际数据少于声明大小时去掉预分配的空间"""
+    path = _send(receiver, b'x' * 100, size=4096).result(timeout=5)
+    assert path.stat().st_size == 100
+
+
+def test_abort_removes_partial_file(receiver):
+    """测试新的传输开始时放弃旧传输并删除临时文件"""
+    receiver.next_name = 'first'
+    receiver.feed(DFileTransferMsg(DATA_START, struct.pack('>Q', 10)))
+    receiver.feed(DFileTransferMsg(DATA_CHUNK, b'12345'))
+    receiver.next_name = 'second'
+    path = _send(receiver, b'67890').result(timeout=5)
+
+    assert sorted(p.name for p in receiver.directory.iterdir()) == ['second']
+    assert path.read_bytes() == b'67890'
+
+
+def test_chunk_without_start_is_ignored(receiver):
+    """测试没有起始块的数据被忽略"""
+    assert receiver.feed(DFileTransferMsg(DATA_CHUNK, b'lost')) is None
+    assert receiver.feed(DFileTransferMsg(DATA_END, b'')) is None
+    assert not receiver.active
+
+
+def test_parsed_chunks_are_written(receiver):
+    """测试解析器交出的大数据块视图可以直接写入文件"""
+    payload = bytes(range(256)) * 1024
+    stream = DFileTransferMsg(DATA_START, struct.pack('>Q', len(payload))).pack_for_socket()
+    stream += DFileTransferMsg(DATA_CHUNK, payload).pack_for_socket()
+    stream += DFileTransferMsg(DATA_END, b'').pack_for_socket()
+    parser = PynergyParser()
+    futures = []
+    for i in range(0, len(stream), 4096):
+        futures += [receiver.feed(msg) for msg in parser.feed_and_parse_all(stream[i : i + 4096])]
+
+    assert futures[-1].result(timeout=5).read_bytes() == payload
+
+
+def test_receiver_is_reusable_after_close(receiver):
+    """测试关闭后（例如重连复用处理器）仍然可以接收新的传输"""
+    receiver.close()
+    receiver.close()
+
+    receiver.next_name = 'after.bin'
+    path = _send(receiver, b'reconnected').result(timeout=5)
+
+    assert path.read_bytes() == b'reconnected'
+
+
+def test_close_does_not_wait_for_pending_writes(receiver):
+    """测试关闭时不阻塞等待排队的写入，写入在后台线程完成"""
+    release = threading.Event()
+    receiver._submit(release.wait)
+    receiver.next_name = 'pending.bin'
+    future = _send(receiver, b'pending')
+
+    closer = threading.Thread(target=receiver.close)
+    closer.start()
+    closer.join(timeout=1)
+    blocked = closer.is_alive()
+    release.set()
+    closer.join()
+
+    assert not blocked
+    assert future.result(timeout=5).read_bytes() == b'pending'
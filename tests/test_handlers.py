@@ -0,0 +1,93 @@
+"""
+消息处理器测试
+
+测试 PynergyHandler 对鼠标移动的节流：首个位置立即注入，节流期间只保留最新位置并在间隔结束时补发；
+以及设备同步：每批消息每个设备只发送一次 SYN_REPORT。
+"""
+
+import asyncio
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from pynergy_client.client import MessageDispatcher, PynergyHandler
+from pynergy_client.client.protocols import ClientState
+from pynergy_client.config import Config
+from pynergy_client.device import UInputKeyboardDevice, UInputMouseDevice
+from pynergy_protocol import DKeyDownMsg, DKeyUpMsg, DMouseDownMsg, DMouseMoveMsg, DMouseUpMsg
+
+
+@pytest.fixture
+def handler(tmp_path):
+    cfg = Config(abs_mouse_move=True, mouse_move_threshold=8, file_transfer_dir=tmp_path)
+    handler = PynergyHandler(cfg, MagicMock(), MagicMock(), MagicMock())
+    yield handler
+    handler.file_receiver.close()
+
+
+def test_throttled_moves_flush_latest_position(handler):
+    """测试节流期间的移动合并为最新位置，并在间隔结束时补发"""
+
+    async def run():
+        for i in range(5):
+            handler.on_dmmv(DMouseMoveMsg(i, i), None)
+        assert handler.mouse.move_absolute.call_args_list == [call(0, 0)]
+        await asyncio.sleep(handler.interval * 2)
+
+    asyncio.run(run())
+
+    assert handler.mouse.move_absolute.call_args_list == [call(0, 0), call(4, 4)]
+    assert (handler.moves_merged, handler.moves_flushed) == (3, 1)
+
+
+def test_pending_move_is_cancelled(handler):
+    """测试取消后不再补发等待中的位置"""
+
+    async def run():
+        handler.on_dmmv(DMouseMoveMsg(1, 1), None)
+        handler.on_dmmv(DMouseMoveMsg(2, 2), None)
+        handler.cancel_pending_move()
+        await asyncio.sleep(handler.interval * 2)
+
+    asyncio.run(run())
+
+    assert handler.mouse.move_absolute.call_args_list == [call(1, 1)]
+    assert handler.moves_flushed == 0
+
+
+def _uinput_handler(tmp_path):
+    cfg = Config(abs_mouse_move=True, file_transfer_dir=tmp_path)
+    with patch('evdev.UInput'):
+        handler = PynergyHandler(cfg, MagicMock(), UInputMouseDevice(), UInputKeyboardDevice())
+    handler.file_receiver.close()
+    return handler
+
+
+def test_devices_without_events_are_not_synced(tmp_path):
+    """测试按键只同步键盘，不再发送空的鼠标 SYN_REPORT"""
+    handler = _uinput_handler(tmp_path)
+    client = MagicMock(state=ClientState.ACTIVE)
+
+    handler.on_dkdn(DKeyDownMsg(0, 0, 38), client)
+    handler.on_dkup(DKeyUpMsg(0, 0, 38), client)
+
+    assert (handler.keyboard.syns, handler.mouse.syns) == (2, 0)
+
+
+def test_batch_syncs_each_device_once(tmp_path):
+    """测试直接分发的一批消息中每个设备只同步一次"""
+    handler = _uinput_handler(tmp_path)
+    client = MagicMock(state=ClientState.ACTIVE)
+    dispatcher = MessageDispatcher(handler, direct=True)
+    msgs = [
+        DKeyDownMsg(0, 0, 38),
+        DMouseDownMsg(1),
+        DMouseMoveMsg(10, 10),
+        DMouseUpMsg(1),
+        DKeyUpMsg(0, 0, 38),
+    ]
+
+    dispatcher.dispatch_batch(msgs, client)
+
+    assert (handler.keyboard.events, handler.keyboard.syns) == (2, 1)
+    assert (handler.mouse.events, handler.mouse.syns) == (4, 1)
+    assert not handler.batching
@@ -0,0 +1,75 @@
+"""
+运动插值引擎测试
+
+测试 MotionEngine 的插值、有界外推以及按刷新率节拍注入。
+"""
+
+import asyncio
+
+from pynergy_client.client.motion import MotionEngine
+
+
+def _engine(samples, latency_budget=0.008):
+    engine = MotionEngine(lambda x, y: None, 120, latency_budget)
+    engine._samples.extend(samples)
+    return engine
+
+
+def test_interpolation():
+    """测试两个样本之间按时间线性插值"""
+    engine = _engine([(0.0, 0, 0), (0.01, 100, 50)])
+    assert engine.position_at(0.005) == (50, 25)
+    assert engine.position_at(-1.0) == (0, 0)
+    assert engine.interpolated == 1
+
+
+def test_extrapolation_is_bounded():
+    """测试输入延迟时按速度外推，超过预算后停在最后的真实位置"""
+    engine = _engine([(0.0, 0, 0), (0.01, 10, 0)])
+    assert engine.position_at(0.012) == (12, 0)
+    assert engine.position_at(0.02) == (10, 0)
+    assert engine.extrapolated == 1
+
+
+def test_ticks_reach_last_position():
+    """测试按节拍注入，最终停在最后位置并进入空闲"""
+    injected = []
+
+    async def run():
+        engine = MotionEngine(lambda x, y: injected.append((x, y)), 500, 0.004)
+        for i in range(1, 11):
+            engine.feed(i * 10, i * 5)
+            await asyncio.sleep(0.002)
+        while engine.active:
+            await asyncio.sleep(0.002)
+        return engine
+
+    engine = asyncio.run(run())
+
+    assert injected[0] == (10, 5)
+    assert injected[-1] == (100, 50)
+    assert engine.injected == len(injected)
+    stats = engine.stats()
+    assert stats['refresh_rate'] == 500
+    assert stats['jitter_p99_us'] >= stats['jitter_p50_us']
+
+
+def test_high_rate_input_keeps_latency_budget():
+    """测试 1000Hz 输入时仍按延迟预算插值，而不是停在最旧的样本"""
+
+    async def run():
+        engine = MotionEngine(lambda x, y: None, 60, 0.008)
+        for i in range(101):
+            engine.feed(i, 0, timestamp=i / 1000)
+        if engine.active:
+            engine._handle.cancel()
+        return engine
+
+    engine = asyncio.run(run())
+
+    interpolated = engine.interpolated
+    assert engine.position_at(0.1 - 0.008) == (92, 0)
+    assert engine.position_at(0.1 - 0.008 - 1 / 60) == (75, 0)
+    assert engine.interpolated == interpolated + 2
+    # Only what the budget and one late tick can reach is kept
+    assert len(engine._samples) <= 27
@@ -0,0 +1,66 @@
+"""
+出站合并写入测试
+
+测试 OutboundWriter 将同一轮事件循环中的消息合并为一次写入。
+"""
+
+import asyncio
+
+from pynergy_client.client.outbound import OutboundWriter
+from pynergy_protocol import CKeepAliveMsg, CNoopMsg, PynergyParser
+
+
+async def _session(send):
+    received = bytearray()
+    closed = asyncio.Event()
+
+    async def serve(reader, writer):
+        while data := await reader.read(4096):
+            received.extend(data)
+        writer.close()
+        closed.set()
+
+    server = await asyncio.start_server(serve, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    _, writer = await asyncio.open_connection('127.0.0.1', port)
+    outbound = OutboundWriter(writer)
+
+    await send(outbound)
+    outbound.close()
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.wait_for(closed.wait(), timeout=5)
+    server.close()
+    await server.wait_closed()
+    return outbound, PynergyParser().feed_and_parse_all(bytes(received))
+
+
+def test_messages_of_one_iteration_are_coalesced():
+    """测试同一轮事件循环中的消息只触发一次写入"""
+
+    async def send(outbound):
+        for _ in range(3):
+            outbound.write(CKeepAliveMsg().pack_for_socket())
+        await asyncio.sleep(0)
+        outbound.write(CNoopMsg().pack_for_socket())
+        await asyncio.sleep(0)
+
+    outbound, msgs = asyncio.run(_session(send))
+
+    assert msgs == [CKeepAliveMsg()] * 3 + [CNoopMsg()]
+    assert (outbound.flushes, outbound.messages, outbound.max_flush_messages) == (2, 4, 3)
+    assert outbound.bytes == sum(len(m.pack_for_socket()) for m in msgs)
+    assert outbound.messages_per_flush == 2.0
+
+
+def test_close_flushes_pending_messages():
+    """测试关闭前未发送的消息会被写出"""
+
+    async def send(outbound):
+        outbound.write(CKeepAliveMsg().pack_for_socket())
+        assert not outbound.backpressure
+
+    outbound, msgs = asyncio.run(_session(send))
+
+    assert msgs == [CKeepAliveMsg()]
+    assert outbound.flushes == 1
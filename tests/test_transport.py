@@ -0,0 +1,122 @@
+"""
+缓冲协议传输测试
+
+测试 BufferedClientProtocol 直接接收到解析器缓冲区并分发消息的行为，以及断开连接时积压任务的清理。
+"""
+
+import asyncio
+import tempfile
+from unittest.mock import MagicMock
+
+from pynergy_client.client import MessageDispatcher, PynergyClient, PynergyHandler
+from pynergy_client.client.transport import BufferedClientProtocol
+from pynergy_client.config import Config
+from pynergy_protocol import CKeepAliveMsg, DKeyDownMsg, DMouseMoveMsg, HelloMsg, PynergyParser
+
+
+async def _session(server_data: bytes, received: list):
+    async def serve(reader, writer):
+        writer.write(server_data)
+        await writer.drain()
+        received.append(await reader.read(1024))
+        writer.close()
+
+    server = await asyncio.start_server(serve, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_connection(
+        lambda: BufferedClientProtocol(PynergyParser()), '127.0.0.1', port
+    )
+    hello = await asyncio.wait_for(protocol.hello, timeout=5)
+
+    batches = []
+    protocol.start(batches.append)
+    protocol.write(b'pong')
+    await protocol.drain()
+    await asyncio.wait_for(protocol.wait_closed(), timeout=5)
+    server.close()
+    await server.wait_closed()
+    return protocol, hello, [msg for batch in batches for msg in batch]
+
+
+def test_hello_and_messages():
+    """测试握手消息和紧随其后的消息都被解析"""
+    moves = [DMouseMoveMsg(i, i * 2) for i in range(1000)]
+    data = HelloMsg('Barrier', 1, 8).pack_for_socket()
+    data += b''.join(m.pack_for_socket() for m in moves) + CKeepAliveMsg().pack_for_socket()
+    received = []
+
+    protocol, hello, msgs = asyncio.run(_session(data, received))
+
+    assert (hello.protocol_name, hello.major, hello.minor) == ('Barrier', 1, 8)
+    assert msgs == [*moves, CKeepAliveMsg()]
+    assert received == [b'pong']
+    assert protocol.bytes_received == len(data)
+    assert len(protocol.parser) == 0
+
+
+def test_connection_lost_before_hello():
+    """测试握手前连接断开时等待握手会抛出异常"""
+
+    async def run():
+        async def serve(reader, writer):
+            writer.close()
+
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(
+            lambda: BufferedClientProtocol(PynergyParser()), '127.0.0.1', port
+        )
+        try:
+            await asyncio.wait_for(protocol.hello, timeout=5)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    try:
+        asyncio.run(run())
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError('Expected ConnectionError')
+
+
+def test_backlog_is_dropped_when_connection_is_lost():
+    """测试连接断开时取消等待队列空间的积压任务，不再向分发器写入消息"""
+    keys = [DKeyDownMsg(i, 0, i) for i in range(150)]
+
+    async def run(tmp_dir):
+        async def serve(reader, writer):
+            writer.write(HelloMsg('Barrier', 1, 8).pack_for_socket())
+            await reader.read(1024)  # HelloBack
+            writer.write(b''.join(k.pack_for_socket() for k in keys))
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        cfg = Config(
+            server='127.0.0.1',
+            port=server.sockets[0].getsockname()[1],
+            transport='buffered',
+            file_transfer_dir=tmp_dir,
+        )
+        handler = PynergyHandler(cfg, MagicMock(), MagicMock(), MagicMock())
+        dispatcher = MessageDispatcher(handler)
+        client = PynergyClient(cfg, parser=PynergyParser(), dispatcher=dispatcher)
+        # No worker: the input lane fills up and the rest waits in the backlog task
+        task = asyncio.create_task(client.run())
+        while client._backlog_task is None:
+            await asyncio.sleep(0.001)
+        client.writer.transport.abort()
+        await asyncio.wait_for(task, timeout=5)
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0)
+        return client, dispatcher
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, dispatcher = asyncio.run(run(tmp_dir))
+
+    assert client._backlog_task is None
+    assert dispatcher.queue.qsize() == dispatcher.queue.maxsize
@@ -4,10 +4,11 @@
 测试 VirtualDevice 类的功能。
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from evdev import ecodes
 from pynergy_client.device import UInputKeyboardDevice, UInputMouseDevice
+from pynergy_client.device.base import WheelAccumulator
 
 
 class TestUIputDeviceCreation:
@@ -75,6 +76,8 @@ class TestUIputDeviceCreation:
             assert ecodes.REL_Y in rel_events
             assert ecodes.REL_WHEEL in rel_events
             assert ecodes.REL_HWHEEL in rel_events
+            assert ecodes.REL_WHEEL_HI_RES in rel_events
+            assert ecodes.REL_HWHEEL_HI_RES in rel_events
 
     def test_capabilities_contains_key_events(self):
         """测试事件能力包含按键事件"""
@@ -142,6 +145,29 @@ class TestMouseEvents:
             device.wheel_relative(dx=1, dy=-1)
             assert mock_instance.write.call_count == 2
 
+    def test_write_wheel_hi_res(self):
+        """测试高精度滚轮按原值写入，每满一格补发一次传统滚轮事件"""
+        with patch('evdev.UInput') as mock_ui:
+            mock_instance = MagicMock()
+            mock_ui.return_value = mock_instance
+            device = UInputMouseDevice()
+            device.wheel_hi_res(dy=60)
+            device.wheel_hi_res(dy=300, dx=-120)
+            assert mock_instance.write.call_args_list == [
+                call(ecodes.EV_REL, ecodes.REL_WHEEL_HI_RES, 60),
+                call(ecodes.EV_REL, ecodes.REL_WHEEL_HI_RES, 300),
+                call(ecodes.EV_REL, ecodes.REL_WHEEL, 3),
+                call(ecodes.EV_REL, ecodes.REL_HWHEEL_HI_RES, -120),
+                call(ecodes.EV_REL, ecodes.REL_HWHEEL, -1),
+            ]
+            assert device.wheel_y.remainder == 0
+
+    def test_wheel_accumulator_resets_on_reversal(self):
+        """测试滚动方向反转时丢弃未满一格的累计值"""
+        accumulator = WheelAccumulator()
+        assert [accumulator.feed(d) for d in (90, 20, 40, -30, -100)] == [0, 0, 1, 0, -1]
+        assert accumulator.remainder == -10
+
 
 class TestKeyEvents:
     """键盘事件测试"""
@@ -185,6 +211,23 @@ class TestSync:
             device.syn()
             mock_instance.syn.assert_called_once()
 
+    def test_syn_if_dirty_skips_empty_reports(self):
+        """测试没有写入事件时不发送空的 SYN_REPORT，并统计系统调用次数"""
+        with patch('evdev.UInput') as mock_ui:
+            mock_instance = MagicMock()
+            mock_ui.return_value = mock_instance
+            device = UInputMouseDevice()
+            device.syn_if_dirty()
+            mock_instance.syn.assert_not_called()
+
+            device.move_relative(1, 2)
+            assert device.dirty
+            device.syn_if_dirty()
+            device.syn_if_dirty()
+            mock_instance.syn.assert_called_once()
+            assert not device.dirty
+            assert (device.events, device.syns, device.syscalls) == (2, 1, 3)
+
 
 class TestClose:
     """关闭测试"""